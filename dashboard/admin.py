@@ -1,3 +1,15 @@
 from django.contrib import admin
+from .models import PairStatistics, SignalStatistics
 
-# Register your models here.
+@admin.register(PairStatistics)
+class PairStatisticsAdmin(admin.ModelAdmin):
+    list_display = ('pair', 'last_price', 'last_timestamp', 'change_24h', 'volume_24h', 'updated_at')
+    search_fields = ('pair__symbol',)
+    readonly_fields = ('updated_at',)
+
+@admin.register(SignalStatistics)
+class SignalStatisticsAdmin(admin.ModelAdmin):
+    list_display = ('pair', 'strategy', 'signal_type', 'count', 'confidence_sum', 'updated_at')
+    search_fields = ('pair__symbol', 'strategy__name')
+    list_filter = ('strategy', 'signal_type')
+    readonly_fields = ('updated_at',)
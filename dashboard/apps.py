@@ -4,3 +4,17 @@ from django.apps import AppConfig
 class DashboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'dashboard'
+    
+    def ready(self):
+        from market_data.events import price_data_updated
+        from signals.events import signals_created
+        from .push import PushHub
+        from .statistics import StatisticsService
+        
+        # Tenir les tables de statistiques à jour au fil des bougies et des signaux
+        price_data_updated.connect(StatisticsService.on_price_data_updated, dispatch_uid='dashboard.pair_statistics')
+        signals_created.connect(StatisticsService.on_signals_created, dispatch_uid='dashboard.signal_statistics')
+
+        # Pousser les nouveautés vers les tableaux de bord connectés (SSE)
+        price_data_updated.connect(PushHub.on_price_data_updated, dispatch_uid='dashboard.push_bars')
+        signals_created.connect(PushHub.on_signals_created, dispatch_uid='dashboard.push_signals')
@@ -0,0 +1,332 @@
+# dashboard/charts.py
+import hashlib
+from datetime import datetime, time, timedelta
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F, Window
+from django.db.models.functions import FirstValue, TruncDate
+from django.utils import timezone
+from market_data.models import CurrencyPair, PriceData
+from signals.models import Signal
+from signals.analysis import IndicatorCache, TechnicalIndicators, COMBINED_STRATEGY_PARAMS
+from signals.sql_indicators import SQLIndicatorEngine
+
+# Nombre de bougies affichées sur les graphiques
+CHART_BARS = 100
+
+# Durée de conservation d'une série dans le cache (secondes) ; la clé change à chaque nouvelle bougie
+CHART_CACHE_TIMEOUT = getattr(settings, 'DASHBOARD_CHART_CACHE_TIMEOUT', 3600)
+
+# Décimales conservées pour les indicateurs (réduit la taille de la réponse)
+INDICATOR_DIGITS = 6
+
+# Durée de conservation des séries de performance (secondes) ; la clé change chaque jour
+PERFORMANCE_CACHE_TIMEOUT = getattr(settings, 'DASHBOARD_PERFORMANCE_CACHE_TIMEOUT', 900)
+
+# Nombre maximal de jours d'une série de performance (borne la taille des séries et le nombre de clés de cache)
+PERFORMANCE_MAX_DAYS = getattr(settings, 'DASHBOARD_PERFORMANCE_MAX_DAYS', 365)
+
+# Couleurs des séries de performance, attribuées dans l'ordre des paires
+PERFORMANCE_COLORS = ['#4e73df', '#1cc88a', '#f6c23e', '#e74a3b', '#36b9cc', '#6f42c1', '#fd7e14', '#20c9a6']
+
+def _to_list(values, digits=None):
+    """Convertit une série en liste JSON (NaN -> null)"""
+    values = np.asarray(values, dtype=np.float64)
+    if digits is not None:
+        values = np.round(values, digits)
+    return np.where(np.isnan(values), None, values).tolist()
+
+class ChartDataService:
+    """Séries des graphiques du tableau de bord, mises en cache par (paire, timeframe, dernière bougie)"""
+    
+    @staticmethod
+    def get_version(pair, timeframe):
+        """
+        Identifie l'état des données affichées : dernière bougie et dernier signal
+        
+        Deux requêtes indexées suffisent ; la série n'est recalculée que lorsque
+        cette version change.
+        
+        Returns:
+            str: Version des données, ou None si la paire n'a pas de bougies
+        """
+        last_bar = IndicatorCache.get_last_bar(pair.symbol, timeframe)
+        if last_bar is None:
+            return None
+        
+        last_signal = Signal.objects.filter(
+            pair=pair, timeframe=timeframe
+        ).order_by('-id').values_list('id', flat=True).first()
+        
+        return f"{int(last_bar[0].timestamp())}:{last_bar[1]}:{last_signal or 0}"
+    
+    @staticmethod
+    def get_etag(pair, timeframe, version):
+        """ETag HTTP correspondant à une version des données"""
+        digest = hashlib.sha1(f"{pair.id}:{timeframe}:{version}".encode()).hexdigest()[:20]
+        return f'"{digest}"'
+    
+    @staticmethod
+    def compute_indicators(pair, timeframe, params=COMBINED_STRATEGY_PARAMS):
+        """
+        Indicateurs des graphiques calculés en pandas sur l'entrée du cache d'indicateurs
+        
+        Returns:
+            pd.DataFrame: Colonnes bb_middle, bb_upper, bb_lower, williams_r, stoch_k, stoch_d
+        """
+        bb = IndicatorCache.get_indicator(
+            pair.symbol, timeframe, 'bollinger_bands', (params['bb_period'], params['bb_deviation'], params['bb_shift']),
+            lambda data: TechnicalIndicators.calculate_bollinger_bands(
+                data['close'], params['bb_period'], params['bb_deviation'], params['bb_shift']
+            )
+        )
+        williams_r = IndicatorCache.get_indicator(
+            pair.symbol, timeframe, 'williams_r', (params['williams_period'],),
+            lambda data: TechnicalIndicators.calculate_williams_r(data['high'], data['low'], data['close'], params['williams_period'])
+        )
+        stoch = IndicatorCache.get_indicator(
+            pair.symbol, timeframe, 'stochastic', (params['stoch_k_period'], params['stoch_d_period'], params['stoch_slowing']),
+            lambda data: TechnicalIndicators.calculate_stochastic(
+                data['high'], data['low'], data['close'],
+                params['stoch_k_period'], params['stoch_d_period'], params['stoch_slowing']
+            )
+        )
+        return pd.DataFrame({
+            'bb_middle': bb['middle_band'],
+            'bb_upper': bb['upper_band'],
+            'bb_lower': bb['lower_band'],
+            'williams_r': williams_r,
+            'stoch_k': stoch['k'],
+            'stoch_d': stoch['d'],
+        })
+    
+    @staticmethod
+    def build_series(pair, timeframe, bars=CHART_BARS):
+        """
+        Calcule les séries d'un graphique (prix, Bollinger, Williams %R, Stochastique, signaux)
+        
+        Les horodatages sont envoyés une seule fois, en secondes epoch ; les
+        niveaux constants sont des scalaires.
+        
+        Args:
+            pair (CurrencyPair): Paire de devises
+            timeframe (str): Timeframe des données
+            bars (int): Nombre de bougies affichées
+        
+        Returns:
+            dict: Séries en colonnes, ou None si les données sont insuffisantes
+        """
+        params = COMBINED_STRATEGY_PARAMS
+        
+        if SQLIndicatorEngine.is_available():
+            # Indicateurs calculés par la base : seules les bougies affichées sont transférées
+            df = SQLIndicatorEngine.compute(pair, timeframe, bars, params)
+            if len(df) < params['bb_period']:
+                return None
+            indicators = df
+        else:
+            df = IndicatorCache.get_price_data(pair.symbol, timeframe, limit=bars)
+            if df is None or len(df) < params['bb_period']:
+                return None
+            indicators = ChartDataService.compute_indicators(pair, timeframe, params).reindex(df.index)
+        
+        index = df.index
+        series = {
+            't': (index.asi8 // 10 ** 9).tolist(),
+            'open': _to_list(df['open']),
+            'high': _to_list(df['high']),
+            'low': _to_list(df['low']),
+            'close': _to_list(df['close']),
+            'volume': _to_list(df['volume']),
+            'bb_middle': _to_list(indicators['bb_middle'], INDICATOR_DIGITS),
+            'bb_upper': _to_list(indicators['bb_upper'], INDICATOR_DIGITS),
+            'bb_lower': _to_list(indicators['bb_lower'], INDICATOR_DIGITS),
+            'williams_r': _to_list(indicators['williams_r'], 2),
+            'stoch_k': _to_list(indicators['stoch_k'], 2),
+            'stoch_d': _to_list(indicators['stoch_d'], 2),
+        }
+        
+        # Signaux récents pour cette paire
+        recent_signals = Signal.objects.filter(
+            pair=pair,
+            timeframe=timeframe,
+            timestamp__gte=timezone.now() - timedelta(days=7 if timeframe == '1d' else 2)
+        ).order_by('-timestamp').values_list('timestamp', 'entry_price', 'signal_type', 'confidence')[:10]
+        
+        return {
+            'timeframe': timeframe,
+            'series': series,
+            'levels': {
+                'williams_r': {'overbought': params['williams_overbought'], 'oversold': params['williams_oversold']},
+                'stochastic': {'overbought': params['stoch_overbought'], 'oversold': params['stoch_oversold']},
+            },
+            'signals': [
+                {'t': int(timestamp.timestamp()), 'price': float(price), 'type': signal_type, 'confidence': float(confidence)}
+                for timestamp, price, signal_type, confidence in recent_signals
+            ],
+        }
+    
+    @staticmethod
+    def get_series(pair, timeframe, version, bars=CHART_BARS):
+        """
+        Retourne les séries depuis le cache partagé, en les calculant au besoin
+        
+        Args:
+            pair (CurrencyPair): Paire de devises
+            timeframe (str): Timeframe des données
+            version (str): Version retournée par get_version (fait partie de la clé)
+            bars (int): Nombre de bougies affichées
+        
+        Returns:
+            dict: Séries du graphique, ou None
+        """
+        key = f"chart:{pair.id}:{timeframe}:{bars}:{version}"
+        
+        try:
+            data = cache.get(key)
+        except Exception as e:
+            print(f"Chart cache unavailable: {str(e)}")
+            return ChartDataService.build_series(pair, timeframe, bars)
+        
+        if data is None:
+            data = ChartDataService.build_series(pair, timeframe, bars)
+            if data is not None:
+                try:
+                    cache.set(key, data, CHART_CACHE_TIMEOUT)
+                except Exception as e:
+                    print(f"Chart cache unavailable: {str(e)}")
+        
+        return data
+    
+    @staticmethod
+    def slice_since(data, since):
+        """
+        Réduit les séries aux bougies d'horodatage >= since (mode incrémental)
+        
+        La bougie `since` est renvoyée car elle a pu être mise à jour depuis.
+        
+        Args:
+            data (dict): Séries complètes
+            since (int): Horodatage epoch (secondes) de la dernière bougie connue du client
+        
+        Returns:
+            dict: Séries partielles, avec 'since' renseigné
+        """
+        timestamps = data['series']['t']
+        start = int(np.searchsorted(timestamps, since, side='left'))
+        return {
+            **data,
+            'since': since,
+            'series': {name: values[start:] for name, values in data['series'].items()},
+        }
+
+class PairPerformanceService:
+    """Variation quotidienne des paires actives, calculée en une seule requête"""
+    
+    @staticmethod
+    def get_daily_closes(pair_ids, start_day, end_day):
+        """
+        Première et dernière clôture de chaque jour pour plusieurs paires
+        
+        Sous PostgreSQL, DISTINCT ON (paire, jour) garde la dernière bougie du
+        jour et une fenêtre FIRST_VALUE y ajoute la première ; ailleurs, les deux
+        valeurs sont obtenues par fenêtres puis dédoublonnées.
+        
+        Args:
+            pair_ids (list): Identifiants des paires
+            start_day (date): Premier jour inclus
+            end_day (date): Dernier jour exclu
+        
+        Returns:
+            pd.DataFrame: Colonnes pair_id, day, first_close, last_close
+        """
+        partition = [F('pair_id'), F('day')]
+        queryset = PriceData.objects.filter(
+            pair_id__in=pair_ids,
+            # Bougies 1h importées uniquement, pour ne pas mélanger les tailles de bougies
+            timeframe='1h',
+            # Bornes en datetime pour profiter de l'index (pair, timestamp)
+            timestamp__gte=timezone.make_aware(datetime.combine(start_day, time.min)),
+            timestamp__lt=timezone.make_aware(datetime.combine(end_day, time.min))
+        ).annotate(
+            day=TruncDate('timestamp'),
+            first_close=Window(FirstValue('close_price'), partition_by=partition, order_by=F('timestamp').asc()),
+        )
+        
+        if connection.features.can_distinct_on_fields:
+            rows = queryset.order_by('pair_id', 'day', '-timestamp').distinct('pair_id', 'day').values_list(
+                'pair_id', 'day', 'first_close', 'close_price'
+            )
+        else:
+            rows = queryset.annotate(
+                last_close=Window(FirstValue('close_price'), partition_by=partition, order_by=F('timestamp').desc()),
+            ).order_by().values_list('pair_id', 'day', 'first_close', 'last_close').distinct()
+        
+        frame = pd.DataFrame(list(rows), columns=['pair_id', 'day', 'first_close', 'last_close'])
+        frame[['first_close', 'last_close']] = frame[['first_close', 'last_close']].astype(np.float64)
+        return frame
+    
+    @staticmethod
+    def build_series(days):
+        """
+        Variation en pourcentage de chaque paire active depuis le premier jour
+        
+        Les jours sans bougie reprennent la dernière valeur connue (0 avant la
+        première bougie).
+        
+        Args:
+            days (int): Nombre de jours affichés (aujourd'hui exclu)
+        
+        Returns:
+            dict: Étiquettes et datasets Chart.js
+        """
+        today = timezone.localdate()
+        dates = pd.date_range(end=today - timedelta(days=1), periods=days, freq='D').date
+        pairs = list(CurrencyPair.objects.filter(is_active=True).values_list('id', 'symbol'))
+        
+        frame = PairPerformanceService.get_daily_closes([pair_id for pair_id, _ in pairs], dates[0], today)
+        closes = frame.pivot(index='day', columns='pair_id', values='last_close').reindex(dates).ffill()
+        base = frame.sort_values('day').groupby('pair_id')['first_close'].first()
+        changes = ((closes - base) / base * 100).fillna(0)
+        
+        datasets = []
+        for i, (pair_id, symbol) in enumerate(pairs):
+            if pair_id not in base.index:
+                continue
+            color = PERFORMANCE_COLORS[i % len(PERFORMANCE_COLORS)]
+            datasets.append({
+                'label': symbol,
+                'data': changes[pair_id].tolist(),
+                'borderColor': color,
+                'backgroundColor': 'transparent',
+                'pointBackgroundColor': color,
+            })
+        
+        return {
+            'labels': [date.strftime('%d/%m') for date in dates],
+            'datasets': datasets,
+        }
+    
+    @staticmethod
+    def get_series(days):
+        """Retourne les séries de performance depuis le cache, par jour et par durée (1 à PERFORMANCE_MAX_DAYS jours)"""
+        days = min(max(1, int(days)), PERFORMANCE_MAX_DAYS)
+        key = f"performance:{timezone.localdate().isoformat()}:{days}"
+        
+        try:
+            data = cache.get(key)
+        except Exception as e:
+            print(f"Performance cache unavailable: {str(e)}")
+            return PairPerformanceService.build_series(days)
+        
+        if data is None:
+            data = PairPerformanceService.build_series(days)
+            try:
+                cache.set(key, data, PERFORMANCE_CACHE_TIMEOUT)
+            except Exception as e:
+                print(f"Performance cache unavailable: {str(e)}")
+        
+        return data
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from dashboard.statistics import StatisticsService
+
+class Command(BaseCommand):
+    help = 'Rebuild the dashboard statistics tables from PriceData and Signal'
+    
+    def handle(self, *args, **options):
+        counts = StatisticsService.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Statistics rebuilt for {counts['pairs']} pairs ({counts['signals']} signal counters)"
+        ))
@@ -0,0 +1,50 @@
+# Generated by Django 5.1.8 on 2026-10-18 10:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('market_data', '0003_currency_pair_fetch_priority'),
+        ('signals', '0002_indicator_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PairStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_price', models.DecimalField(blank=True, decimal_places=8, max_digits=18, null=True)),
+                ('last_timestamp', models.DateTimeField(blank=True, null=True)),
+                ('price_24h_ago', models.DecimalField(blank=True, decimal_places=8, max_digits=18, null=True)),
+                ('change_24h', models.FloatField(default=0)),
+                ('volume_24h', models.DecimalField(decimal_places=8, default=0, max_digits=24)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('pair', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='statistics', to='market_data.currencypair')),
+            ],
+            options={
+                'verbose_name_plural': 'pair statistics',
+            },
+        ),
+        migrations.CreateModel(
+            name='SignalStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('signal_type', models.CharField(choices=[('BUY', 'Buy'), ('SELL', 'Sell'), ('HOLD', 'Hold')], max_length=10)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('confidence_sum', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('pair', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='signal_statistics', to='market_data.currencypair')),
+                ('strategy', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='signal_statistics', to='signals.strategy')),
+            ],
+            options={
+                'verbose_name_plural': 'signal statistics',
+                'indexes': [models.Index(fields=['strategy', 'pair'], name='dashboard_s_strateg_5deb2e_idx')],
+                'unique_together': {('pair', 'strategy', 'signal_type')},
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations
+from dashboard.statistics import StatisticsService
+
+
+def populate_statistics(apps, schema_editor):
+    # Tables créées vides par 0001 : les remplir à partir des bougies et des signaux existants
+    StatisticsService.rebuild(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0001_initial'),
+        ('market_data', '0004_partition_pricedata'),
+        ('signals', '0006_partition_signal'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_statistics, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,39 @@
+# dashboard/models.py
 from django.db import models
+from market_data.models import CurrencyPair
+from signals.models import Signal, Strategy
 
-# Create your models here.
+class PairStatistics(models.Model):
+    """Statistiques de prix d'une paire, recalculées à chaque enregistrement de bougies"""
+    pair = models.OneToOneField(CurrencyPair, on_delete=models.CASCADE, related_name='statistics')
+    last_price = models.DecimalField(max_digits=18, decimal_places=8, null=True, blank=True)
+    last_timestamp = models.DateTimeField(null=True, blank=True)
+    price_24h_ago = models.DecimalField(max_digits=18, decimal_places=8, null=True, blank=True)
+    change_24h = models.FloatField(default=0)
+    volume_24h = models.DecimalField(max_digits=24, decimal_places=8, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name_plural = 'pair statistics'
+    
+    def __str__(self):
+        return f"{self.pair.symbol} - {self.last_price}"
+
+class SignalStatistics(models.Model):
+    """Compteurs de signaux par paire, stratégie et type, incrémentés à chaque création"""
+    pair = models.ForeignKey(CurrencyPair, on_delete=models.CASCADE, related_name='signal_statistics')
+    strategy = models.ForeignKey(Strategy, on_delete=models.CASCADE, related_name='signal_statistics')
+    signal_type = models.CharField(max_length=10, choices=Signal.SIGNAL_TYPES)
+    count = models.PositiveIntegerField(default=0)
+    confidence_sum = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name_plural = 'signal statistics'
+        unique_together = ('pair', 'strategy', 'signal_type')
+        indexes = [
+            models.Index(fields=['strategy', 'pair']),
+        ]
+    
+    def __str__(self):
+        return f"{self.pair.symbol} - {self.strategy.name} - {self.signal_type}: {self.count}"
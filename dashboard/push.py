@@ -0,0 +1,184 @@
+# dashboard/push.py
+"""
+Diffusion en temps réel des nouvelles bougies et des nouveaux signaux
+
+Les producteurs (mise à jour des prix, générateurs de signaux, y compris
+dans les workers Celery) publient un message sur un canal Redis pub/sub.
+Dans chaque processus ASGI, un seul abonné Redis redistribue les messages
+aux connexions SSE ouvertes via des files asyncio : une connexion inactive
+ne coûte qu'une file et une coroutine en attente.
+
+Le broker 'local' remplace Redis par une diffusion en mémoire, limitée au
+processus courant (développement).
+"""
+import asyncio
+import json
+import threading
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from market_data.models import CurrencyPair
+
+# 'redis' (défaut) ou 'local'
+PUSH_BROKER = getattr(settings, 'DASHBOARD_PUSH_BROKER', 'redis')
+
+# Serveur Redis utilisé pour le pub/sub
+PUSH_REDIS_URL = getattr(settings, 'DASHBOARD_PUSH_REDIS_URL', 'redis://localhost:6379/0')
+
+# Canal pub/sub des événements du tableau de bord
+PUSH_CHANNEL = 'trading_signals:dashboard:events'
+
+# Intervalle des commentaires de maintien de connexion (secondes)
+PUSH_HEARTBEAT = getattr(settings, 'DASHBOARD_PUSH_HEARTBEAT', 15)
+
+# Messages en attente par connexion ; au-delà, les plus anciens sont abandonnés
+PUSH_QUEUE_SIZE = 100
+
+class PushHub:
+    """Répartition des événements d'un processus vers ses connexions SSE abonnées"""
+    
+    subscribers = {}
+    loop = None
+    listener = None
+    _redis = None
+    _redis_lock = threading.Lock()
+    
+    @classmethod
+    def subscribe(cls, pair_id=None):
+        """
+        Ouvre un abonnement (à appeler depuis la boucle asyncio du serveur)
+        
+        Args:
+            pair_id (int, optional): Ne recevoir que les événements de cette paire
+        
+        Returns:
+            asyncio.Queue: File recevant les messages (event, data)
+        """
+        cls.loop = asyncio.get_running_loop()
+        if PUSH_BROKER == 'redis' and (cls.listener is None or cls.listener.done()):
+            cls.listener = cls.loop.create_task(cls.listen())
+        
+        queue = asyncio.Queue(maxsize=PUSH_QUEUE_SIZE)
+        cls.subscribers[queue] = pair_id
+        return queue
+    
+    @classmethod
+    def unsubscribe(cls, queue):
+        cls.subscribers.pop(queue, None)
+    
+    @classmethod
+    def dispatch(cls, message):
+        """Transmet un message (dict event/data) aux abonnés concernés, dans la boucle du serveur"""
+        pair_id = message['data'].get('pair_id')
+        for queue, subscribed_pair in list(cls.subscribers.items()):
+            if subscribed_pair is not None and subscribed_pair != pair_id:
+                continue
+            if queue.full():
+                # Client trop lent : abandonner le message le plus ancien
+                queue.get_nowait()
+            queue.put_nowait((message['event'], message['data']))
+    
+    @classmethod
+    async def listen(cls):
+        """Abonné Redis unique du processus ; se reconnecte après une coupure"""
+        import redis.asyncio as aioredis
+        
+        delay = 1
+        while True:
+            try:
+                client = aioredis.Redis.from_url(PUSH_REDIS_URL)
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(PUSH_CHANNEL)
+                    delay = 1
+                    async for item in pubsub.listen():
+                        if item['type'] == 'message':
+                            cls.dispatch(json.loads(item['data']))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Push listener disconnected: {str(e)}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+    
+    @classmethod
+    def get_redis(cls):
+        """Client Redis synchrone partagé par les producteurs du processus"""
+        with cls._redis_lock:
+            if cls._redis is None:
+                import redis
+                cls._redis = redis.Redis.from_url(PUSH_REDIS_URL)
+            return cls._redis
+    
+    @classmethod
+    def publish(cls, event, data):
+        """
+        Publie un événement à destination des tableaux de bord connectés
+        
+        Appelable depuis du code synchrone (vues, tâches Celery). Une erreur de
+        publication n'interrompt jamais le producteur.
+        
+        Args:
+            event (str): Type d'événement ('bar' ou 'signal')
+            data (dict): Contenu de l'événement (pair_id sert au filtrage)
+        """
+        message = {'event': event, 'data': data}
+        try:
+            if PUSH_BROKER == 'local':
+                if cls.loop is not None and not cls.loop.is_closed():
+                    cls.loop.call_soon_threadsafe(cls.dispatch, message)
+                return
+            cls.get_redis().publish(PUSH_CHANNEL, json.dumps(message, cls=DjangoJSONEncoder))
+        except Exception as e:
+            print(f"Could not publish {event} event: {str(e)}")
+    
+    @staticmethod
+    def on_price_data_updated(sender, pair_symbol, timeframe, inserted=0, updated=0, **kwargs):
+        """Récepteur de market_data.events.price_data_updated"""
+        pair_id = CurrencyPair.objects.filter(symbol=pair_symbol).values_list('id', flat=True).first()
+        PushHub.publish('bar', {
+            'pair_id': pair_id,
+            'pair': pair_symbol,
+            'timeframe': timeframe,
+            'inserted': inserted,
+            'updated': updated,
+        })
+    
+    @staticmethod
+    def on_signals_created(sender, signals, **kwargs):
+        """Récepteur de signals.events.signals_created"""
+        for signal in signals:
+            PushHub.publish('signal', {
+                'id': signal.id,
+                'pair_id': signal.pair_id,
+                'pair': signal.pair.symbol,
+                'strategy': signal.strategy.name,
+                'signal_type': signal.signal_type,
+                'timeframe': signal.timeframe,
+                'timeframe_display': signal.get_timeframe_display(),
+                'entry_price': float(signal.entry_price),
+                'confidence': signal.confidence,
+                'timestamp': signal.timestamp,
+            })
+
+def format_event(event, data):
+    """Message au format text/event-stream"""
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+async def event_stream(pair_id=None, heartbeat=PUSH_HEARTBEAT):
+    """
+    Flux SSE d'une connexion : événements de la paire (ou de toutes) et maintien de connexion
+    
+    Yields:
+        str: Messages text/event-stream
+    """
+    queue = PushHub.subscribe(pair_id)
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                event, data = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield format_event(event, data)
+    finally:
+        PushHub.unsubscribe(queue)
@@ -0,0 +1,180 @@
+# dashboard/statistics.py
+from collections import defaultdict
+from datetime import timedelta
+from django.apps import apps as global_apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+from market_data.models import CurrencyPair
+from .models import PairStatistics, SignalStatistics
+
+class StatisticsService:
+    """Tenue à jour des tables de statistiques affichées par le tableau de bord"""
+    
+    @staticmethod
+    def refresh_pair(pair, apps=global_apps):
+        """
+        Recalcule les statistiques de prix d'une paire (dernier prix, variation et volume sur 24h)
+        
+        Args:
+            pair (CurrencyPair): Paire de devises
+            apps (Apps, optional): Registre des modèles (registre historique dans une migration)
+        
+        Returns:
+            PairStatistics: Statistiques enregistrées
+        """
+        # Bougies 1h importées uniquement (les timeframes natifs ne se mélangent pas)
+        prices = apps.get_model('market_data', 'PriceData').objects.filter(pair=pair, timeframe='1h')
+        latest_price = prices.order_by('-timestamp').values_list('timestamp', 'close_price').first()
+        
+        yesterday = timezone.now() - timedelta(days=1)
+        previous_price = prices.filter(timestamp__lte=yesterday).order_by('-timestamp').values_list('close_price', flat=True).first()
+        daily_volume = prices.filter(timestamp__gte=yesterday).aggregate(total_volume=Sum('volume'))['total_volume'] or 0
+        
+        last_timestamp, last_price = latest_price or (None, None)
+        change_24h = 0
+        if previous_price and last_price is not None:
+            change_24h = float((last_price - previous_price) / previous_price * 100)
+        
+        statistics, _ = apps.get_model('dashboard', 'PairStatistics').objects.update_or_create(
+            pair=pair,
+            defaults={
+                'last_price': last_price,
+                'last_timestamp': last_timestamp,
+                'price_24h_ago': previous_price,
+                'change_24h': change_24h,
+                'volume_24h': daily_volume,
+            }
+        )
+        return statistics
+    
+    @staticmethod
+    def record_signals(signals):
+        """
+        Incrémente les compteurs pour des signaux nouvellement créés
+        
+        Les incréments sont faits en SQL (F()) pour rester corrects avec
+        plusieurs workers en parallèle.
+        
+        Args:
+            signals (list): Instances de Signal enregistrées
+        """
+        increments = defaultdict(lambda: [0, 0.0])
+        for signal in signals:
+            increment = increments[(signal.pair_id, signal.strategy_id, signal.signal_type)]
+            increment[0] += 1
+            increment[1] += signal.confidence
+        
+        now = timezone.now()
+        for (pair_id, strategy_id, signal_type), (count, confidence_sum) in increments.items():
+            lookup = {'pair_id': pair_id, 'strategy_id': strategy_id, 'signal_type': signal_type}
+            changes = {'count': F('count') + count, 'confidence_sum': F('confidence_sum') + confidence_sum, 'updated_at': now}
+            
+            if SignalStatistics.objects.filter(**lookup).update(**changes):
+                continue
+            try:
+                with transaction.atomic():
+                    SignalStatistics.objects.create(**lookup, count=count, confidence_sum=confidence_sum)
+            except IntegrityError:
+                # Ligne créée entre-temps par un autre worker
+                SignalStatistics.objects.filter(**lookup).update(**changes)
+    
+    @staticmethod
+    def rebuild(apps=global_apps):
+        """
+        Reconstruit toutes les statistiques à partir des tables PriceData et Signal
+        
+        Args:
+            apps (Apps, optional): Registre des modèles (registre historique dans une migration)
+        
+        Returns:
+            dict: Nombre de lignes de statistiques par table
+        """
+        pairs = list(apps.get_model('market_data', 'CurrencyPair').objects.all())
+        for pair in pairs:
+            StatisticsService.refresh_pair(pair, apps)
+        
+        rows = apps.get_model('signals', 'Signal').objects.values('pair_id', 'strategy_id', 'signal_type').annotate(
+            count=Count('id'), confidence_sum=Sum('confidence')
+        ).order_by()
+        
+        signal_statistics = apps.get_model('dashboard', 'SignalStatistics')
+        with transaction.atomic():
+            signal_statistics.objects.all().delete()
+            signal_statistics.objects.bulk_create([signal_statistics(**row) for row in rows])
+        
+        return {'pairs': len(pairs), 'signals': signal_statistics.objects.count()}
+    
+    @staticmethod
+    def get_pair_summary(pair):
+        """
+        Statistiques affichées sur la page d'une paire
+        
+        Returns:
+            dict: last_price, last_timestamp, daily_change, daily_volume, buy_signals_count, sell_signals_count
+        """
+        try:
+            statistics = pair.statistics
+        except PairStatistics.DoesNotExist:
+            statistics = StatisticsService.refresh_pair(pair)
+        
+        counts = dict(SignalStatistics.objects.filter(pair=pair).values('signal_type').annotate(
+            total=Sum('count')
+        ).values_list('signal_type', 'total'))
+        
+        return {
+            'last_price': statistics.last_price,
+            'last_timestamp': statistics.last_timestamp,
+            'daily_change': statistics.change_24h,
+            'daily_volume': statistics.volume_24h,
+            'buy_signals_count': counts.get('BUY', 0),
+            'sell_signals_count': counts.get('SELL', 0),
+        }
+    
+    @staticmethod
+    def get_strategy_summary(strategy):
+        """
+        Statistiques affichées sur la page d'une stratégie
+        
+        Returns:
+            dict: total_signals, buy_signals, sell_signals, avg_confidence, signals_by_pair
+        """
+        rows = list(SignalStatistics.objects.filter(strategy=strategy).values_list(
+            'pair__symbol', 'signal_type', 'count', 'confidence_sum'
+        ))
+        
+        by_pair = defaultdict(int)
+        by_type = defaultdict(int)
+        confidence_sum = 0.0
+        for symbol, signal_type, count, confidence in rows:
+            by_pair[symbol] += count
+            by_type[signal_type] += count
+            confidence_sum += confidence
+        
+        total_signals = sum(by_type.values())
+        return {
+            'total_signals': total_signals,
+            'buy_signals': by_type['BUY'],
+            'sell_signals': by_type['SELL'],
+            'avg_confidence': confidence_sum / total_signals if total_signals else 0,
+            'signals_by_pair': [
+                {'pair__symbol': symbol, 'count': count}
+                for symbol, count in sorted(by_pair.items(), key=lambda item: -item[1])
+            ],
+        }
+    
+    @staticmethod
+    def on_price_data_updated(sender, pair_symbol, **kwargs):
+        """Récepteur de market_data.events.price_data_updated"""
+        # Les statistiques ne lisent que les bougies 1h : ignorer les envois des timeframes agrégés
+        if kwargs.get('timeframe') != '1h':
+            return
+        
+        pair = CurrencyPair.objects.filter(symbol=pair_symbol).first()
+        if pair is not None:
+            StatisticsService.refresh_pair(pair)
+    
+    @staticmethod
+    def on_signals_created(sender, signals, **kwargs):
+        """Récepteur de signals.events.signals_created"""
+        StatisticsService.record_signals(signals)
@@ -11,4 +11,5 @@ urlpatterns = [
     # API endpoints
     path('api/pair/<int:pair_id>/chart-data/', views.api_pair_chart_data, name='api_pair_chart_data'),
     path('api/pair-performance/', views.api_pair_performance, name='api_pair_performance'),
+    path('api/events/', views.api_events, name='api_events'),
 ]
\ No newline at end of file
@@ -1,16 +1,19 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
-from django.db.models import Count, Avg
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, HttpResponseNotModified, StreamingHttpResponse
 from django.utils import timezone
 from datetime import timedelta
 import json
 import pandas as pd
 
-from market_data.models import CurrencyPair, PriceData
+from market_data.models import CurrencyPair
 from signals.models import Signal, Strategy
 from signals.analysis import SignalGenerator
 from signals.tasks import generate_combined_strategy_signals_task
+from .charts import ChartDataService, PairPerformanceService
+from .statistics import StatisticsService
+from .push import event_stream
 
 @login_required
 def dashboard_home(request):
@@ -37,44 +40,16 @@ def pair_detail(request, pair_id):
     """Vue pour la page de détail d'une paire de devises"""
     pair = get_object_or_404(CurrencyPair, id=pair_id)
     
-    # Récupérer les derniers prix
-    latest_price = PriceData.objects.filter(pair=pair).order_by('-timestamp').first()
-    
     # Récupérer les derniers signaux pour cette paire
     latest_signals = Signal.objects.filter(pair=pair).order_by('-timestamp')[:10]
     
-    # Calculer les statistiques
-    yesterday = timezone.now() - timedelta(days=1)
-    
-    # Prix d'il y a 24h
-    previous_price = PriceData.objects.filter(
-        pair=pair, 
-        timestamp__lte=yesterday
-    ).order_by('-timestamp').first()
-    
-    # Variation sur 24h
-    daily_change = 0
-    if previous_price and latest_price:
-        daily_change = ((latest_price.close_price - previous_price.close_price) / previous_price.close_price) * 100
-    
-    # Volume sur 24h
-    daily_volume = PriceData.objects.filter(
-        pair=pair, 
-        timestamp__gte=yesterday
-    ).aggregate(total_volume=Sum('volume'))['total_volume'] or 0
-    
-    # Nombre de signaux d'achat et de vente
-    buy_signals_count = Signal.objects.filter(pair=pair, signal_type='BUY').count()
-    sell_signals_count = Signal.objects.filter(pair=pair, signal_type='SELL').count()
+    # Statistiques pré-calculées (prix, variation et volume sur 24h, nombre de signaux)
+    statistics = StatisticsService.get_pair_summary(pair)
     
     context = {
         'pair': pair,
-        'latest_price': latest_price,
         'latest_signals': latest_signals,
-        'daily_change': daily_change,
-        'daily_volume': daily_volume,
-        'buy_signals_count': buy_signals_count,
-        'sell_signals_count': sell_signals_count,
+        **statistics,
     }
     
     return render(request, 'dashboard/pair_detail.html', context)
@@ -87,25 +62,13 @@ def strategy_detail(request, strategy_id):
     # Récupérer les derniers signaux pour cette stratégie
     latest_signals = Signal.objects.filter(strategy=strategy).order_by('-timestamp')[:20]
     
-    # Calculer les statistiques de performance
-    total_signals = Signal.objects.filter(strategy=strategy).count()
-    buy_signals = Signal.objects.filter(strategy=strategy, signal_type='BUY').count()
-    sell_signals = Signal.objects.filter(strategy=strategy, signal_type='SELL').count()
-    avg_confidence = Signal.objects.filter(strategy=strategy).aggregate(Avg('confidence'))['confidence__avg'] or 0
-    
-    # Distribution des signaux par paire
-    signals_by_pair = Signal.objects.filter(strategy=strategy).values('pair__symbol').annotate(
-        count=Count('id')
-    ).order_by('-count')
+    # Statistiques pré-calculées (nombre de signaux par type et par paire, confiance moyenne)
+    statistics = StatisticsService.get_strategy_summary(strategy)
     
     context = {
         'strategy': strategy,
         'latest_signals': latest_signals,
-        'total_signals': total_signals,
-        'buy_signals': buy_signals,
-        'sell_signals': sell_signals,
-        'avg_confidence': avg_confidence,
-        'signals_by_pair': signals_by_pair,
+        **statistics,
     }
     
     return render(request, 'dashboard/strategy_detail.html', context)
@@ -180,164 +143,78 @@ def generate_signal(request, pair_id):
 
 @login_required
 def api_pair_chart_data(request, pair_id):
-    """API pour récupérer les données de graphique pour une paire"""
+    """
+    API pour récupérer les données de graphique pour une paire
+    
+    Les séries sont mises en cache par (paire, timeframe, dernière bougie) et
+    envoyées en colonnes avec des horodatages epoch. Paramètres :
+    ?timeframe= (défaut 1d) et ?since=<epoch> pour ne recevoir que les bougies
+    à partir de la dernière connue. L'en-tête If-None-Match permet de recevoir
+    un 304 tant qu'aucune donnée n'a changé.
+    """
     pair = get_object_or_404(CurrencyPair, id=pair_id)
     timeframe = request.GET.get('timeframe', '1d')
     
-    # Récupérer les données de prix
-    df = SignalGenerator.get_price_data(pair.symbol, timeframe=timeframe, limit=100)
-    
-    if df is None or len(df) < 27:  # Minimum requis pour les calculs
+    version = ChartDataService.get_version(pair, timeframe)
+    if version is None:
         return JsonResponse({'error': 'Pas assez de données disponibles'})
     
-    # Calculer les indicateurs
-    # Bandes de Bollinger
-    bb = TechnicalIndicators.calculate_bollinger_bands(
-        df['close'], period=27, deviation=2.7, shift=0
-    )
-    df['bb_middle'] = bb['middle_band']
-    df['bb_upper'] = bb['upper_band']
-    df['bb_lower'] = bb['lower_band']
-    
-    # Williams %R
-    df['williams_r'] = TechnicalIndicators.calculate_williams_r(
-        df['high'], df['low'], df['close'], period=75
-    )
-    
-    # Stochastique
-    stoch = TechnicalIndicators.calculate_stochastic(
-        df['high'], df['low'], df['close'], k_period=40, d_period=20, slowing=15
-    )
-    df['stoch_k'] = stoch['k']
-    df['stoch_d'] = stoch['d']
-    
-    # Reset index pour avoir la date comme colonne
-    df = df.reset_index()
-    
-    # Convertir les dates en chaînes de caractères pour JSON
-    df['timestamp'] = df['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
-    
-    # Données pour le graphique des prix OHLC
-    price_data = {
-        'timestamps': df['timestamp'].tolist(),
-        'open': df['open'].tolist(),
-        'high': df['high'].tolist(),
-        'low': df['low'].tolist(),
-        'close': df['close'].tolist(),
-        'volume': df['volume'].tolist(),
-    }
-    
-    # Données pour le graphique Bollinger
-    bollinger_data = {
-        'timestamps': df['timestamp'].tolist(),
-        'close': df['close'].tolist(),
-        'middle': df['bb_middle'].tolist(),
-        'upper': df['bb_upper'].tolist(),
-        'lower': df['bb_lower'].tolist(),
-    }
-    
-    # Données pour le graphique Williams %R
-    williams_data = {
-        'timestamps': df['timestamp'].tolist(),
-        'williams_r': df['williams_r'].tolist(),
-        'overbought': [-20] * len(df),  # Ligne de surachat
-        'oversold': [-80] * len(df),    # Ligne de survente
-    }
+    etag = ChartDataService.get_etag(pair, timeframe, version)
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
     
-    # Données pour le graphique Stochastique
-    stochastic_data = {
-        'timestamps': df['timestamp'].tolist(),
-        'k': df['stoch_k'].tolist(),
-        'd': df['stoch_d'].tolist(),
-        'overbought': [80] * len(df),   # Ligne de surachat
-        'oversold': [20] * len(df),     # Ligne de survente
-    }
-    
-    # Récupérer les signaux récents pour cette paire
-    recent_signals = Signal.objects.filter(
-        pair=pair,
-        timeframe=timeframe,
-        timestamp__gte=timezone.now() - timedelta(days=7 if timeframe == '1d' else 2)
-    ).order_by('-timestamp')[:10]
-    
-    # Convertir les signaux pour les afficher sur le graphique
-    signal_data = []
-    for signal in recent_signals:
-        signal_data.append({
-            'timestamp': signal.timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-            'price': float(signal.entry_price),
-            'type': signal.signal_type,
-            'confidence': float(signal.confidence),
-        })
+    data = ChartDataService.get_series(pair, timeframe, version)
+    if data is None:
+        return JsonResponse({'error': 'Pas assez de données disponibles'})
     
-    # Retourner toutes les données
-    return JsonResponse({
-        'price_data': price_data,
-        'bollinger_data': bollinger_data,
-        'williams_data': williams_data,
-        'stochastic_data': stochastic_data,
-        'signal_data': signal_data,
-    })
+    since = request.GET.get('since')
+    if since:
+        try:
+            data = ChartDataService.slice_since(data, int(since))
+        except ValueError:
+            return JsonResponse({'error': 'Paramètre since invalide'}, status=400)
+    
+    response = JsonResponse(data)
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
 
 @login_required
 def api_pair_performance(request):
-    """API pour récupérer les données de performance des paires"""
-    # Récupérer les paires actives
-    pairs = CurrencyPair.objects.filter(is_active=True)
-    days = int(request.GET.get('days', 7))
-    
-    start_date = timezone.now() - timedelta(days=days)
-    
-    datasets = []
-    labels = []
-    
-    # Générer des étiquettes pour les derniers jours
-    for i in range(days):
-        date = start_date + timedelta(days=i)
-        labels.append(date.strftime('%d/%m'))
-    
-    # Récupérer les données pour chaque paire
-    colors = ['#4e73df', '#1cc88a', '#f6c23e', '#e74a3b', '#36b9cc', '#6f42c1', '#fd7e14', '#20c9a6']
-    
-    for i, pair in enumerate(pairs):
-        # Récupérer les prix de clôture pour la période
-        prices = PriceData.objects.filter(
-            pair=pair,
-            timestamp__gte=start_date
-        ).order_by('timestamp')
-        
-        if not prices:
-            continue
-        
-        # Calculer la variation en pourcentage par rapport au premier jour
-        base_price = prices.first().close_price
-        
-        # Préparer les données pour le graphique
-        data = []
-        
-        for j in range(days):
-            date = start_date + timedelta(days=j)
-            day_price = prices.filter(timestamp__date=date.date()).order_by('-timestamp').first()
-            
-            if day_price:
-                # Variation en pourcentage
-                percentage_change = ((day_price.close_price - base_price) / base_price) * 100
-                data.append(float(percentage_change))
-            else:
-                # Si pas de donnée pour ce jour, utiliser la dernière valeur connue
-                data.append(data[-1] if data else 0)
-        
-        # Ajouter le dataset pour cette paire
-        color_index = i % len(colors)
-        datasets.append({
-            'label': pair.symbol,
-            'data': data,
-            'borderColor': colors[color_index],
-            'backgroundColor': 'transparent',
-            'pointBackgroundColor': colors[color_index],
-        })
+    """
+    API pour récupérer les données de performance des paires
+    
+    Les clôtures quotidiennes de toutes les paires actives sont lues en une
+    seule requête ; le résultat est mis en cache pour la journée.
+    """
+    try:
+        days = int(request.GET.get('days', 7))
+    except ValueError:
+        return JsonResponse({'error': 'Paramètre days invalide'}, status=400)
+    
+    # Borné à 1..PERFORMANCE_MAX_DAYS par get_series
+    return JsonResponse(PairPerformanceService.get_series(days))
+
+@login_required
+async def api_events(request):
+    """
+    Flux Server-Sent Events des nouvelles bougies ('bar') et des nouveaux signaux ('signal')
+    
+    ?pair=<id> limite le flux à une paire. À servir par un serveur ASGI : une
+    connexion inactive n'occupe alors ni thread ni connexion Redis. Sous WSGI,
+    le flux serait lu en entier avant d'être envoyé : la vue répond 503 et
+    les pages reviennent à l'interrogation périodique.
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse('Le flux temps réel nécessite un serveur ASGI', status=503, content_type='text/plain')
     
-    return JsonResponse({
-        'labels': labels,
-        'datasets': datasets,
-    })
\ No newline at end of file
+    pair_id = request.GET.get('pair')
+    response = StreamingHttpResponse(
+        event_stream(int(pair_id) if pair_id and pair_id.isdigit() else None),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
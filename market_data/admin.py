@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Currency, CurrencyPair, PriceData, EconomicIndicator, EconomicData
+from .models import Currency, CurrencyPair, PriceData, PriceAggregate, EconomicIndicator, EconomicData
 
 @admin.register(Currency)
 class CurrencyAdmin(admin.ModelAdmin):
@@ -9,17 +9,25 @@ class CurrencyAdmin(admin.ModelAdmin):
 
 @admin.register(CurrencyPair)
 class CurrencyPairAdmin(admin.ModelAdmin):
-    list_display = ('symbol', 'base_currency', 'quote_currency', 'is_active')
+    list_display = ('symbol', 'base_currency', 'quote_currency', 'is_active', 'fetch_priority')
     search_fields = ('symbol',)
     list_filter = ('is_active', 'base_currency', 'quote_currency')
 
 @admin.register(PriceData)
 class PriceDataAdmin(admin.ModelAdmin):
-    list_display = ('pair', 'timestamp', 'open_price', 'high_price', 'low_price', 'close_price', 'volume')
+    list_display = ('pair', 'timeframe', 'timestamp', 'open_price', 'high_price', 'low_price', 'close_price', 'volume')
     search_fields = ('pair__symbol',)
-    list_filter = ('pair', 'timestamp')
+    list_filter = ('pair', 'timeframe', 'timestamp')
     date_hierarchy = 'timestamp'
 
+@admin.register(PriceAggregate)
+class PriceAggregateAdmin(admin.ModelAdmin):
+    list_display = ('pair', 'timeframe', 'timestamp', 'open_price', 'high_price', 'low_price', 'close_price', 'volume', 'bar_count')
+    search_fields = ('pair__symbol',)
+    list_filter = ('pair', 'timeframe', 'source_timeframe')
+    date_hierarchy = 'timestamp'
+    readonly_fields = ('updated_at',)
+
 @admin.register(EconomicIndicator)
 class EconomicIndicatorAdmin(admin.ModelAdmin):
     list_display = ('code', 'name', 'country', 'is_active')
@@ -0,0 +1,238 @@
+# market_data/aggregation.py
+import pandas as pd
+from django.db import transaction
+from django.db.models import Max
+from .models import PriceData, PriceAggregate
+from .archive import PriceArchive
+
+# Durée des timeframes à pas fixe, du plus fin au plus large
+TIMEFRAME_DURATIONS = {
+    '1m': pd.Timedelta(minutes=1),
+    '5m': pd.Timedelta(minutes=5),
+    '15m': pd.Timedelta(minutes=15),
+    '30m': pd.Timedelta(minutes=30),
+    '1h': pd.Timedelta(hours=1),
+    '4h': pd.Timedelta(hours=4),
+    '1d': pd.Timedelta(days=1),
+    '1w': pd.Timedelta(weeks=1),
+}
+
+# Timeframes matérialisés par agrégation : (règle pandas, origine des intervalles)
+AGGREGATED_TIMEFRAMES = {
+    '4h': ('4h', pd.Timestamp('1970-01-01', tz='UTC')),
+    '1d': ('1D', pd.Timestamp('1970-01-01', tz='UTC')),
+    '1w': ('7D', pd.Timestamp('1970-01-05', tz='UTC')),  # Semaines commençant le lundi
+}
+
+OHLCV_FIELDS = ['timestamp', 'open_price', 'high_price', 'low_price', 'close_price', 'volume']
+
+class PriceAggregator:
+    """Construit et met à jour les bougies agrégées à partir des données brutes"""
+    
+    @staticmethod
+    def get_source_timeframe(pair, timeframe):
+        """
+        Détermine la résolution stockée la plus fine utilisable pour un timeframe
+        
+        Args:
+            pair (CurrencyPair): Paire de devises
+            timeframe (str): Timeframe cible ('4h', '1d', '1w')
+        
+        Returns:
+            str: Timeframe source, ou None si aucune donnée plus fine n'existe
+        """
+        target = TIMEFRAME_DURATIONS[timeframe]
+        for source, duration in TIMEFRAME_DURATIONS.items():
+            if duration >= target:
+                break
+            if PriceData.objects.filter(pair=pair, timeframe=source).exists():
+                return source
+        return None
+    
+    @staticmethod
+    def bucket_start(timestamp, timeframe):
+        """Retourne le début de l'intervalle agrégé contenant un horodatage"""
+        rule, origin = AGGREGATED_TIMEFRAMES[timeframe]
+        step = pd.Timedelta(rule)
+        return origin + ((pd.Timestamp(timestamp) - origin) // step) * step
+    
+    @staticmethod
+    def resample(df, timeframe):
+        """
+        Agrège des bougies OHLCV vers un timeframe plus large (vectorisé)
+        
+        Args:
+            df (pd.DataFrame): Colonnes timestamp, open, high, low, close, volume
+            timeframe (str): Timeframe cible ('4h', '1d', '1w')
+        
+        Returns:
+            pd.DataFrame: Bougies agrégées indexées par début d'intervalle, avec bar_count
+        """
+        rule, origin = AGGREGATED_TIMEFRAMES[timeframe]
+        grouped = df.set_index('timestamp').resample(rule, origin=origin, label='left', closed='left')
+        
+        bars = grouped.agg({
+            'open': 'first',
+            'high': 'max',
+            'low': 'min',
+            'close': 'last',
+            'volume': 'sum',
+        })
+        bars['bar_count'] = grouped['close'].count()
+        
+        # Supprimer les intervalles sans données (week-ends, jours fériés)
+        return bars[bars['bar_count'] > 0]
+    
+    @staticmethod
+    def refresh(pair, timeframe, full=False):
+        """
+        Met à jour de façon incrémentale les bougies agrégées d'une paire
+        
+        Seul le dernier intervalle déjà matérialisé (potentiellement incomplet)
+        et les suivants sont recalculés.
+        
+        Args:
+            pair (CurrencyPair): Paire de devises
+            timeframe (str): Timeframe cible ('4h', '1d', '1w')
+            full (bool): Reconstruire tout l'historique (archive Parquet comprise)
+        
+        Returns:
+            int: Nombre de bougies agrégées écrites
+        """
+        source_timeframe = PriceAggregator.get_source_timeframe(pair, timeframe)
+        if not source_timeframe:
+            return 0
+        
+        if full:
+            # Reconstruction complète : inclure l'historique archivé
+            df = PriceArchive.load_frame(pair, source_timeframe)
+            if df.empty:
+                return 0
+        else:
+            source = PriceData.objects.filter(pair=pair, timeframe=source_timeframe)
+            latest = PriceAggregate.objects.filter(
+                pair=pair, timeframe=timeframe
+            ).order_by('-timestamp').values_list('timestamp', flat=True).first()
+            if latest:
+                source = source.filter(timestamp__gte=latest)
+            
+            rows = list(source.order_by('timestamp').values_list(*OHLCV_FIELDS))
+            if not rows:
+                return 0
+            
+            df = pd.DataFrame.from_records(rows, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+            for col in ['open', 'high', 'low', 'close', 'volume']:
+                df[col] = df[col].astype(float)
+            df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True)
+        
+        bars = PriceAggregator.resample(df, timeframe)
+        
+        objects = [
+            PriceAggregate(
+                pair=pair,
+                timeframe=timeframe,
+                source_timeframe=source_timeframe,
+                timestamp=timestamp,
+                open_price=open_price,
+                high_price=high_price,
+                low_price=low_price,
+                close_price=close_price,
+                volume=volume,
+                bar_count=bar_count
+            )
+            for timestamp, open_price, high_price, low_price, close_price, volume, bar_count in zip(
+                bars.index.to_pydatetime().tolist(),
+                bars['open'].tolist(),
+                bars['high'].tolist(),
+                bars['low'].tolist(),
+                bars['close'].tolist(),
+                bars['volume'].tolist(),
+                bars['bar_count'].tolist(),
+            )
+        ]
+        
+        with transaction.atomic():
+            PriceAggregate.objects.bulk_create(
+                objects,
+                batch_size=2000,
+                update_conflicts=True,
+                unique_fields=['pair', 'timeframe', 'timestamp'],
+                update_fields=['source_timeframe', 'open_price', 'high_price', 'low_price',
+                               'close_price', 'volume', 'bar_count', 'updated_at'],
+            )
+        
+        return len(objects)
+    
+    @staticmethod
+    def get_latest_timestamps(pair):
+        """
+        Début de la dernière bougie agrégée de chaque timeframe d'une paire
+        
+        Returns:
+            dict: Horodatage (ou None) par timeframe agrégé
+        """
+        latest = dict(
+            PriceAggregate.objects.filter(pair=pair).values('timeframe').annotate(
+                latest=Max('timestamp')
+            ).values_list('timeframe', 'latest').order_by()
+        )
+        return {timeframe: latest.get(timeframe) for timeframe in AGGREGATED_TIMEFRAMES}
+    
+    @staticmethod
+    def count_new_bars(pair, previous):
+        """
+        Nombre de bougies agrégées ouvertes depuis un relevé de get_latest_timestamps
+        
+        Une nouvelle bougie agrégée signifie que la précédente est close.
+        
+        Args:
+            pair (CurrencyPair): Paire de devises
+            previous (dict): Résultat de get_latest_timestamps avant la mise à jour
+        
+        Returns:
+            dict: Nombre de nouvelles bougies par timeframe agrégé
+        """
+        counts = {}
+        for timeframe, latest in previous.items():
+            bars = PriceAggregate.objects.filter(pair=pair, timeframe=timeframe)
+            if latest is not None:
+                bars = bars.filter(timestamp__gt=latest)
+            counts[timeframe] = bars.count()
+        return counts
+    
+    @staticmethod
+    def refresh_all(pair, full=False):
+        """
+        Met à jour tous les timeframes agrégés d'une paire
+        
+        Returns:
+            dict: Nombre de bougies écrites par timeframe
+        """
+        return {
+            timeframe: PriceAggregator.refresh(pair, timeframe, full=full)
+            for timeframe in AGGREGATED_TIMEFRAMES
+        }
+    
+    @staticmethod
+    def get_bar_queryset(pair, timeframe):
+        """
+        Retourne le queryset des bougies d'une paire pour un timeframe
+        
+        Les données natives sont prioritaires ; à défaut, les bougies agrégées
+        sont utilisées (et construites si elles n'existent pas encore).
+        
+        Args:
+            pair (CurrencyPair): Paire de devises
+            timeframe (str): Timeframe demandé
+        
+        Returns:
+            QuerySet: PriceData ou PriceAggregate filtré sur la paire et le timeframe
+        """
+        native = PriceData.objects.filter(pair=pair, timeframe=timeframe)
+        if timeframe not in AGGREGATED_TIMEFRAMES or native.exists():
+            return native
+        
+        aggregates = PriceAggregate.objects.filter(pair=pair, timeframe=timeframe)
+        if not aggregates.exists():
+            PriceAggregator.refresh(pair, timeframe)
+        return aggregates
@@ -0,0 +1,211 @@
+# market_data/archive.py
+import os
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from .models import PriceData
+from .columnar import PriceReader, PRICE_READER_BATCH_SIZE
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    pa = pq = None
+
+# Répertoire de l'archive Parquet : <répertoire>/<symbole>/<timeframe>/<année>.parquet
+MARKET_DATA_ARCHIVE_DIR = Path(getattr(settings, 'MARKET_DATA_ARCHIVE_DIR', Path(settings.BASE_DIR) / 'var' / 'price_archive'))
+
+# Âge (en jours) au-delà duquel les bougies quittent la base pour l'archive
+MARKET_DATA_ARCHIVE_HORIZON_DAYS = getattr(settings, 'MARKET_DATA_ARCHIVE_HORIZON_DAYS', 365)
+
+PRICE_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for the price archive (pip install pyarrow)")
+
+def _schema():
+    return pa.schema(
+        [('timestamp', pa.timestamp('us', tz='UTC'))] + [(column, pa.float64()) for column in PRICE_COLUMNS]
+    )
+
+class PriceArchive:
+    """Archive froide des bougies anciennes en fichiers Parquet partitionnés par paire, timeframe et année"""
+    
+    @staticmethod
+    def get_directory(pair_symbol, timeframe):
+        return MARKET_DATA_ARCHIVE_DIR / pair_symbol / timeframe
+    
+    @staticmethod
+    def get_years(pair_symbol, timeframe):
+        """Années archivées pour une paire et un timeframe, triées"""
+        directory = PriceArchive.get_directory(pair_symbol, timeframe)
+        if not directory.exists():
+            return []
+        return sorted(int(path.stem) for path in directory.glob('*.parquet') if path.stem.isdigit())
+    
+    @staticmethod
+    def read_table(pair_symbol, timeframe, start_date=None, end_date=None):
+        """
+        Lit l'archive d'une paire en mémoire mappée
+        
+        Seuls les fichiers des années couvrant la période sont ouverts.
+        
+        Args:
+            pair_symbol (str): Symbole de la paire
+            timeframe (str): Timeframe des bougies
+            start_date (datetime, optional): Début de la période
+            end_date (datetime, optional): Fin de la période
+        
+        Returns:
+            pyarrow.Table: Bougies archivées triées par horodatage (éventuellement vide)
+        """
+        _require_pyarrow()
+        directory = PriceArchive.get_directory(pair_symbol, timeframe)
+        
+        tables = []
+        for year in PriceArchive.get_years(pair_symbol, timeframe):
+            if start_date and year < start_date.year or end_date and year > end_date.year:
+                continue
+            tables.append(pq.read_table(directory / f"{year}.parquet", memory_map=True))
+        
+        if not tables:
+            return _schema().empty_table()
+        
+        table = pa.concat_tables(tables)
+        if start_date or end_date:
+            timestamps = table.column('timestamp').to_numpy()
+            mask = np.ones(len(timestamps), dtype=bool)
+            if start_date:
+                mask &= timestamps >= np.datetime64(pd.Timestamp(start_date).tz_convert('UTC').tz_localize(None), 'us')
+            if end_date:
+                mask &= timestamps <= np.datetime64(pd.Timestamp(end_date).tz_convert('UTC').tz_localize(None), 'us')
+            table = table.filter(pa.array(mask))
+        return table
+    
+    @staticmethod
+    def write_year(pair_symbol, timeframe, year, frame):
+        """
+        Fusionne des bougies dans le fichier d'une année (écriture atomique)
+        
+        Les bougies déjà archivées au même horodatage sont remplacées.
+        
+        Args:
+            pair_symbol (str): Symbole de la paire
+            timeframe (str): Timeframe des bougies
+            year (int): Année de la partition
+            frame (pd.DataFrame): Colonnes timestamp (UTC), open, high, low, close, volume
+        """
+        directory = PriceArchive.get_directory(pair_symbol, timeframe)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{year}.parquet"
+        
+        if path.exists():
+            existing = pq.read_table(path).to_pandas()
+            frame = pd.concat([existing, frame], ignore_index=True)
+        frame = frame.drop_duplicates('timestamp', keep='last').sort_values('timestamp')
+        
+        table = pa.Table.from_pandas(frame[['timestamp'] + PRICE_COLUMNS], schema=_schema(), preserve_index=False)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        os.close(fd)
+        try:
+            pq.write_table(table, tmp_path, compression='zstd')
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    @staticmethod
+    def compact(pair, timeframe='1h', horizon_days=MARKET_DATA_ARCHIVE_HORIZON_DAYS, delete=True, batch_size=PRICE_READER_BATCH_SIZE):
+        """
+        Déplace les bougies plus anciennes que l'horizon de la base vers l'archive
+        
+        Lecture, écriture des fichiers et suppression se font dans une même
+        transaction : les lignes lues sont verrouillées (une mise à jour
+        concurrente attend la fin de l'archivage) et seules ces lignes sont
+        supprimées (une bougie insérée entre-temps reste en base).
+        
+        Args:
+            pair (CurrencyPair): Paire de devises
+            timeframe (str): Timeframe des bougies
+            horizon_days (int): Âge minimal des bougies archivées, en jours
+            delete (bool): Supprimer les lignes archivées de la base
+            batch_size (int): Nombre de lignes supprimées par requête
+        
+        Returns:
+            dict: Nombre de bougies archivées par année
+        """
+        _require_pyarrow()
+        cutoff = timezone.now() - timedelta(days=horizon_days)
+        cold = PriceData.objects.filter(pair=pair, timeframe=timeframe, timestamp__lt=cutoff)
+        
+        with transaction.atomic():
+            rows = list((cold.select_for_update() if delete else cold).order_by('timestamp').values_list(
+                'id', 'timestamp', 'open_price', 'high_price', 'low_price', 'close_price', 'volume'
+            ))
+            if not rows:
+                return {}
+            
+            ids, timestamps, *columns = zip(*rows)
+            frame = pd.DataFrame({name: np.array(values, dtype=np.float64) for name, values in zip(PRICE_COLUMNS, columns)})
+            frame.insert(0, 'timestamp', pd.DatetimeIndex(timestamps).tz_convert('UTC'))
+            
+            archived = {}
+            for year, group in frame.groupby(frame['timestamp'].dt.year):
+                PriceArchive.write_year(pair.symbol, timeframe, int(year), group)
+                archived[int(year)] = len(group)
+            
+            if delete:
+                for start in range(0, len(ids), batch_size):
+                    cold.filter(id__in=ids[start:start + batch_size]).delete()
+        
+        return archived
+    
+    @staticmethod
+    def load_frame(pair, timeframe='1h', start_date=None, end_date=None):
+        """
+        Lecture unifiée de l'historique : archive Parquet puis lignes récentes de la base
+        
+        Les lignes de la base sont prioritaires en cas de recouvrement.
+        
+        Args:
+            pair (CurrencyPair): Paire de devises
+            timeframe (str): Timeframe des bougies
+            start_date (datetime, optional): Début de la période
+            end_date (datetime, optional): Fin de la période
+        
+        Returns:
+            pd.DataFrame: Colonnes timestamp (UTC), open, high, low, close, volume en float, triées
+        """
+        hot = PriceData.objects.filter(pair=pair, timeframe=timeframe)
+        if start_date:
+            hot = hot.filter(timestamp__gte=start_date)
+        if end_date:
+            hot = hot.filter(timestamp__lte=end_date)
+        
+        arrays = PriceReader.read_arrays(hot)
+        hot_frame = pd.DataFrame({name: arrays[name] for name in PRICE_COLUMNS}, copy=False)
+        hot_frame.insert(0, 'timestamp', PriceReader.to_index(arrays['timestamp']).rename(None))
+        
+        if pa is None or not PriceArchive.get_years(pair.symbol, timeframe):
+            return hot_frame
+        
+        # L'archive ne couvre que ce qui précède la première ligne chaude
+        archive_end = end_date
+        if len(hot_frame):
+            first_hot = hot_frame['timestamp'].iloc[0] - pd.Timedelta(microseconds=1)
+            archive_end = min(first_hot, pd.Timestamp(end_date)) if end_date else first_hot
+        
+        cold_frame = PriceArchive.read_table(pair.symbol, timeframe, start_date, archive_end).to_pandas()
+        cold_frame['timestamp'] = cold_frame['timestamp'].astype(hot_frame['timestamp'].dtype)
+        if cold_frame.empty:
+            return hot_frame
+        if hot_frame.empty:
+            return cold_frame.reset_index(drop=True)
+        
+        return pd.concat([cold_frame, hot_frame], ignore_index=True)
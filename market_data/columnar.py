@@ -0,0 +1,160 @@
+# market_data/columnar.py
+"""
+Lecture en colonnes de l'historique des prix
+
+Les bougies sont lues directement depuis le curseur, par lots fetchmany(),
+dans des tableaux NumPy préalloués : horodatage en microsecondes depuis
+l'epoch (int64) et OHLCV en float64. La conversion en float8 et en epoch
+est faite par la base ; aucun dictionnaire, Decimal ni datetime n'est
+créé par ligne (sauf sur les bases sans expression d'epoch connue, où
+l'horodatage est converti en Python).
+"""
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import connections
+from django.db.models import BigIntegerField, F, FloatField, Func
+from django.db.models.functions import Cast
+
+# Lignes lues par appel à fetchmany()
+PRICE_READER_BATCH_SIZE = getattr(settings, 'MARKET_DATA_READER_BATCH_SIZE', 5000)
+
+PRICE_FIELDS = ['open_price', 'high_price', 'low_price', 'close_price', 'volume']
+PRICE_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+class EpochMicroseconds(Func):
+    """Horodatage en microsecondes depuis l'epoch (entier), calculé par la base"""
+    output_field = BigIntegerField()
+    
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection, template='(EXTRACT(EPOCH FROM %(expressions)s) * 1000000)::bigint', **extra_context
+        )
+    
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # Horodatages stockés en texte 'AAAA-MM-JJ HH:MM:SS[.ffffff]' : secondes puis microsecondes
+        # ('%%%%s' devient '%s' une fois la requête formatée puis convertie par le curseur SQLite)
+        return self.as_sql(
+            compiler, connection,
+            template="(CAST(strftime('%%%%s', %(expressions)s) AS INTEGER) * 1000000"
+                     " + CAST(substr(%(expressions)s || '.000000', 21, 6) AS INTEGER))",
+            **extra_context
+        )
+
+# Bases pour lesquelles EpochMicroseconds est disponible
+EPOCH_VENDORS = ('postgresql', 'sqlite')
+
+class PriceReader:
+    """Lecteur en colonnes des bougies (PriceData ou PriceAggregate)"""
+    
+    @staticmethod
+    def get_query(queryset, columns, limit=None):
+        """
+        Requête SQL (et paramètres) des colonnes horodatage + OHLCV en float8
+        
+        Returns:
+            tuple: (sql, params, horodatage en epoch calculé par la base)
+        """
+        connection = connections[queryset.db]
+        native_epoch = connection.vendor in EPOCH_VENDORS
+        
+        annotations = {
+            f'_{column}': Cast(F(field), FloatField())
+            for column, field in zip(PRICE_COLUMNS, PRICE_FIELDS) if column in columns
+        }
+        if native_epoch:
+            annotations['_epoch'] = EpochMicroseconds(F('timestamp'))
+        
+        values = ['_epoch' if native_epoch else 'timestamp'] + [f'_{column}' for column in PRICE_COLUMNS if column in columns]
+        queryset = queryset.annotate(**annotations).values_list(*values)
+        if limit is None:
+            queryset = queryset.order_by('timestamp')
+        else:
+            queryset = queryset.order_by('-timestamp')[:limit]
+        sql, params = queryset.query.sql_with_params()
+        return sql, params, native_epoch
+    
+    @staticmethod
+    def read_arrays(queryset, limit=None, columns=PRICE_COLUMNS, batch_size=PRICE_READER_BATCH_SIZE):
+        """
+        Lit des bougies en tableaux NumPy, par ordre chronologique
+        
+        Avec `limit`, les dernières bougies sont lues en ordre décroissant et
+        rangées depuis la fin des tableaux préalloués : le résultat est croissant
+        sans tri. Sans limite, la lecture est croissante et les tableaux sont
+        agrandis par doublement.
+        
+        Args:
+            queryset (QuerySet): Bougies filtrées (paire, timeframe, période)
+            limit (int, optional): Nombre de bougies les plus récentes
+            columns (list): Colonnes de prix à lire parmi open, high, low, close, volume
+            batch_size (int): Lignes par fetchmany()
+        
+        Returns:
+            dict: 'timestamp' (int64, microsecondes depuis l'epoch) et une colonne float64 par prix
+        """
+        columns = [column for column in PRICE_COLUMNS if column in columns]
+        descending = limit is not None
+        sql, params, native_epoch = PriceReader.get_query(queryset, columns, limit)
+        
+        # Une ligne par colonne : chaque série de prix est contiguë
+        size = limit if descending else batch_size
+        timestamps = np.empty(size, dtype=np.int64)
+        values = np.empty((len(columns), size), dtype=np.float64)
+        filled = 0
+        
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                count = len(rows)
+                
+                if descending:
+                    # Rangement depuis la fin : la ligne la plus récente occupe la dernière case
+                    target = slice(size - filled - count, size - filled)
+                    rows.reverse()
+                else:
+                    if filled + count > size:
+                        size = max(size * 2, filled + count)
+                        timestamps, previous = np.empty(size, dtype=np.int64), timestamps
+                        timestamps[:filled] = previous[:filled]
+                        values, previous = np.empty((len(columns), size), dtype=np.float64), values
+                        values[:, :filled] = previous[:, :filled]
+                    target = slice(filled, filled + count)
+                
+                if native_epoch:
+                    timestamps[target] = [row[0] for row in rows]
+                    values[:, target] = np.array(rows, dtype=np.float64)[:, 1:].T
+                else:
+                    timestamps[target] = pd.DatetimeIndex([row[0] for row in rows]).as_unit('us').asi8
+                    values[:, target] = np.array([row[1:] for row in rows], dtype=np.float64).T
+                filled += count
+        
+        if descending:
+            timestamps, values = timestamps[size - filled:], values[:, size - filled:]
+        else:
+            timestamps, values = timestamps[:filled], values[:, :filled]
+        
+        arrays = {'timestamp': timestamps}
+        for i, column in enumerate(columns):
+            arrays[column] = values[i]
+        return arrays
+    
+    @staticmethod
+    def to_index(timestamps):
+        """Index UTC (nanosecondes, comme pandas par défaut) nommé 'timestamp', à partir de microsecondes"""
+        return pd.DatetimeIndex((timestamps * 1000).view('datetime64[ns]'), name='timestamp').tz_localize('UTC')
+    
+    @staticmethod
+    def read_frame(queryset, limit=None, columns=PRICE_COLUMNS):
+        """
+        Lit des bougies en DataFrame indexé par horodatage (UTC), par ordre chronologique
+        
+        Returns:
+            pd.DataFrame: Colonnes de prix en float64
+        """
+        arrays = PriceReader.read_arrays(queryset, limit=limit, columns=columns)
+        index = PriceReader.to_index(arrays.pop('timestamp'))
+        return pd.DataFrame(arrays, index=index, copy=False)
@@ -0,0 +1,7 @@
+# market_data/events.py
+from django.dispatch import Signal
+
+# Émis après l'enregistrement de bougies pour une paire, puis pour chaque
+# timeframe agrégé (4h, 1d, 1w) dont une nouvelle bougie s'est ouverte
+# Arguments : pair_symbol, timeframe, inserted, updated
+price_data_updated = Signal()
@@ -0,0 +1,160 @@
+# market_data/export.py
+import csv
+import json
+from datetime import datetime
+from decimal import Decimal
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    pa = None
+
+# Nombre de lignes lues par aller-retour du curseur serveur
+EXPORT_CHUNK_SIZE = getattr(settings, 'EXPORT_CHUNK_SIZE', 5000)
+
+# Formats disponibles : type MIME et extension de fichier
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrows'),
+}
+
+def _arrow_type(kind):
+    return {
+        'str': pa.string(),
+        'int': pa.int64(),
+        'float': pa.float64(),
+        'datetime': pa.timestamp('us', tz='UTC'),
+        'bool': pa.bool_(),
+    }[kind]
+
+def _json_value(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+class _ChunkSink:
+    """Fichier en écriture qui accumule les octets produits jusqu'au prochain envoi"""
+    
+    closed = False
+    
+    def __init__(self):
+        self.chunks = []
+    
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def close(self):
+        self.closed = True
+    
+    def pop(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+class _LineBuffer:
+    """Tampon minimal pour csv.writer : retourne la ligne écrite"""
+    
+    def write(self, value):
+        return value
+
+class QuerysetExporter:
+    """Export en flux d'un queryset (CSV, NDJSON ou Arrow IPC) sans le charger en mémoire"""
+    
+    @staticmethod
+    def iterate(queryset, columns, chunk_size=EXPORT_CHUNK_SIZE):
+        """
+        Parcourt le queryset par paquets de lignes
+        
+        Sous PostgreSQL, iterator() utilise un curseur côté serveur : seules
+        chunk_size lignes sont en mémoire à la fois.
+        
+        Args:
+            queryset (QuerySet): Lignes à exporter (déjà triées)
+            columns (list): Colonnes (nom, chemin ORM, type)
+            chunk_size (int): Nombre de lignes par paquet
+        
+        Yields:
+            list: Tuples de valeurs
+        """
+        rows = queryset.values_list(*(lookup for _, lookup, _ in columns)).iterator(chunk_size=chunk_size)
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    
+    @staticmethod
+    def stream_csv(queryset, columns):
+        writer = csv.writer(_LineBuffer())
+        yield writer.writerow([name for name, _, _ in columns])
+        for chunk in QuerysetExporter.iterate(queryset, columns):
+            yield ''.join(writer.writerow(row) for row in chunk)
+    
+    @staticmethod
+    def stream_ndjson(queryset, columns):
+        names = [name for name, _, _ in columns]
+        for chunk in QuerysetExporter.iterate(queryset, columns):
+            yield ''.join(
+                json.dumps({name: _json_value(value) for name, value in zip(names, row)}) + '\n'
+                for row in chunk
+            )
+    
+    @staticmethod
+    def stream_arrow(queryset, columns):
+        schema = pa.schema([(name, _arrow_type(kind)) for name, _, kind in columns])
+        sink = _ChunkSink()
+        writer = pa.ipc.new_stream(sink, schema)
+        yield sink.pop()
+        
+        for chunk in QuerysetExporter.iterate(queryset, columns):
+            arrays = []
+            for i, (_, _, kind) in enumerate(columns):
+                values = [row[i] for row in chunk]
+                if kind == 'float':
+                    values = [None if value is None else float(value) for value in values]
+                arrays.append(pa.array(values, type=schema.field(i).type))
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+            yield sink.pop()
+        
+        writer.close()
+        yield sink.pop()
+    
+    @staticmethod
+    def response(queryset, columns, export_format, filename):
+        """
+        Construit la réponse HTTP en flux
+        
+        Args:
+            queryset (QuerySet): Lignes à exporter (déjà triées)
+            columns (list): Colonnes (nom, chemin ORM, type parmi str/int/float/datetime/bool)
+            export_format (str): 'csv', 'ndjson' ou 'arrow'
+            filename (str): Nom du fichier, sans extension
+        
+        Returns:
+            StreamingHttpResponse: Réponse en flux
+        
+        Raises:
+            ValueError: Si le format est inconnu ou si pyarrow est absent pour 'arrow'
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format '{export_format}' (expected one of {', '.join(EXPORT_FORMATS)})")
+        if export_format == 'arrow' and pa is None:
+            raise ValueError("pyarrow is required for the Arrow export format (pip install pyarrow)")
+        
+        content_type, extension = EXPORT_FORMATS[export_format]
+        stream = getattr(QuerysetExporter, f"stream_{export_format}")(queryset, columns)
+        response = StreamingHttpResponse(stream, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}.{extension}"'
+        return response
@@ -0,0 +1,90 @@
+# market_data/fast_serialization.py
+"""
+Chemin de sérialisation rapide pour les listes volumineuses de l'API
+
+Les lignes sont lues avec values() (sans instancier de modèles ni suivre de
+relations) puis converties en dictionnaires par un RowSerializer ; la
+réponse est encodée avec orjson lorsqu'il est installé. Le résultat est
+identique à celui des ModelSerializer correspondants.
+"""
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    orjson = None
+
+def decimal_to_string(value):
+    """Décimal au format de DRF (COERCE_DECIMAL_TO_STRING) ; None reste None"""
+    return None if value is None else '{:f}'.format(value)
+
+def datetime_formatter(tz):
+    """
+    Formateur de dates ISO 8601 au format de DRF (UTC noté 'Z') ; None reste None
+    
+    Le fuseau est résolu une fois par réponse : timezone.localtime() le
+    recherche à chaque appel, ce qui domine le coût sur de longues listes.
+    """
+    def format_datetime(value):
+        if value is None:
+            return None
+        value = value.astimezone(tz).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return format_datetime
+
+class RowSerializer:
+    """
+    Sérialiseur léger à partir de lignes values()
+    
+    Les sous-classes déclarent `columns` : liste de (nom dans la réponse,
+    chemin ORM, type), le type étant 'decimal', 'datetime' ou None (valeur
+    telle quelle).
+    """
+    columns = []
+    
+    @classmethod
+    def get_rows(cls, queryset):
+        """Queryset de dictionnaires limité aux colonnes déclarées (les relations sont jointes)"""
+        return queryset.values(*(lookup for _, lookup, _ in cls.columns))
+    
+    @classmethod
+    def to_representation(cls, rows):
+        """Convertit des lignes values() en dictionnaires de réponse"""
+        converters = {'decimal': decimal_to_string, 'datetime': datetime_formatter(timezone.get_current_timezone())}
+        columns = [(name, lookup, converters.get(kind)) for name, lookup, kind in cls.columns]
+        return [
+            {name: convert(row[lookup]) if convert else row[lookup] for name, lookup, convert in columns}
+            for row in rows
+        ]
+
+class FastJSONRenderer(JSONRenderer):
+    """Rendu JSON via orjson (repli sur le rendu standard pour l'indentation ou sans orjson)"""
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.get_indent(accepted_media_type or '', renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(data, default=str)
+
+class FastListMixin:
+    """
+    Liste paginée servie par un RowSerializer
+    
+    `row_serializer_class` doit produire les mêmes champs que
+    `serializer_class`, utilisé pour les autres actions. Les lignes étant des
+    dictionnaires, la pagination par curseur lit directement leurs clés.
+    """
+    row_serializer_class = None
+    
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = self.row_serializer_class.get_rows(queryset)
+        
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(self.row_serializer_class.to_representation(page))
+        
+        return Response(self.row_serializer_class.to_representation(rows))
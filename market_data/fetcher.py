@@ -0,0 +1,205 @@
+# market_data/fetcher.py
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from .response_cache import ResponseCache, MARKET_DATA_CACHE_MODE
+
+API_KEY = getattr(settings, 'ALPHA_VANTAGE_API_KEY', '073XRZ4KX6ENI78E')
+
+# Point d'entrée de l'API (modifiable pour viser le simulateur local, voir market_data.simulator)
+ALPHA_VANTAGE_BASE_URL = getattr(settings, 'ALPHA_VANTAGE_BASE_URL', 'https://www.alphavantage.co/query')
+
+# Quota d'appels de la clé API
+ALPHA_VANTAGE_CALLS_PER_MINUTE = getattr(settings, 'ALPHA_VANTAGE_CALLS_PER_MINUTE', 5)
+
+# Délai maximal d'une requête HTTP (secondes)
+ALPHA_VANTAGE_TIMEOUT = getattr(settings, 'ALPHA_VANTAGE_TIMEOUT', 30)
+
+# Nouvelles tentatives après un refus pour dépassement de quota ou une erreur réseau
+ALPHA_VANTAGE_MAX_RETRIES = getattr(settings, 'ALPHA_VANTAGE_MAX_RETRIES', 4)
+
+# Attente de base avant une nouvelle tentative (doublée à chaque essai, secondes)
+ALPHA_VANTAGE_BACKOFF = getattr(settings, 'ALPHA_VANTAGE_BACKOFF', 5.0)
+
+# Nombre de requêtes simultanées lors d'une mise à jour de toutes les paires
+ALPHA_VANTAGE_MAX_WORKERS = getattr(settings, 'ALPHA_VANTAGE_MAX_WORKERS', 4)
+
+# Codes HTTP et messages indiquant un refus temporaire
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+THROTTLE_MESSAGES = ('call frequency', 'rate limit', 'requests per')
+
+# Quota journalier épuisé (inutile de réessayer avant le lendemain), sauf si le message cite aussi le quota par minute
+DAILY_LIMIT_MESSAGES = ('per day', 'daily')
+MINUTE_LIMIT_MESSAGES = ('call frequency', 'per minute')
+
+class ThrottledError(Exception):
+    """L'API a refusé la requête temporairement (quota dépassé, erreur serveur)"""
+
+class TokenBucket:
+    """
+    Limiteur de débit à jetons, partagé entre threads
+    
+    Le seau se remplit de `rate_per_minute` jetons par minute jusqu'à `capacity` ;
+    chaque requête consomme un jeton et attend s'il n'y en a plus.
+    """
+    
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def acquire(self):
+        """
+        Consomme un jeton, en attendant qu'il soit disponible
+        
+        Returns:
+            float: Temps d'attente en secondes
+        """
+        waited = 0.0
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+    
+    def drain(self):
+        """Vide le seau après un refus de l'API pour ralentir tous les threads"""
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0)
+
+class AlphaVantageClient:
+    """Client HTTP Alpha Vantage : session partagée, limiteur de débit et nouvelles tentatives"""
+    
+    limiter = TokenBucket(ALPHA_VANTAGE_CALLS_PER_MINUTE)
+    _session = None
+    _session_lock = threading.Lock()
+    
+    @classmethod
+    def get_session(cls):
+        """Retourne la session HTTP partagée (connexions keep-alive réutilisées)"""
+        with cls._session_lock:
+            if cls._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(ALPHA_VANTAGE_MAX_WORKERS, 1))
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                cls._session = session
+            return cls._session
+    
+    @staticmethod
+    def get_message(data):
+        return (data.get('Information') or data.get('Note') or '').lower()
+    
+    @staticmethod
+    def is_daily_limit(data):
+        """Indique si une réponse JSON signale l'épuisement du quota journalier"""
+        message = AlphaVantageClient.get_message(data)
+        return (
+            any(text in message for text in DAILY_LIMIT_MESSAGES)
+            and not any(text in message for text in MINUTE_LIMIT_MESSAGES)
+        )
+    
+    @staticmethod
+    def is_throttled(data):
+        """Indique si une réponse JSON est un message de dépassement de quota par minute"""
+        message = AlphaVantageClient.get_message(data)
+        return not AlphaVantageClient.is_daily_limit(data) and any(text in message for text in THROTTLE_MESSAGES)
+    
+    @classmethod
+    def request(cls, params, max_retries=ALPHA_VANTAGE_MAX_RETRIES):
+        """
+        Interroge l'API en respectant le quota
+        
+        Les refus temporaires (HTTP 429/5xx, message « call frequency », erreur
+        réseau) sont retentés avec un délai exponentiel ; le seau est vidé pour
+        que les autres threads ralentissent aussi. L'épuisement du quota
+        journalier n'est pas retenté.
+        
+        Args:
+            params (dict): Paramètres de la requête (sans la clé API)
+            max_retries (int): Nombre maximal de nouvelles tentatives
+        
+        Returns:
+            dict: Réponse JSON décodée, ou None si toutes les tentatives ont échoué
+        """
+        session = cls.get_session()
+        
+        for attempt in range(max_retries + 1):
+            cls.limiter.acquire()
+            
+            try:
+                response = session.get(
+                    ALPHA_VANTAGE_BASE_URL,
+                    params={**params, 'apikey': API_KEY},
+                    timeout=ALPHA_VANTAGE_TIMEOUT
+                )
+                if response.status_code in RETRY_STATUS_CODES:
+                    raise ThrottledError(f"HTTP {response.status_code}")
+                
+                data = response.json()
+                if cls.is_daily_limit(data):
+                    print(f"Alpha Vantage daily quota exhausted: {data.get('Information') or data.get('Note')}")
+                    return None
+                if cls.is_throttled(data):
+                    raise ThrottledError(data.get('Information') or data.get('Note'))
+                
+                return data
+            
+            except (ThrottledError, requests.ConnectionError, requests.Timeout) as e:
+                if attempt == max_retries:
+                    print(f"Alpha Vantage request failed after {attempt + 1} attempts: {str(e)}")
+                    return None
+                
+                cls.limiter.drain()
+                delay = ALPHA_VANTAGE_BACKOFF * (2 ** attempt) * (1 + random.random() * 0.25)
+                print(f"Alpha Vantage throttled ({str(e)}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+    
+    @classmethod
+    def fetch(cls, params):
+        """
+        Retourne la réponse conservée sur disque si elle est valide, sinon interroge l'API
+        
+        Une requête 'compact' peut être servie par une réponse 'full'. En mode
+        'replay', l'API n'est jamais appelée. Seules les réponses contenant une
+        série temporelle sont conservées.
+        
+        Args:
+            params (dict): Paramètres de la requête (sans la clé API)
+        
+        Returns:
+            dict: Réponse JSON décodée, ou None
+        """
+        # Une réponse complète encore valide contient aussi les 100 dernières bougies
+        candidates = [params]
+        if params.get('outputsize') == 'compact':
+            candidates.append({**params, 'outputsize': 'full'})
+        
+        for candidate in candidates:
+            data = ResponseCache.get(candidate)
+            if data is not None:
+                return data
+        
+        if MARKET_DATA_CACHE_MODE == 'replay':
+            print(f"No cached response for {params.get('function')} {params.get('from_symbol')}{params.get('to_symbol')} in replay mode")
+            return None
+        
+        data = cls.request(params)
+        if data is not None and any('Time Series' in key for key in data):
+            ResponseCache.put(params, data)
+        return data
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from market_data.models import CurrencyPair
+from market_data.archive import PriceArchive, MARKET_DATA_ARCHIVE_DIR, MARKET_DATA_ARCHIVE_HORIZON_DAYS
+
+class Command(BaseCommand):
+    help = 'Move price bars older than the archive horizon from the database to the Parquet archive'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--pair', help='Currency pair symbol (default: all pairs)')
+        parser.add_argument('--timeframe', action='append', help='Timeframe to archive (repeatable, default: all stored timeframes)')
+        parser.add_argument('--horizon-days', type=int, default=MARKET_DATA_ARCHIVE_HORIZON_DAYS,
+                            help=f'Archive bars older than this many days (default: {MARKET_DATA_ARCHIVE_HORIZON_DAYS})')
+        parser.add_argument('--keep', action='store_true', help='Write the archive without deleting the database rows')
+    
+    def handle(self, *args, **options):
+        pairs = CurrencyPair.objects.all()
+        if options['pair']:
+            pairs = pairs.filter(symbol=options['pair'])
+        
+        for pair in pairs:
+            timeframes = options['timeframe'] or pair.prices.values_list('timeframe', flat=True).distinct().order_by()
+            for timeframe in timeframes:
+                archived = PriceArchive.compact(pair, timeframe, options['horizon_days'], delete=not options['keep'])
+                if archived:
+                    years = ', '.join(f'{year}: {count}' for year, count in archived.items())
+                    self.stdout.write(self.style.SUCCESS(f'{pair.symbol} {timeframe}: {sum(archived.values())} bars archived ({years})'))
+        
+        self.stdout.write(self.style.SUCCESS(f'Archive directory: {MARKET_DATA_ARCHIVE_DIR}'))
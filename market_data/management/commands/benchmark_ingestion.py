@@ -0,0 +1,97 @@
+import threading
+import time
+from urllib.parse import urlsplit
+from django.core.management.base import BaseCommand, CommandError
+from market_data.events import price_data_updated
+from market_data.fetcher import ALPHA_VANTAGE_BASE_URL, ALPHA_VANTAGE_CALLS_PER_MINUTE, ALPHA_VANTAGE_MAX_WORKERS
+from market_data.models import Currency, CurrencyPair, PriceData
+from market_data.response_cache import MARKET_DATA_CACHE_MODE
+from market_data.services import MarketDataService
+from market_data.simulator import SimulatorServer
+from signals.batch import BatchSignalGenerator
+
+LOCAL_HOSTS = ('127.0.0.1', 'localhost', '::1')
+
+class Command(BaseCommand):
+    help = 'Measure ingestion and signal cycle throughput for many synthetic pairs against the local Alpha Vantage simulator'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--pairs', type=int, default=100, help='Number of synthetic pairs (default: 100, at most 676)')
+        parser.add_argument('--cycles', type=int, default=2, help='Update cycles; the first loads the full history (default: 2)')
+        parser.add_argument('--interval', default='1h', help='Interval fetched (default: 1h)')
+        parser.add_argument('--serve', action='store_true',
+                            help='Start the simulator in this process on the ALPHA_VANTAGE_BASE_URL port (it then shares the CPU with ingestion; '
+                                 'prefer run_market_simulator for large runs)')
+        parser.add_argument('--latency', type=float, default=0.0, help='Simulator latency with --serve, in milliseconds (default: 0)')
+        parser.add_argument('--no-signals', action='store_true', help='Measure ingestion only')
+        parser.add_argument('--keep', action='store_true', help='Keep the synthetic pairs and their data afterwards')
+    
+    def handle(self, *args, **options):
+        url = urlsplit(ALPHA_VANTAGE_BASE_URL)
+        if url.hostname not in LOCAL_HOSTS:
+            raise CommandError(f'ALPHA_VANTAGE_BASE_URL points at {ALPHA_VANTAGE_BASE_URL}; set it to the local simulator (run_market_simulator)')
+        if not 0 < options['pairs'] <= 26 * 26:
+            raise CommandError('--pairs must be between 1 and 676')
+        if MARKET_DATA_CACHE_MODE != 'off':
+            self.stdout.write(self.style.WARNING(f'MARKET_DATA_CACHE_MODE is {MARKET_DATA_CACHE_MODE!r}: cached responses will bypass the simulator'))
+        if ALPHA_VANTAGE_CALLS_PER_MINUTE < options['pairs']:
+            self.stdout.write(self.style.WARNING(f'ALPHA_VANTAGE_CALLS_PER_MINUTE is {ALPHA_VANTAGE_CALLS_PER_MINUTE}: the client quota will bound the throughput'))
+        self.stdout.write(f'{options["pairs"]} pairs from {ALPHA_VANTAGE_BASE_URL}, {ALPHA_VANTAGE_MAX_WORKERS} concurrent requests (ALPHA_VANTAGE_MAX_WORKERS)')
+        
+        server = None
+        if options['serve']:
+            server = SimulatorServer((url.hostname, url.port or 80), latency=options['latency'] / 1000)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+        
+        # Les évaluations déclenchées par les nouvelles bougies partiraient vers Celery : le cycle les exécute ici
+        price_data_updated.disconnect(dispatch_uid='signals.trigger')
+        
+        symbols = self.create_pairs(options['pairs'])
+        try:
+            for cycle in range(options['cycles']):
+                self.stdout.write(self.style.MIGRATE_HEADING(f"Cycle {cycle + 1} ({'full history' if cycle == 0 else 'incremental'})"))
+                self.run_cycle(symbols, options)
+        finally:
+            if server:
+                server.shutdown()
+                server.server_close()
+            if not options['keep']:
+                CurrencyPair.objects.filter(symbol__in=symbols).delete()
+                Currency.objects.filter(code__in=[symbol[:3] for symbol in symbols]).delete()
+    
+    def create_pairs(self, count):
+        """Paires synthétiques ZAAUSD, ZABUSD, ..."""
+        quote, _ = Currency.objects.get_or_create(code='USD', defaults={'name': 'US Dollar'})
+        symbols = []
+        for index in range(count):
+            code = f"Z{chr(65 + index // 26)}{chr(65 + index % 26)}"
+            base, _ = Currency.objects.get_or_create(code=code, defaults={'name': f'Simulated {code}'})
+            CurrencyPair.objects.get_or_create(symbol=f'{code}USD', defaults={'base_currency': base, 'quote_currency': quote})
+            symbols.append(f'{code}USD')
+        return symbols
+    
+    def run_cycle(self, symbols, options):
+        before = PriceData.objects.filter(pair__symbol__in=symbols).count()
+        
+        started = time.perf_counter()
+        results = MarketDataService.update_all_forex_data(symbols, options['interval'])
+        ingestion = time.perf_counter() - started
+        
+        rows = PriceData.objects.filter(pair__symbol__in=symbols).count() - before
+        succeeded = sum(1 for success in results.values() if success)
+        style = self.style.SUCCESS if succeeded == len(symbols) else self.style.WARNING
+        self.stdout.write(style(
+            f'  Ingestion: {succeeded}/{len(symbols)} pairs in {ingestion:.2f} s '
+            f'({succeeded / ingestion:,.1f} pairs/s, {rows:,} new bars)'
+        ))
+        
+        if options['no_signals']:
+            return
+        
+        started = time.perf_counter()
+        signals = BatchSignalGenerator.generate_combined_strategy_signals(options['interval'], pair_symbols=symbols)
+        generation = time.perf_counter() - started
+        self.stdout.write(
+            f'  Signals: {sum(1 for result in signals.values() if result)} pairs evaluated in {generation:.2f} s; '
+            f'cycle {ingestion + generation:.2f} s ({len(symbols) / (ingestion + generation):,.1f} pairs/s)'
+        )
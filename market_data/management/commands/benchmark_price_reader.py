@@ -0,0 +1,93 @@
+import time
+import tracemalloc
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from market_data.columnar import PriceReader
+from market_data.models import Currency, CurrencyPair, PriceData
+
+class Command(BaseCommand):
+    help = 'Compare the values() DataFrame price read with the columnar NumPy reader on synthetic bars (rolled back)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='Number of synthetic bars (default: 100000)')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per measurement; the best is kept (default: 5)')
+    
+    def handle(self, *args, **options):
+        rows = options['rows']
+        
+        with transaction.atomic():
+            pair = self.create_rows(rows)
+            queryset = PriceData.objects.filter(pair=pair, timeframe='1h')
+            
+            for limit in sorted({200, min(5000, rows), rows}):
+                self.stdout.write(self.style.MIGRATE_HEADING(f'{limit} bars'))
+                
+                # Les deux chemins doivent produire exactement le même DataFrame
+                expected = self.read_values(queryset, limit)
+                actual = PriceReader.read_frame(queryset, limit=limit)
+                try:
+                    pd.testing.assert_frame_equal(expected, actual, check_freq=False)
+                except AssertionError as e:
+                    self.stdout.write(self.style.ERROR(f'  Columnar reader output differs: {e}'))
+                    return
+                
+                legacy = self.measure('values() + DataFrame', limit, options['repeat'], lambda: self.read_values(queryset, limit))
+                columnar = self.measure('columnar reader', limit, options['repeat'], lambda: PriceReader.read_frame(queryset, limit=limit))
+                self.stdout.write(self.style.SUCCESS(
+                    f'  Columnar reader: {legacy[0] / columnar[0]:.1f}x faster, {legacy[1] / columnar[1]:.1f}x less peak memory'
+                ))
+            
+            # Ne rien laisser en base
+            transaction.set_rollback(True)
+    
+    def create_rows(self, rows):
+        base, _ = Currency.objects.get_or_create(code='BNA', defaults={'name': 'Benchmark A'})
+        quote, _ = Currency.objects.get_or_create(code='BNB', defaults={'name': 'Benchmark B'})
+        pair = CurrencyPair.objects.create(base_currency=base, quote_currency=quote, symbol='BNABNB')
+        
+        rng = np.random.default_rng(0)
+        close = 1.1 + np.cumsum(rng.normal(0, 0.001, rows))
+        start = timezone.now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=rows)
+        
+        self.stdout.write(f'Creating {rows} synthetic price bars...')
+        PriceData.objects.bulk_create([
+            PriceData(
+                pair=pair, timeframe='1h', timestamp=start + timedelta(hours=i),
+                open_price=round(close[i], 8), high_price=round(close[i] + 0.001, 8),
+                low_price=round(close[i] - 0.001, 8), close_price=round(close[i], 8), volume=round(rng.random() * 1000, 8)
+            )
+            for i in range(rows)
+        ], batch_size=5000)
+        return pair
+    
+    def read_values(self, queryset, limit):
+        """Lecture d'origine de SignalGenerator.get_price_data (dictionnaires, Decimal, tri pandas)"""
+        data = pd.DataFrame(list(queryset.order_by('-timestamp')[:limit].values(
+            'timestamp', 'open_price', 'high_price', 'low_price', 'close_price', 'volume'
+        )))
+        data = data.rename(columns={'open_price': 'open', 'high_price': 'high', 'low_price': 'low', 'close_price': 'close'})
+        for col in ['open', 'high', 'low', 'close', 'volume']:
+            data[col] = data[col].astype(float)
+        data = data.sort_values('timestamp')
+        data.set_index('timestamp', inplace=True)
+        return data
+    
+    def measure(self, label, rows, repeat, function):
+        elapsed = min(self.time_call(function) for _ in range(repeat))
+        
+        tracemalloc.start()
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        
+        self.stdout.write(f'  {label:<22} {elapsed * 1000:>9.2f} ms {rows / elapsed:>12,.0f} bars/s {peak / 1e6:>9.2f} MB peak allocated')
+        return elapsed, peak
+    
+    def time_call(self, function):
+        started = time.perf_counter()
+        function()
+        return time.perf_counter() - started
@@ -0,0 +1,130 @@
+import time
+from datetime import timedelta
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from market_data.fast_serialization import FastJSONRenderer
+from market_data.models import Currency, CurrencyPair, PriceData
+from market_data.serializers import PriceDataSerializer, PriceDataRowSerializer
+from signals.models import Signal, Strategy
+from signals.serializers import SignalSerializer, SignalRowSerializer
+
+class Command(BaseCommand):
+    help = 'Compare DRF serialization with the fast row serialization path on synthetic rows (rolled back)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='Number of synthetic rows per table (default: 100000)')
+        parser.add_argument('--baseline-rows', type=int, default=10000,
+                            help='Rows serialized by the N+1 baseline, which issues one query per row (default: 10000)')
+        parser.add_argument('--model', choices=['price', 'signal', 'all'], default='all', help='Table to benchmark (default: all)')
+    
+    def handle(self, *args, **options):
+        rows = options['rows']
+        
+        with transaction.atomic():
+            pair, strategy = self.create_rows(rows)
+            
+            if options['model'] in ('price', 'all'):
+                self.run_benchmark(
+                    'PriceData',
+                    PriceData.objects.filter(pair=pair).order_by('-timestamp'),
+                    PriceData.objects.filter(pair=pair).select_related('pair').only(
+                        'id', 'pair__symbol', 'timeframe', 'timestamp',
+                        'open_price', 'high_price', 'low_price', 'close_price', 'volume'
+                    ).order_by('-timestamp'),
+                    PriceDataSerializer, PriceDataRowSerializer, options['baseline_rows']
+                )
+            
+            if options['model'] in ('signal', 'all'):
+                self.run_benchmark(
+                    'Signal',
+                    Signal.objects.filter(pair=pair).order_by('-timestamp'),
+                    Signal.objects.filter(pair=pair).select_related('pair', 'strategy').defer(
+                        'pair__base_currency', 'pair__quote_currency', 'strategy__description'
+                    ).order_by('-timestamp'),
+                    SignalSerializer, SignalRowSerializer, options['baseline_rows']
+                )
+            
+            # Ne rien laisser en base
+            transaction.set_rollback(True)
+    
+    def create_rows(self, rows):
+        base, _ = Currency.objects.get_or_create(code='BNA', defaults={'name': 'Benchmark A'})
+        quote, _ = Currency.objects.get_or_create(code='BNB', defaults={'name': 'Benchmark B'})
+        pair = CurrencyPair.objects.create(base_currency=base, quote_currency=quote, symbol='BNABNB')
+        strategy = Strategy.objects.create(name='Serialization benchmark', description='Synthetic signals')
+        
+        rng = np.random.default_rng(0)
+        close = 1.1 + np.cumsum(rng.normal(0, 0.001, rows))
+        start = timezone.now() - timedelta(hours=rows)
+        
+        self.stdout.write(f'Creating {rows} synthetic price bars and signals...')
+        PriceData.objects.bulk_create([
+            PriceData(
+                pair=pair, timeframe='1h', timestamp=start + timedelta(hours=i),
+                open_price=round(close[i], 8), high_price=round(close[i] + 0.001, 8),
+                low_price=round(close[i] - 0.001, 8), close_price=round(close[i], 8), volume=round(rng.random() * 1000, 8)
+            )
+            for i in range(rows)
+        ], batch_size=5000)
+        Signal.objects.bulk_create([
+            Signal(
+                pair=pair, strategy=strategy, signal_type='BUY' if i % 2 else 'SELL', timeframe='1h',
+                entry_price=round(close[i], 8), stop_loss=round(close[i] * 0.985, 8), take_profit=round(close[i] * 1.015, 8),
+                confidence=0.75, timestamp=start + timedelta(hours=i), bar_timestamp=start + timedelta(hours=i), expiration=start + timedelta(hours=i + 24),
+                notes='Synthetic benchmark signal'
+            )
+            for i in range(rows)
+        ], batch_size=5000)
+        return pair, strategy
+    
+    def measure(self, label, rows, function):
+        queries = []
+        
+        def count_queries(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+        
+        with connection.execute_wrapper(count_queries):
+            started = time.perf_counter()
+            payload = function()
+            elapsed = time.perf_counter() - started
+        
+        rate = rows / elapsed if elapsed else float('inf')
+        self.stdout.write(f'  {label:<28} {rows:>8} rows {elapsed:>8.3f}s {rate:>12,.0f} rows/s {len(queries):>8} queries {len(payload) / 1e6:>7.1f} MB')
+        return rate
+    
+    def run_benchmark(self, name, plain_queryset, planned_queryset, serializer_class, row_serializer_class, baseline_rows):
+        rows = planned_queryset.count()
+        baseline_rows = min(baseline_rows, rows)
+        self.stdout.write(self.style.MIGRATE_HEADING(f'{name} ({rows} rows)'))
+        
+        # Les deux chemins doivent produire exactement les mêmes données
+        sample = planned_queryset[:1000]
+        expected = serializer_class(sample, many=True).data
+        actual = row_serializer_class.to_representation(row_serializer_class.get_rows(sample))
+        if [dict(item) for item in expected] != actual:
+            self.stdout.write(self.style.ERROR('  Fast path output differs from the DRF serializer'))
+            return
+        
+        renderer = JSONRenderer()
+        fast_renderer = FastJSONRenderer()
+        
+        baseline = self.measure(
+            'DRF serializer (N+1)', baseline_rows,
+            lambda: renderer.render(serializer_class(plain_queryset[:baseline_rows], many=True).data)
+        )
+        planned = self.measure(
+            'DRF + select_related', rows,
+            lambda: renderer.render(serializer_class(planned_queryset, many=True).data)
+        )
+        fast = self.measure(
+            'values() rows + orjson', rows,
+            lambda: fast_renderer.render(row_serializer_class.to_representation(row_serializer_class.get_rows(planned_queryset)))
+        )
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'  Fast path: {fast / planned:.1f}x faster than select_related DRF, {fast / baseline:.1f}x faster than N+1 DRF'
+        ))
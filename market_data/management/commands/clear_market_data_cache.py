@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from market_data.response_cache import ResponseCache, MARKET_DATA_CACHE_DIR
+
+class Command(BaseCommand):
+    help = 'Delete cached Alpha Vantage responses'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--function', help='API function to clear (e.g. FX_INTRADAY, default: all)')
+        parser.add_argument('--pair', help='Currency pair symbol to clear (default: all)')
+    
+    def handle(self, *args, **options):
+        removed = ResponseCache.clear(options['function'], options['pair'])
+        self.stdout.write(self.style.SUCCESS(f'{removed} cached responses removed from {MARKET_DATA_CACHE_DIR}'))
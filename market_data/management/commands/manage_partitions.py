@@ -0,0 +1,49 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from market_data.partitions import PartitionManager, PARTITION_MONTHS_AHEAD, PARTITION_RETENTION_ACTION, month_start, add_months
+
+class Command(BaseCommand):
+    help = 'List, create ahead and expire the monthly partitions of the partitioned tables (PostgreSQL)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--model', action='append', help='Model label, e.g. market_data.PriceData (repeatable, default: every partitioned table)')
+        parser.add_argument('--ensure', action='store_true', help='Create the missing partitions up to --months-ahead')
+        parser.add_argument('--months-ahead', type=int, default=PARTITION_MONTHS_AHEAD,
+                            help=f'Months created ahead of the current one (default: {PARTITION_MONTHS_AHEAD})')
+        parser.add_argument('--retain-months', type=int, help='Remove the partitions older than this many months before the current one')
+        parser.add_argument('--drop', action='store_true', help='Drop expired partitions instead of detaching them')
+        parser.add_argument('--dry-run', action='store_true', help='List the expired partitions without removing them')
+    
+    def handle(self, *args, **options):
+        if options['model']:
+            models = [apps.get_model(label) for label in options['model']]
+            for model in models:
+                if not PartitionManager.is_partitioned(model):
+                    raise CommandError(f'{model._meta.label} is not partitioned')
+        else:
+            models = PartitionManager.get_partitioned_models()
+        
+        if not models:
+            self.stdout.write('No partitioned table')
+            return
+        
+        action = 'drop' if options['drop'] else PARTITION_RETENTION_ACTION
+        for model in models:
+            table = model._meta.db_table
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{model._meta.label} ({table})'))
+            
+            if options['ensure']:
+                created = PartitionManager.ensure_partitions(model, months_ahead=options['months_ahead'])
+                self.stdout.write(self.style.SUCCESS(f"  {len(created)} partition(s) created{': ' + ', '.join(created) if created else ''}"))
+            
+            if options['retain_months'] is not None:
+                cutoff = add_months(month_start(timezone.now()), -options['retain_months'])
+                removed = PartitionManager.apply_retention(model, cutoff, action, dry_run=options['dry_run'])
+                done = {'detach': 'detached', 'drop': 'dropped'}[action]
+                verb = f"would be {done}" if options['dry_run'] else done
+                names = ', '.join(partition['name'] for partition in removed)
+                self.stdout.write(self.style.SUCCESS(f"  {len(removed)} partition(s) before {cutoff:%Y-%m} {verb}{': ' + names if names else ''}"))
+            
+            for partition in PartitionManager.get_partitions(model):
+                self.stdout.write(f"  {partition['name']:<40} {partition['start']:%Y-%m-%d} .. {partition['end']:%Y-%m-%d} ~{partition['rows']} rows")
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from market_data.simulator import SimulatorServer, SIMULATOR_FULL_BARS
+
+class Command(BaseCommand):
+    help = 'Serve synthetic forex bars in the Alpha Vantage JSON format for load and throughput testing'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1', help='Listen address (default: 127.0.0.1)')
+        parser.add_argument('--port', type=int, default=8765, help='Listen port (default: 8765)')
+        parser.add_argument('--latency', type=float, default=0.0, help='Mean latency added to each response, in milliseconds (default: 0)')
+        parser.add_argument('--jitter', type=float, default=0.0, help='Maximum uniform latency variation, in milliseconds (default: 0)')
+        parser.add_argument('--calls-per-minute', type=int, default=0, help='Simulated API quota; extra calls get a call frequency note (default: unlimited)')
+        parser.add_argument('--throttle-rate', type=float, default=0.0, help='Probability of a call frequency note (default: 0)')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Probability of an HTTP 503 response (default: 0)')
+        parser.add_argument('--full-bars', type=int, default=SIMULATOR_FULL_BARS, help=f'Bars in a full response (default: {SIMULATOR_FULL_BARS})')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic bars and injected failures (default: 0)')
+    
+    def handle(self, *args, **options):
+        server = SimulatorServer(
+            (options['host'], options['port']),
+            latency=options['latency'] / 1000,
+            jitter=options['jitter'] / 1000,
+            calls_per_minute=options['calls_per_minute'],
+            throttle_rate=options['throttle_rate'],
+            error_rate=options['error_rate'],
+            full_bars=options['full_bars'],
+            seed=options['seed'],
+            verbose=options['verbosity'] > 1,
+        )
+        host, port = server.server_address[:2]
+        self.stdout.write(self.style.SUCCESS(f'Alpha Vantage simulator listening on http://{host}:{port}/query'))
+        self.stdout.write(f'Point the application at it with ALPHA_VANTAGE_BASE_URL=http://{host}:{port}/query')
+        
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            stats = server.stats
+            self.stdout.write(
+                f"\n{stats['requests']} requests: {stats['served']} served ({stats['bars']} bars), "
+                f"{stats['throttled']} throttled, {stats['errors']} errors"
+            )
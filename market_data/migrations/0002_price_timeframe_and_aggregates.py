@@ -0,0 +1,47 @@
+# Generated by Django 5.1.8 on 2026-10-18 10:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market_data', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='pricedata',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='pricedata',
+            name='timeframe',
+            field=models.CharField(choices=[('1m', '1 Minute'), ('5m', '5 Minutes'), ('15m', '15 Minutes'), ('30m', '30 Minutes'), ('1h', '1 Hour'), ('4h', '4 Hours'), ('1d', '1 Day'), ('1w', '1 Week'), ('1mo', '1 Month')], default='1h', max_length=5),
+        ),
+        migrations.AlterUniqueTogether(
+            name='pricedata',
+            unique_together={('pair', 'timeframe', 'timestamp')},
+        ),
+        migrations.CreateModel(
+            name='PriceAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timeframe', models.CharField(choices=[('1m', '1 Minute'), ('5m', '5 Minutes'), ('15m', '15 Minutes'), ('30m', '30 Minutes'), ('1h', '1 Hour'), ('4h', '4 Hours'), ('1d', '1 Day'), ('1w', '1 Week'), ('1mo', '1 Month')], max_length=5)),
+                ('source_timeframe', models.CharField(choices=[('1m', '1 Minute'), ('5m', '5 Minutes'), ('15m', '15 Minutes'), ('30m', '30 Minutes'), ('1h', '1 Hour'), ('4h', '4 Hours'), ('1d', '1 Day'), ('1w', '1 Week'), ('1mo', '1 Month')], max_length=5)),
+                ('timestamp', models.DateTimeField()),
+                ('open_price', models.DecimalField(decimal_places=8, max_digits=18)),
+                ('high_price', models.DecimalField(decimal_places=8, max_digits=18)),
+                ('low_price', models.DecimalField(decimal_places=8, max_digits=18)),
+                ('close_price', models.DecimalField(decimal_places=8, max_digits=18)),
+                ('volume', models.DecimalField(decimal_places=8, max_digits=24)),
+                ('bar_count', models.IntegerField(help_text='Number of source bars in the bucket')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('pair', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aggregates', to='market_data.currencypair')),
+            ],
+            options={
+                'unique_together': {('pair', 'timeframe', 'timestamp')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.8 on 2026-10-18 10:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market_data', '0002_price_timeframe_and_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='currencypair',
+            name='fetch_priority',
+            field=models.PositiveSmallIntegerField(default=100, help_text='Lower values are fetched first'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.8 on 2026-10-18 18:40
+
+from django.db import migrations
+from market_data.partitions import partition_table
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market_data', '0003_currency_pair_fetch_priority'),
+    ]
+
+    operations = [
+        # PostgreSQL uniquement : la table est reconstruite (copie de toutes les lignes),
+        # à exécuter pendant une fenêtre de maintenance sur un historique volumineux
+        migrations.RunPython(*partition_table('market_data_pricedata', 'timestamp')),
+    ]
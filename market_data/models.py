@@ -16,13 +16,32 @@ class CurrencyPair(models.Model):
     quote_currency = models.ForeignKey(Currency, on_delete=models.CASCADE, related_name='quote_pairs')
     symbol = models.CharField(max_length=20, unique=True)
     is_active = models.BooleanField(default=True)
+    fetch_priority = models.PositiveSmallIntegerField(default=100, help_text="Lower values are fetched first")
     
     def __str__(self):
         return self.symbol
 
 class PriceData(models.Model):
-    """Modèle pour stocker les données de prix historiques"""
+    """
+    Modèle pour stocker les données de prix historiques
+    
+    Sous PostgreSQL, la table est partitionnée par mois sur timestamp
+    (voir market_data.partitions).
+    """
+    TIMEFRAMES = [
+        ('1m', '1 Minute'),
+        ('5m', '5 Minutes'),
+        ('15m', '15 Minutes'),
+        ('30m', '30 Minutes'),
+        ('1h', '1 Hour'),
+        ('4h', '4 Hours'),
+        ('1d', '1 Day'),
+        ('1w', '1 Week'),
+        ('1mo', '1 Month'),
+    ]
+    
     pair = models.ForeignKey(CurrencyPair, on_delete=models.CASCADE, related_name='prices')
+    timeframe = models.CharField(max_length=5, choices=TIMEFRAMES, default='1h')
     timestamp = models.DateTimeField()
     open_price = models.DecimalField(max_digits=18, decimal_places=8)
     high_price = models.DecimalField(max_digits=18, decimal_places=8)
@@ -31,14 +50,34 @@ class PriceData(models.Model):
     volume = models.DecimalField(max_digits=24, decimal_places=8)
     
     class Meta:
-        unique_together = ('pair', 'timestamp')
+        unique_together = ('pair', 'timeframe', 'timestamp')
         indexes = [
             models.Index(fields=['pair', 'timestamp']),
             models.Index(fields=['timestamp']),
         ]
     
     def __str__(self):
-        return f"{self.pair.symbol} - {self.timestamp}"
+        return f"{self.pair.symbol} - {self.timeframe} - {self.timestamp}"
+
+class PriceAggregate(models.Model):
+    """Modèle pour les bougies agrégées (4h, 1d, 1w) construites à partir des données les plus fines"""
+    pair = models.ForeignKey(CurrencyPair, on_delete=models.CASCADE, related_name='aggregates')
+    timeframe = models.CharField(max_length=5, choices=PriceData.TIMEFRAMES)
+    source_timeframe = models.CharField(max_length=5, choices=PriceData.TIMEFRAMES)
+    timestamp = models.DateTimeField()
+    open_price = models.DecimalField(max_digits=18, decimal_places=8)
+    high_price = models.DecimalField(max_digits=18, decimal_places=8)
+    low_price = models.DecimalField(max_digits=18, decimal_places=8)
+    close_price = models.DecimalField(max_digits=18, decimal_places=8)
+    volume = models.DecimalField(max_digits=24, decimal_places=8)
+    bar_count = models.IntegerField(help_text="Number of source bars in the bucket")
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ('pair', 'timeframe', 'timestamp')
+    
+    def __str__(self):
+        return f"{self.pair.symbol} - {self.timeframe} - {self.timestamp}"
 
 class EconomicIndicator(models.Model):
     """Modèle pour stocker les indicateurs économiques"""
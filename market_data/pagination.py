@@ -0,0 +1,15 @@
+# market_data/pagination.py
+from rest_framework.pagination import CursorPagination
+
+class TimestampCursorPagination(CursorPagination):
+    """
+    Pagination par curseur sur l'horodatage (du plus récent au plus ancien)
+    
+    Chaque page repart de la position encodée dans le curseur au lieu d'un
+    OFFSET : filtrée par paire, la requête parcourt l'index (pair, timestamp)
+    quelle que soit la profondeur de la page. `?limit=` fixe la taille de la page.
+    """
+    ordering = ('-timestamp', '-id')
+    page_size = 1000
+    page_size_query_param = 'limit'
+    max_page_size = 10000
@@ -0,0 +1,322 @@
+# market_data/partitions.py
+"""
+Partitionnement mensuel des tables d'historique (PostgreSQL)
+
+Les tables converties par migration (PriceData sur timestamp, Signal sur
+bar_timestamp) sont partitionnées par plage d'un mois : '<table>_pAAAAMM'
+couvre [1er du mois, 1er du mois suivant[ en UTC, et '<table>_default'
+reçoit les lignes hors des partitions existantes. Les requêtes filtrées sur
+la colonne de partitionnement ne lisent que les partitions concernées.
+
+- Les partitions des mois à venir sont créées à l'avance (tâche quotidienne)
+  et à la demande avant l'import d'un historique (store_price_data).
+- La rétention détache ou supprime les partitions entières plus anciennes
+  que l'horizon, au lieu d'un DELETE massif.
+
+Sous les autres bases (SQLite en développement), les tables restent
+ordinaires et ces opérations ne font rien.
+"""
+import re
+from datetime import datetime, timezone as dt_timezone
+from django.apps import apps
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+# Nombre de mois à venir pour lesquels une partition existe toujours
+PARTITION_MONTHS_AHEAD = getattr(settings, 'MARKET_DATA_PARTITION_MONTHS_AHEAD', 3)
+
+# Sort des partitions expirées : 'detach' (table conservée hors de la table mère) ou 'drop'
+PARTITION_RETENTION_ACTION = getattr(settings, 'MARKET_DATA_PARTITION_RETENTION_ACTION', 'detach')
+
+def month_start(moment):
+    """Premier instant (UTC) du mois contenant `moment`"""
+    moment = moment.astimezone(dt_timezone.utc) if timezone.is_aware(moment) else moment.replace(tzinfo=dt_timezone.utc)
+    return datetime(moment.year, moment.month, 1, tzinfo=dt_timezone.utc)
+
+def add_months(month, count):
+    """Premier instant du mois situé `count` mois après `month`"""
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+class PartitionManager:
+    """Création, liste et rétention des partitions mensuelles d'une table"""
+    
+    @staticmethod
+    def get_partition_name(table, month):
+        return f"{table}_p{month:%Y%m}"
+    
+    @staticmethod
+    def get_default_name(table):
+        return f"{table}_default"
+    
+    @staticmethod
+    def get_partition_column(model):
+        """
+        Colonne de partitionnement de la table d'un modèle
+        
+        Returns:
+            str: Nom de la colonne, ou None si la table n'est pas partitionnée
+        """
+        connection = connections[model.objects.db]
+        if connection.vendor != 'postgresql':
+            return None
+        
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT a.attname
+                FROM pg_partitioned_table p
+                JOIN pg_attribute a ON a.attrelid = p.partrelid AND a.attnum = p.partattrs[0]
+                WHERE p.partrelid = to_regclass(%s)
+            """, [model._meta.db_table])
+            row = cursor.fetchone()
+        return row[0] if row else None
+    
+    @staticmethod
+    def is_partitioned(model):
+        return PartitionManager.get_partition_column(model) is not None
+    
+    @staticmethod
+    def get_partitioned_models():
+        """Modèles installés dont la table est partitionnée"""
+        return [model for model in apps.get_models() if PartitionManager.is_partitioned(model)]
+    
+    @staticmethod
+    def get_partitions(model):
+        """
+        Partitions mensuelles attachées à la table d'un modèle
+        
+        Returns:
+            list: Dictionnaires name, start, end et rows (estimation du planificateur), par mois croissant
+        """
+        table = model._meta.db_table
+        pattern = re.compile(rf"^{re.escape(table)}_p(\d{{4}})(\d{{2}})$")
+        
+        with connections[model.objects.db].cursor() as cursor:
+            cursor.execute("""
+                SELECT c.relname, c.reltuples
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = to_regclass(%s)
+            """, [table])
+            rows = cursor.fetchall()
+        
+        partitions = []
+        for name, estimate in rows:
+            match = pattern.match(name)
+            if not match:
+                continue
+            start = datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=dt_timezone.utc)
+            partitions.append({'name': name, 'start': start, 'end': add_months(start, 1), 'rows': max(int(estimate), 0)})
+        return sorted(partitions, key=lambda partition: partition['start'])
+    
+    @staticmethod
+    def create_partition(model, month, column=None):
+        """
+        Crée la partition d'un mois si elle n'existe pas
+        
+        Les lignes du mois déjà rangées dans la partition par défaut y sont
+        déplacées avant l'attachement (sinon PostgreSQL refuse la partition).
+        
+        Args:
+            model (Model): Modèle dont la table est partitionnée
+            month (datetime): Un instant du mois
+            column (str, optional): Colonne de partitionnement (lue dans le catalogue par défaut)
+        
+        Returns:
+            bool: La partition a été créée
+        """
+        connection = connections[model.objects.db]
+        quote = connection.ops.quote_name
+        table = model._meta.db_table
+        column = column or PartitionManager.get_partition_column(model)
+        start = month_start(month)
+        end = add_months(start, 1)
+        name = PartitionManager.get_partition_name(table, start)
+        default = PartitionManager.get_default_name(table)
+        bounds = f"FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        
+        with transaction.atomic(using=model.objects.db), connection.cursor() as cursor:
+            # Un seul créateur à la fois par table (imports parallèles au changement de mois)
+            cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [table])
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL, to_regclass(%s) IS NOT NULL", [name, default])
+            exists, has_default = cursor.fetchone()
+            if exists:
+                return False
+            
+            in_range = f"{quote(column)} >= %s AND {quote(column)} < %s"
+            if has_default:
+                cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {quote(default)} WHERE {in_range})", [start, end])
+                has_default = cursor.fetchone()[0]
+            
+            if not has_default:
+                cursor.execute(f"CREATE TABLE {quote(name)} PARTITION OF {quote(table)} FOR VALUES {bounds}")
+                return True
+            
+            # Déplacer les lignes du mois hors de la partition par défaut, puis attacher
+            cursor.execute(f"CREATE TABLE {quote(name)} (LIKE {quote(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+            cursor.execute(f"INSERT INTO {quote(name)} SELECT * FROM {quote(default)} WHERE {in_range}", [start, end])
+            cursor.execute(f"DELETE FROM {quote(default)} WHERE {in_range}", [start, end])
+            cursor.execute(f"ALTER TABLE {quote(table)} ATTACH PARTITION {quote(name)} FOR VALUES {bounds}")
+        return True
+    
+    @staticmethod
+    def ensure_partitions(model, start=None, end=None, months_ahead=PARTITION_MONTHS_AHEAD):
+        """
+        Crée les partitions manquantes de start à end (par défaut : du mois courant à `months_ahead` mois)
+        
+        Returns:
+            list: Noms des partitions créées (liste vide si la table n'est pas partitionnée)
+        """
+        column = PartitionManager.get_partition_column(model)
+        if column is None:
+            return []
+        
+        now = timezone.now()
+        month = month_start(start or now)
+        last = month_start(end or add_months(month_start(now), months_ahead))
+        existing = {partition['start'] for partition in PartitionManager.get_partitions(model)}
+        
+        created = []
+        while month <= last:
+            if month not in existing and PartitionManager.create_partition(model, month, column):
+                created.append(PartitionManager.get_partition_name(model._meta.db_table, month))
+            month = add_months(month, 1)
+        return created
+    
+    @staticmethod
+    def apply_retention(model, cutoff, action=PARTITION_RETENTION_ACTION, dry_run=False):
+        """
+        Détache ou supprime les partitions entièrement antérieures à `cutoff`
+        
+        Seuls des mois complets sont retirés : les lignes du mois de `cutoff`
+        restent en base jusqu'à ce que ce mois expire à son tour.
+        
+        Args:
+            model (Model): Modèle dont la table est partitionnée
+            cutoff (datetime): Limite de rétention
+            action (str): 'detach' ou 'drop'
+            dry_run (bool): Lister les partitions concernées sans les retirer
+        
+        Returns:
+            list: Partitions retirées (dictionnaires de get_partitions)
+        """
+        if action not in ('detach', 'drop'):
+            raise ValueError(f"Unknown retention action: {action}")
+        if not PartitionManager.is_partitioned(model):
+            return []
+        
+        expired = [partition for partition in PartitionManager.get_partitions(model) if partition['end'] <= month_start(cutoff)]
+        if dry_run or not expired:
+            return expired
+        
+        connection = connections[model.objects.db]
+        quote = connection.ops.quote_name
+        with transaction.atomic(using=model.objects.db), connection.cursor() as cursor:
+            for partition in expired:
+                cursor.execute(f"ALTER TABLE {quote(model._meta.db_table)} DETACH PARTITION {quote(partition['name'])}")
+                if action == 'drop':
+                    cursor.execute(f"DROP TABLE {quote(partition['name'])}")
+        return expired
+
+def _get_table_definition(cursor, table):
+    """Contraintes et index d'une table, à recréer après sa reconstruction"""
+    cursor.execute("""
+        SELECT conname, contype, pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE conrelid = to_regclass(%s) AND contype IN ('p', 'u', 'f')
+    """, [table])
+    constraints = cursor.fetchall()
+    
+    cursor.execute("""
+        SELECT indexname, indexdef FROM pg_indexes
+        WHERE schemaname = current_schema() AND tablename = %s
+    """, [table])
+    indexes = [(name, definition) for name, definition in cursor.fetchall() if name not in {row[0] for row in constraints}]
+    
+    cursor.execute("""
+        SELECT conrelid::regclass::text, conname FROM pg_constraint
+        WHERE confrelid = to_regclass(%s) AND contype = 'f'
+    """, [table])
+    references = cursor.fetchall()
+    if references:
+        raise RuntimeError(
+            f"{table} is referenced by foreign keys ({', '.join(f'{t}.{c}' for t, c in references)}); "
+            "drop them (db_constraint=False) before rebuilding the table"
+        )
+    return constraints, indexes
+
+def _get_sequence_name(cursor, table):
+    """Nom de la séquence d'identité de la colonne id"""
+    cursor.execute("SELECT relname FROM pg_class WHERE oid = to_regclass(pg_get_serial_sequence(%s, 'id'))", [table])
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+def _rebuild_table(schema_editor, table, column=None, months_ahead=PARTITION_MONTHS_AHEAD):
+    """
+    Reconstruit une table en table partitionnée par mois sur `column` (ou en table ordinaire si None)
+    
+    Les lignes sont copiées, l'identité (séquence de id) est conservée, et les
+    contraintes et index sont recréés sous les mêmes noms ; la clé primaire
+    d'une table partitionnée inclut la colonne de partitionnement.
+    """
+    quote = schema_editor.connection.ops.quote_name
+    legacy = f"{table}_legacy"
+    
+    with schema_editor.connection.cursor() as cursor:
+        constraints, indexes = _get_table_definition(cursor, table)
+        sequence = _get_sequence_name(cursor, table)
+        
+        cursor.execute(f"ALTER TABLE {quote(table)} RENAME TO {quote(legacy)}")
+        partition_by = f" PARTITION BY RANGE ({quote(column)})" if column else ""
+        cursor.execute(
+            f"CREATE TABLE {quote(table)} (LIKE {quote(legacy)} INCLUDING DEFAULTS INCLUDING IDENTITY"
+            f" INCLUDING STORAGE INCLUDING COMMENTS){partition_by}"
+        )
+        
+        if column:
+            # Un mois par partition, de la plus ancienne ligne à `months_ahead` mois, plus la partition par défaut
+            cursor.execute(f"SELECT MIN({quote(column)}) FROM {quote(legacy)}")
+            oldest = cursor.fetchone()[0] or timezone.now()
+            month, last = month_start(oldest), add_months(month_start(timezone.now()), months_ahead)
+            while month <= last:
+                end = add_months(month, 1)
+                cursor.execute(
+                    f"CREATE TABLE {quote(PartitionManager.get_partition_name(table, month))} PARTITION OF {quote(table)}"
+                    f" FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+                )
+                month = end
+            cursor.execute(f"CREATE TABLE {quote(PartitionManager.get_default_name(table))} PARTITION OF {quote(table)} DEFAULT")
+        
+        cursor.execute(f"INSERT INTO {quote(table)} SELECT * FROM {quote(legacy)}")
+        cursor.execute(f"DROP TABLE {quote(legacy)} CASCADE")
+        
+        # Reprendre le nom et la position de la séquence d'origine
+        new_sequence = _get_sequence_name(cursor, table)
+        if sequence and new_sequence != sequence:
+            cursor.execute(f"ALTER SEQUENCE {quote(new_sequence)} RENAME TO {quote(sequence)}")
+        cursor.execute(f"SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE(MAX(id), 0) + 1, false) FROM {quote(table)}", [table])
+        
+        for name, kind, definition in sorted(constraints, key=lambda row: 'puf'.index(row[1])):
+            if kind == 'p':
+                definition = f"PRIMARY KEY (id, {quote(column)})" if column else "PRIMARY KEY (id)"
+            cursor.execute(f"ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(name)} {definition}")
+        for name, definition in indexes:
+            cursor.execute(definition)
+
+def partition_table(table, column, months_ahead=PARTITION_MONTHS_AHEAD):
+    """
+    Opération RunPython convertissant une table en table partitionnée par mois (PostgreSQL uniquement)
+    
+    Returns:
+        tuple: Fonctions (avant, arrière) pour migrations.RunPython
+    """
+    def forward(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            _rebuild_table(schema_editor, table, column, months_ahead)
+    
+    def backward(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            _rebuild_table(schema_editor, table)
+    
+    return forward, backward
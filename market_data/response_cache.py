@@ -0,0 +1,146 @@
+# market_data/response_cache.py
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+import pandas as pd
+from django.conf import settings
+from .aggregation import TIMEFRAME_DURATIONS
+
+# Répertoire des réponses Alpha Vantage conservées sur disque
+MARKET_DATA_CACHE_DIR = Path(getattr(settings, 'MARKET_DATA_CACHE_DIR', Path(settings.BASE_DIR) / 'var' / 'market_data_cache'))
+
+# 'off' : pas de cache ; 'on' : réutiliser les réponses encore valides ;
+# 'replay' : servir uniquement depuis le disque, sans jamais appeler l'API
+MARKET_DATA_CACHE_MODE = getattr(settings, 'MARKET_DATA_CACHE_MODE', 'on')
+
+# Paramètres identifiant une réponse (la clé API en est exclue)
+CACHE_KEY_PARAMS = ('function', 'from_symbol', 'to_symbol', 'interval', 'outputsize')
+
+# Intervalles Alpha Vantage ramenés aux durées des timeframes
+INTERVAL_TIMEFRAMES = {
+    '1min': '1m', '5min': '5m', '15min': '15m', '30min': '30m', '60min': '1h',
+    'FX_DAILY': '1d', 'FX_WEEKLY': '1w',
+}
+
+class ResponseCache:
+    """Cache disque adressé par contenu des réponses JSON d'Alpha Vantage (gzip)"""
+    
+    @staticmethod
+    def get_key(params):
+        """Empreinte SHA-256 des paramètres significatifs de la requête"""
+        canonical = json.dumps({name: params.get(name) for name in CACHE_KEY_PARAMS}, sort_keys=True)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+    
+    @staticmethod
+    def get_path(params):
+        """Chemin du fichier : <répertoire>/<fonction>/<symbole>/<empreinte>.json.gz"""
+        symbol = f"{params.get('from_symbol', '')}{params.get('to_symbol', '')}"
+        return MARKET_DATA_CACHE_DIR / params.get('function', 'UNKNOWN') / symbol / f"{ResponseCache.get_key(params)}.json.gz"
+    
+    @staticmethod
+    def get_expiration(params, fetched_at):
+        """
+        Date d'expiration d'une réponse : début de la bougie suivante
+        
+        Une réponse reste valide tant qu'aucune nouvelle bougie n'a pu apparaître.
+        
+        Args:
+            params (dict): Paramètres de la requête
+            fetched_at (pd.Timestamp): Date de téléchargement (UTC)
+        
+        Returns:
+            pd.Timestamp: Date d'expiration (UTC)
+        """
+        if params.get('function') == 'FX_MONTHLY':
+            return (fetched_at + pd.offsets.MonthBegin(1)).normalize()
+        
+        timeframe = INTERVAL_TIMEFRAMES.get(params.get('interval')) or INTERVAL_TIMEFRAMES.get(params.get('function'), '1h')
+        if timeframe == '1w':
+            # Semaines commençant le lundi, comme les bougies agrégées
+            return fetched_at.normalize() + pd.Timedelta(days=7 - fetched_at.weekday())
+        return fetched_at.floor(TIMEFRAME_DURATIONS[timeframe]) + TIMEFRAME_DURATIONS[timeframe]
+    
+    @staticmethod
+    def get(params, mode=None):
+        """
+        Retourne la réponse conservée pour une requête
+        
+        Args:
+            params (dict): Paramètres de la requête
+            mode (str, optional): Mode du cache (par défaut MARKET_DATA_CACHE_MODE)
+        
+        Returns:
+            dict: Réponse JSON, ou None si absente, expirée (hors mode 'replay') ou cache désactivé
+        """
+        mode = mode or MARKET_DATA_CACHE_MODE
+        if mode == 'off':
+            return None
+        
+        path = ResponseCache.get_path(params)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable cache entry {path}: {str(e)}")
+            return None
+        
+        if mode != 'replay' and pd.Timestamp(entry['expires_at']) <= pd.Timestamp.now(tz='UTC'):
+            return None
+        
+        return entry['data']
+    
+    @staticmethod
+    def put(params, data, mode=None):
+        """
+        Enregistre une réponse (écriture atomique)
+        
+        Args:
+            params (dict): Paramètres de la requête
+            data (dict): Réponse JSON
+            mode (str, optional): Mode du cache (par défaut MARKET_DATA_CACHE_MODE)
+        """
+        mode = mode or MARKET_DATA_CACHE_MODE
+        if mode == 'off':
+            return
+        
+        fetched_at = pd.Timestamp.now(tz='UTC')
+        entry = {
+            'params': {name: params.get(name) for name in CACHE_KEY_PARAMS},
+            'fetched_at': fetched_at.isoformat(),
+            'expires_at': ResponseCache.get_expiration(params, fetched_at).isoformat(),
+            'data': data,
+        }
+        
+        path = ResponseCache.get_path(params)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                f.write(json.dumps(entry).encode('utf-8'))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Could not write cache entry {path}: {str(e)}")
+    
+    @staticmethod
+    def clear(function=None, symbol=None):
+        """
+        Supprime des réponses conservées
+        
+        Args:
+            function (str, optional): Fonction API (ex: FX_INTRADAY). Si None, toutes.
+            symbol (str, optional): Symbole de la paire. Si None, tous.
+        
+        Returns:
+            int: Nombre de fichiers supprimés
+        """
+        pattern = f"{function or '*'}/{symbol or '*'}/*.json.gz"
+        removed = 0
+        for path in MARKET_DATA_CACHE_DIR.glob(pattern):
+            path.unlink(missing_ok=True)
+            removed += 1
+        return removed
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Currency, CurrencyPair, PriceData, EconomicIndicator, EconomicData
+from .fast_serialization import RowSerializer
 
 class CurrencySerializer(serializers.ModelSerializer):
     class Meta:
@@ -20,9 +21,24 @@ class PriceDataSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = PriceData
-        fields = ['id', 'pair', 'pair_symbol', 'timestamp', 'open_price', 
+        fields = ['id', 'pair', 'pair_symbol', 'timeframe', 'timestamp', 'open_price', 
                   'high_price', 'low_price', 'close_price', 'volume']
 
+class PriceDataRowSerializer(RowSerializer):
+    """Équivalent rapide de PriceDataSerializer pour les listes"""
+    columns = [
+        ('id', 'id', None),
+        ('pair', 'pair_id', None),
+        ('pair_symbol', 'pair__symbol', None),
+        ('timeframe', 'timeframe', None),
+        ('timestamp', 'timestamp', 'datetime'),
+        ('open_price', 'open_price', 'decimal'),
+        ('high_price', 'high_price', 'decimal'),
+        ('low_price', 'low_price', 'decimal'),
+        ('close_price', 'close_price', 'decimal'),
+        ('volume', 'volume', 'decimal'),
+    ]
+
 class EconomicIndicatorSerializer(serializers.ModelSerializer):
     class Meta:
         model = EconomicIndicator
@@ -1,10 +1,24 @@
-import requests
 import pandas as pd
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max
 from .models import Currency, CurrencyPair, PriceData
+from .aggregation import PriceAggregator
+from .events import price_data_updated
+from .partitions import PartitionManager
+from .fetcher import AlphaVantageClient, ALPHA_VANTAGE_MAX_WORKERS
 
-API_KEY = getattr(settings, 'ALPHA_VANTAGE_API_KEY', '073XRZ4KX6ENI78E')
+# Nombre de bougies écrites par requête INSERT lors de l'ingestion
+INGESTION_BATCH_SIZE = getattr(settings, 'MARKET_DATA_INGESTION_BATCH_SIZE', 2000)
+
+# Alias d'intervalles acceptés par fetch_forex_data, ramenés au timeframe stocké
+TIMEFRAME_ALIASES = {
+    '1day': '1d', 'daily': '1d',
+    '1week': '1w', 'weekly': '1w',
+    '1month': '1mo', 'monthly': '1mo',
+}
 
 class MarketDataService:
     """Service pour récupérer les données de marché depuis Alpha Vantage"""
@@ -36,24 +50,23 @@ class MarketDataService:
         from_symbol, to_symbol = symbol[:3], symbol[3:]
         
         # Déterminer la fonction API appropriée
+        params = {'from_symbol': from_symbol, 'to_symbol': to_symbol}
         if interval in ['1d', '1day', 'daily']:
-            function = 'FX_DAILY'
-            url = f'https://www.alphavantage.co/query?function={function}&from_symbol={from_symbol}&to_symbol={to_symbol}&outputsize={outputsize}&apikey={API_KEY}'
+            params.update(function='FX_DAILY', outputsize=outputsize)
         elif interval in ['1w', '1week', 'weekly']:
-            function = 'FX_WEEKLY'
-            url = f'https://www.alphavantage.co/query?function={function}&from_symbol={from_symbol}&to_symbol={to_symbol}&apikey={API_KEY}'
+            params.update(function='FX_WEEKLY')
         elif interval in ['1mo', '1month', 'monthly']:
-            function = 'FX_MONTHLY'
-            url = f'https://www.alphavantage.co/query?function={function}&from_symbol={from_symbol}&to_symbol={to_symbol}&apikey={API_KEY}'
+            params.update(function='FX_MONTHLY')
         else:
-            function = 'FX_INTRADAY'
-            url = f'https://www.alphavantage.co/query?function={function}&from_symbol={from_symbol}&to_symbol={to_symbol}&interval={av_interval}&outputsize={outputsize}&apikey={API_KEY}'
+            params.update(function='FX_INTRADAY', interval=av_interval, outputsize=outputsize)
         
-        print(f"Requesting data from: {url}")
+        print(f"Requesting {params['function']} data for {symbol} ({av_interval}, {outputsize})")
         
         try:
-            response = requests.get(url)
-            data = response.json()
+            # Cache disque, session partagée, quota et nouvelles tentatives gérés par le client
+            data = AlphaVantageClient.fetch(params)
+            if data is None:
+                return None
             
             # Vérifier s'il y a une erreur dans la réponse
             if 'Error Message' in data:
@@ -62,9 +75,6 @@ class MarketDataService:
             
             if 'Information' in data:
                 print(f"API Info: {data['Information']}")
-                # Si c'est un message concernant la limite d'appels API, retourner None
-                if 'call frequency' in data['Information']:
-                    return None
             
             # Extraire les données de séries temporelles
             time_series_key = None
@@ -114,10 +124,11 @@ class MarketDataService:
             # Ajouter l'index comme colonne de date
             df.reset_index(inplace=True)
             df.rename(columns={'index': 'timestamp'}, inplace=True)
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            # Les horodatages forex d'Alpha Vantage sont exprimés en UTC
+            df['timestamp'] = pd.to_datetime(df['timestamp']).dt.tz_localize('UTC')
             
             return df
-            
+        
         except Exception as e:
             print(f"Error fetching data from Alpha Vantage: {str(e)}")
             return None
@@ -160,8 +171,9 @@ class MarketDataService:
                     is_active=True
                 )
             
-            # Récupérer la dernière date en base
-            latest_price = PriceData.objects.filter(pair=pair).order_by('-timestamp').first()
+            # Récupérer la dernière date en base pour ce timeframe
+            timeframe = TIMEFRAME_ALIASES.get(interval, interval)
+            latest_price = PriceData.objects.filter(pair=pair, timeframe=timeframe).order_by('-timestamp').first()
             outputsize = 'compact'  # Par défaut, récupérer seulement les 100 dernières données
             
             if not latest_price:
@@ -174,25 +186,184 @@ class MarketDataService:
             if df is None or df.empty:
                 return False
             
-            # Filtrer les nouvelles données
+            # Conserver la dernière bougie connue : elle peut avoir été
+            # enregistrée avant sa clôture et sera mise à jour par l'upsert
             if latest_price:
-                df = df[df['timestamp'] > latest_price.timestamp]
+                df = df[df['timestamp'] >= latest_price.timestamp]
             
-            # Enregistrer les données dans la base
-            for _, row in df.iterrows():
-                PriceData.objects.create(
-                    pair=pair,
-                    timestamp=row['timestamp'],
-                    open_price=row['open'],
-                    high_price=row['high'],
-                    low_price=row['low'],
-                    close_price=row['close'],
-                    volume=row['volume']
-                )
+            # Enregistrer les données dans la base par lots
+            stats = MarketDataService.store_price_data(pair, df, timeframe=timeframe)
             
-            print(f"Updated {len(df)} records for {pair_symbol}")
-            return True
+            # Mettre à jour les bougies agrégées (4h, 1d, 1w)
+            previous = PriceAggregator.get_latest_timestamps(pair)
+            PriceAggregator.refresh_all(pair)
+            
+            # Prévenir les consommateurs (cache des indicateurs, génération des signaux, etc.)
+            price_data_updated.send(
+                sender=MarketDataService,
+                pair_symbol=pair_symbol,
+                timeframe=timeframe,
+                inserted=stats['inserted'],
+                updated=stats['updated']
+            )
             
+            # Puis pour chaque timeframe agrégé dont une nouvelle bougie vient de s'ouvrir
+            for aggregated_timeframe, inserted in PriceAggregator.count_new_bars(pair, previous).items():
+                if inserted and aggregated_timeframe != timeframe:
+                    price_data_updated.send(
+                        sender=MarketDataService,
+                        pair_symbol=pair_symbol,
+                        timeframe=aggregated_timeframe,
+                        inserted=inserted,
+                        updated=0
+                    )
+            
+            print(f"Updated {len(df)} records for {pair_symbol} "
+                  f"({stats['inserted']} inserted, {stats['updated']} updated)")
+            return True
+        
         except Exception as e:
             print(f"Error updating forex data for {pair_symbol}: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+    
+    @staticmethod
+    def get_update_order(pair_symbols=None, interval='1h'):
+        """
+        Symboles à mettre à jour, par fetch_priority croissant puis du plus en retard au plus à jour
+        
+        Args:
+            pair_symbols (list, optional): Symboles à mettre à jour. Si None, toutes les paires actives.
+            interval (str): Intervalle de temps
+        
+        Returns:
+            list: Symboles dans l'ordre de mise à jour
+        """
+        timeframe = TIMEFRAME_ALIASES.get(interval, interval)
+        
+        pairs = CurrencyPair.objects.filter(is_active=True)
+        if pair_symbols is not None:
+            pairs = CurrencyPair.objects.filter(symbol__in=pair_symbols)
+        
+        latest = dict(
+            PriceData.objects.filter(pair__in=pairs, timeframe=timeframe)
+            .values('pair_id').annotate(latest=Max('timestamp')).values_list('pair_id', 'latest')
+        )
+        pairs = sorted(
+            pairs,
+            key=lambda pair: (pair.fetch_priority, latest.get(pair.id) or datetime.min.replace(tzinfo=timezone.utc), pair.symbol)
+        )
+        return [pair.symbol for pair in pairs]
+    
+    @staticmethod
+    def update_all_forex_data(pair_symbols=None, interval='1h', max_workers=ALPHA_VANTAGE_MAX_WORKERS):
+        """
+        Met à jour plusieurs paires en parallèle, dans l'ordre de priorité
+        
+        Les paires sont traitées par ordre de fetch_priority croissant, puis de
+        la plus en retard à la plus à jour. Le débit global reste limité par le
+        quota de l'API (AlphaVantageClient.limiter).
+        
+        Args:
+            pair_symbols (list, optional): Symboles à mettre à jour. Si None, toutes les paires actives.
+            interval (str): Intervalle de temps
+            max_workers (int): Nombre de requêtes simultanées
+        
+        Returns:
+            dict: True/False par symbole selon le succès de la mise à jour
+        """
+        def update(symbol):
+            try:
+                return MarketDataService.update_forex_data(symbol, interval)
+            finally:
+                # Chaque thread ouvre sa propre connexion à la base
+                connection.close()
+        
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+            futures = {
+                symbol: executor.submit(update, symbol)
+                for symbol in MarketDataService.get_update_order(pair_symbols, interval)
+            }
+        
+        return {symbol: future.result() for symbol, future in futures.items()}
+    
+    @staticmethod
+    def store_price_data(pair, df, timeframe='1h', batch_size=INGESTION_BATCH_SIZE):
+        """
+        Enregistre un DataFrame OHLCV par lots, avec upsert sur (pair, timeframe, timestamp)
+        
+        Les colonnes sont converties d'un bloc (sans iterrows) puis écrites via
+        bulk_create(update_conflicts=True) : une requête par lot, et les bougies
+        déjà présentes sont mises à jour au lieu de violer unique_together.
+        
+        Args:
+            pair (CurrencyPair): Paire de devises
+            df (pandas.DataFrame): Colonnes timestamp, open, high, low, close, volume
+            timeframe (str): Timeframe des bougies
+            batch_size (int): Nombre de lignes par requête
+        
+        Returns:
+            dict: Totaux 'inserted' et 'updated', et le détail par lot dans 'batches'
+        """
+        stats = {'inserted': 0, 'updated': 0, 'batches': []}
+        
+        if df is None or df.empty:
+            return stats
+        
+        # Normaliser les horodatages en UTC et dédoublonner
+        timestamps = pd.to_datetime(df['timestamp'])
+        if timestamps.dt.tz is None:
+            timestamps = timestamps.dt.tz_localize('UTC')
+        df = df.assign(timestamp=timestamps).drop_duplicates('timestamp', keep='last').sort_values('timestamp')
+        
+        volume = df['volume'] if 'volume' in df.columns else pd.Series(0, index=df.index)
+        
+        # Conversion colonne par colonne
+        rows = list(zip(
+            pd.DatetimeIndex(df['timestamp']).to_pydatetime().tolist(),
+            df['open'].tolist(),
+            df['high'].tolist(),
+            df['low'].tolist(),
+            df['close'].tolist(),
+            volume.fillna(0).tolist(),
+        ))
+        
+        # Tables partitionnées : les mois importés doivent avoir leur partition
+        PartitionManager.ensure_partitions(PriceData, rows[0][0], rows[-1][0])
+        
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            objects = [
+                PriceData(
+                    pair=pair,
+                    timeframe=timeframe,
+                    timestamp=timestamp,
+                    open_price=open_price,
+                    high_price=high_price,
+                    low_price=low_price,
+                    close_price=close_price,
+                    volume=volume_value
+                )
+                for timestamp, open_price, high_price, low_price, close_price, volume_value in batch
+            ]
+            
+            with transaction.atomic():
+                # Les lignes déjà en base seront mises à jour par l'upsert
+                updated = PriceData.objects.filter(
+                    pair=pair,
+                    timeframe=timeframe,
+                    timestamp__in=[row[0] for row in batch]
+                ).count()
+                
+                PriceData.objects.bulk_create(
+                    objects,
+                    update_conflicts=True,
+                    unique_fields=['pair', 'timeframe', 'timestamp'],
+                    update_fields=['open_price', 'high_price', 'low_price', 'close_price', 'volume'],
+                )
+            
+            batch_stats = {'inserted': len(batch) - updated, 'updated': updated}
+            stats['batches'].append(batch_stats)
+            stats['inserted'] += batch_stats['inserted']
+            stats['updated'] += batch_stats['updated']
+        
+        return stats
@@ -0,0 +1,316 @@
+# market_data/simulator.py
+"""
+Simulateur local de l'API Alpha Vantage (tests de charge et de débit)
+
+Le serveur HTTP répond aux fonctions FX_INTRADAY, FX_DAILY, FX_WEEKLY et
+FX_MONTHLY dans le format JSON d'Alpha Vantage, pour n'importe quel
+symbole, avec des bougies synthétiques déterministes : une même graine
+donne toujours les mêmes bougies aux mêmes horodatages, quelle que soit la
+requête (compact ou full) ou l'heure à laquelle elle est faite.
+
+Les cours suivent une marche aléatoire (en logarithme) sur une grille de
+bougies alignée sur l'époque Unix. La grille est découpée en blocs de
+SIMULATOR_BLOCK_SIZE bougies reliés par des niveaux d'ancrage (pont
+brownien) : une bougie se calcule sans générer tout l'historique.
+
+Latence, refus pour dépassement de quota (message « call frequency ») et
+erreurs HTTP 503 peuvent être injectés. Pour y diriger l'application :
+
+    ALPHA_VANTAGE_BASE_URL=http://127.0.0.1:8765/query
+    ALPHA_VANTAGE_CALLS_PER_MINUTE=100000
+    MARKET_DATA_CACHE_MODE=off
+"""
+import json
+import random
+import threading
+import time
+import zlib
+from collections import deque
+from datetime import datetime, timezone as dt_timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+# Nombre de bougies d'une réponse 'full' (les bougies hebdomadaires et mensuelles couvrent autant de jours)
+SIMULATOR_FULL_BARS = getattr(settings, 'MARKET_DATA_SIMULATOR_FULL_BARS', 5000)
+
+# Nombre de bougies d'une réponse 'compact' (comme l'API)
+SIMULATOR_COMPACT_BARS = 100
+
+# Bougies par bloc de marche aléatoire entre deux niveaux d'ancrage
+SIMULATOR_BLOCK_SIZE = 1024
+
+# Volatilité journalière des cours synthétiques (écart-type des rendements logarithmiques)
+SIMULATOR_DAILY_VOLATILITY = 0.006
+
+# Durée des bougies par intervalle Alpha Vantage (secondes)
+INTERVAL_SECONDS = {'1min': 60, '5min': 300, '15min': 900, '30min': 1800, '60min': 3600}
+DAY_SECONDS = 86400
+
+# Clés des séries et libellés des réponses par fonction
+SERIES_KEYS = {
+    'FX_DAILY': ('Time Series FX (Daily)', 'Forex Daily Prices (open, high, low, close)'),
+    'FX_WEEKLY': ('Time Series FX (Weekly)', 'Forex Weekly Prices (open, high, low, close)'),
+    'FX_MONTHLY': ('Time Series FX (Monthly)', 'Forex Monthly Prices (open, high, low, close)'),
+}
+
+THROTTLE_NOTE = (
+    "Thank you for using Alpha Vantage! Our standard API call frequency is 5 calls per minute and 500 calls per day. "
+    "Please visit https://www.alphavantage.co/premium/ if you would like to target a higher API call frequency."
+)
+
+def _invalid_call(function):
+    return {'Error Message': f"Invalid API call. Please retry or visit the documentation (https://www.alphavantage.co/documentation/) for {function}."}
+
+class MarketSimulator:
+    """Bougies synthétiques déterministes et réponses au format Alpha Vantage"""
+    
+    @staticmethod
+    def get_seed(seed, *values):
+        """Graine stable (indépendante de PYTHONHASHSEED) pour une combinaison de valeurs"""
+        return [seed] + [zlib.crc32(str(value).encode()) for value in values]
+    
+    @staticmethod
+    def get_anchor(symbol, step, block, seed=0):
+        """Niveau logarithmique du cours au début d'un bloc"""
+        base = np.random.default_rng(MarketSimulator.get_seed(seed, symbol)).uniform(-0.5, 2.3) * np.log(10)
+        spread = SIMULATOR_DAILY_VOLATILITY * np.sqrt(step / DAY_SECONDS * SIMULATOR_BLOCK_SIZE)
+        return base + spread * np.random.default_rng(MarketSimulator.get_seed(seed, symbol, step, block, 'anchor')).standard_normal()
+    
+    @staticmethod
+    def generate_block(symbol, step, block, seed=0):
+        """
+        Bougies d'un bloc : marche aléatoire reliant les ancrages du bloc et du suivant
+        
+        Returns:
+            np.ndarray: Tableau (SIMULATOR_BLOCK_SIZE, 4) des cours open, high, low, close
+        """
+        size = SIMULATOR_BLOCK_SIZE
+        volatility = SIMULATOR_DAILY_VOLATILITY * np.sqrt(step / DAY_SECONDS)
+        rng = np.random.default_rng(MarketSimulator.get_seed(seed, symbol, step, block))
+        
+        walk = np.concatenate([[0.0], np.cumsum(rng.normal(0.0, volatility, size))])
+        start = MarketSimulator.get_anchor(symbol, step, block, seed)
+        end = MarketSimulator.get_anchor(symbol, step, block + 1, seed)
+        levels = np.exp(start + walk - np.arange(size + 1) / size * (walk[-1] - (end - start)))
+        
+        open_prices, close_prices = levels[:-1], levels[1:]
+        wicks = np.exp(np.abs(rng.normal(0.0, volatility / 2, (2, size))))
+        high = np.maximum(open_prices, close_prices) * wicks[0]
+        low = np.minimum(open_prices, close_prices) / wicks[1]
+        return np.column_stack([open_prices, high, low, close_prices])
+    
+    @staticmethod
+    def generate_bars(symbol, step, count, end=None, seed=0):
+        """
+        Les `count` dernières bougies d'un symbole jusqu'à `end` (bougie en cours incluse)
+        
+        Args:
+            symbol (str): Symbole de la paire (ex: EURUSD)
+            step (int): Durée des bougies en secondes
+            count (int): Nombre de bougies
+            end (datetime, optional): Instant de référence (par défaut maintenant)
+            seed (int): Graine du simulateur
+        
+        Returns:
+            pd.DataFrame: Colonnes open, high, low, close, indexé par horodatage d'ouverture (UTC)
+        """
+        end = end or datetime.now(dt_timezone.utc)
+        last = int(end.timestamp()) // step
+        first = max(last - count + 1, 0)
+        
+        blocks = range(first // SIMULATOR_BLOCK_SIZE, last // SIMULATOR_BLOCK_SIZE + 1)
+        values = np.concatenate([MarketSimulator.generate_block(symbol, step, block, seed) for block in blocks])
+        offset = first - blocks[0] * SIMULATOR_BLOCK_SIZE
+        values = values[offset:offset + last - first + 1]
+        
+        index = pd.to_datetime(np.arange(first, last + 1, dtype=np.int64) * step, unit='s', utc=True)
+        return pd.DataFrame(values, index=index, columns=['open', 'high', 'low', 'close'])
+    
+    @staticmethod
+    def resample_bars(daily, frequency):
+        """Bougies hebdomadaires ('W') ou mensuelles ('M'), datées du dernier jour de la période"""
+        periods = daily.index.tz_localize(None).to_period(frequency)
+        bars = daily.groupby(periods).agg({'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last'})
+        bars.index = pd.DatetimeIndex(daily.index.to_series().groupby(periods).last().to_numpy())
+        return bars
+    
+    @staticmethod
+    def build_response(params, now=None, full_bars=SIMULATOR_FULL_BARS, seed=0):
+        """
+        Réponse JSON d'Alpha Vantage pour une requête
+        
+        Args:
+            params (dict): Paramètres de la requête (function, from_symbol, to_symbol, interval, outputsize, apikey)
+            now (datetime, optional): Instant de référence (par défaut maintenant)
+            full_bars (int): Nombre de bougies d'une réponse 'full'
+            seed (int): Graine du simulateur
+        
+        Returns:
+            dict: Réponse décodée (série temporelle ou 'Error Message')
+        """
+        function = params.get('function', '')
+        from_symbol = params.get('from_symbol', '').upper()
+        to_symbol = params.get('to_symbol', '').upper()
+        interval = params.get('interval')
+        outputsize = params.get('outputsize', 'compact')
+        
+        if not params.get('apikey'):
+            return {'Error Message': "the parameter apikey is invalid or missing. Please claim your free API key on (https://www.alphavantage.co/support/#api-key). It should take less than 20 seconds."}
+        if function != 'FX_INTRADAY' and function not in SERIES_KEYS:
+            return {'Error Message': "This API function does not exist."}
+        if not (len(from_symbol) == 3 and from_symbol.isalpha() and len(to_symbol) == 3 and to_symbol.isalpha()):
+            return _invalid_call(function)
+        if function == 'FX_INTRADAY' and interval not in INTERVAL_SECONDS:
+            return _invalid_call(function)
+        if outputsize not in ('compact', 'full'):
+            return _invalid_call(function)
+        
+        symbol = f"{from_symbol}{to_symbol}"
+        count = SIMULATOR_COMPACT_BARS if outputsize == 'compact' else full_bars
+        
+        if function == 'FX_INTRADAY':
+            bars = MarketSimulator.generate_bars(symbol, INTERVAL_SECONDS[interval], count, now, seed)
+            date_format = '%Y-%m-%d %H:%M:%S'
+            series_key = f"Time Series FX ({interval})"
+            meta = {
+                '1. Information': f"FX Intraday ({interval}) Time Series",
+                '2. From Symbol': from_symbol,
+                '3. To Symbol': to_symbol,
+                '4. Last Refreshed': f"{bars.index[-1]:{date_format}}",
+                '5. Interval': interval,
+                '6. Output Size': outputsize.capitalize(),
+                '7. Time Zone': 'UTC',
+            }
+        else:
+            date_format = '%Y-%m-%d'
+            series_key, information = SERIES_KEYS[function]
+            if function == 'FX_DAILY':
+                bars = MarketSimulator.generate_bars(symbol, DAY_SECONDS, count, now, seed)
+            else:
+                # Historique complet, comme l'API : full_bars jours regroupés par semaine ou par mois
+                daily = MarketSimulator.generate_bars(symbol, DAY_SECONDS, full_bars, now, seed)
+                bars = MarketSimulator.resample_bars(daily, 'W' if function == 'FX_WEEKLY' else 'M')
+            meta = {'1. Information': information, '2. From Symbol': from_symbol, '3. To Symbol': to_symbol}
+            if function == 'FX_DAILY':
+                meta['4. Output Size'] = outputsize.capitalize()
+            meta[f"{len(meta) + 1}. Last Refreshed"] = f"{bars.index[-1]:{date_format}}"
+            meta[f"{len(meta) + 1}. Time Zone"] = 'UTC'
+        
+        # Plus récentes en premier, cours en chaînes à 5 décimales
+        values = bars.to_numpy()[::-1]
+        labels = bars.index[::-1].strftime(date_format)
+        series = {
+            label: {'1. open': f"{row[0]:.5f}", '2. high': f"{row[1]:.5f}", '3. low': f"{row[2]:.5f}", '4. close': f"{row[3]:.5f}"}
+            for label, row in zip(labels, values)
+        }
+        return {'Meta Data': meta, series_key: series}
+
+class SimulatorServer(ThreadingHTTPServer):
+    """
+    Serveur HTTP du simulateur (un thread par connexion, keep-alive)
+    
+    Args:
+        address (tuple): Adresse et port d'écoute
+        latency (float): Latence moyenne ajoutée à chaque réponse (secondes)
+        jitter (float): Variation uniforme maximale de la latence (secondes)
+        calls_per_minute (int): Quota simulé (0 : illimité) ; au-delà, message « call frequency »
+        throttle_rate (float): Probabilité d'un refus pour dépassement de quota
+        error_rate (float): Probabilité d'une erreur HTTP 503
+        full_bars (int): Nombre de bougies d'une réponse 'full'
+        seed (int): Graine des bougies et des incidents injectés
+        verbose (bool): Journaliser chaque requête
+    """
+    daemon_threads = True
+    
+    def __init__(self, address, latency=0.0, jitter=0.0, calls_per_minute=0, throttle_rate=0.0,
+                 error_rate=0.0, full_bars=SIMULATOR_FULL_BARS, seed=0, verbose=False):
+        super().__init__(address, SimulatorRequestHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.calls_per_minute = calls_per_minute
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.full_bars = full_bars
+        self.seed = seed
+        self.verbose = verbose
+        self.random = random.Random(seed)
+        self.calls = deque()
+        self.stats = {'requests': 0, 'served': 0, 'throttled': 0, 'errors': 0, 'bars': 0}
+        self.lock = threading.Lock()
+    
+    def draw_incident(self):
+        """
+        Tire le sort d'une requête : quota, erreur injectée ou réponse normale
+        
+        Returns:
+            tuple: (incident ou None, latence en secondes)
+        """
+        with self.lock:
+            self.stats['requests'] += 1
+            now = time.monotonic()
+            while self.calls and now - self.calls[0] >= 60:
+                self.calls.popleft()
+            
+            delay = max(self.latency + self.random.uniform(-self.jitter, self.jitter), 0.0)
+            if self.calls_per_minute and len(self.calls) >= self.calls_per_minute:
+                incident = 'throttled'
+            elif self.random.random() < self.throttle_rate:
+                incident = 'throttled'
+            elif self.random.random() < self.error_rate:
+                incident = 'errors'
+            else:
+                incident = None
+            
+            if incident:
+                self.stats[incident] += 1
+            else:
+                self.calls.append(now)
+            return incident, delay
+    
+    def count_served(self, bars):
+        with self.lock:
+            self.stats['served'] += 1
+            self.stats['bars'] += bars
+
+class SimulatorRequestHandler(BaseHTTPRequestHandler):
+    """Traitement d'une requête GET /query?function=...&from_symbol=..."""
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    
+    def do_GET(self):
+        server = self.server
+        incident, delay = server.draw_incident()
+        time.sleep(delay)
+        
+        if incident == 'errors':
+            self.send_json({'Error Message': 'Service temporarily unavailable'}, status=503)
+            return
+        if incident == 'throttled':
+            self.send_json({'Note': THROTTLE_NOTE})
+            return
+        
+        params = dict(parse_qsl(urlsplit(self.path).query))
+        try:
+            data = MarketSimulator.build_response(params, full_bars=server.full_bars, seed=server.seed)
+        except Exception as e:
+            print(f"Simulator error for {self.path}: {str(e)}")
+            self.send_json({'Error Message': str(e)}, status=500)
+            return
+        
+        server.count_served(sum(len(value) for key, value in data.items() if 'Time Series' in key))
+        self.send_json(data)
+    
+    def send_json(self, data, status=200):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
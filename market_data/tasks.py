@@ -1,9 +1,60 @@
-from celery import shared_task
+from celery import chord, shared_task
 from .services import MarketDataService
-from .models import CurrencyPair
+from datetime import timedelta
+from django.utils import timezone
+from .models import CurrencyPair, PriceData
+from .archive import PriceArchive, MARKET_DATA_ARCHIVE_HORIZON_DAYS
+from .partitions import PartitionManager
+from .fetcher import ALPHA_VANTAGE_CALLS_PER_MINUTE
+
+def fan_out(signatures, description):
+    """
+    Lance une sous-tâche par paire en parallèle, agrégées par merge_results_task
+    
+    Args:
+        signatures (list): Signatures Celery des sous-tâches, chacune renvoyant {symbole: résultat}
+        description (str): Libellé du lot dans le résultat
+    
+    Returns:
+        dict: Identifiant du résultat agrégé et nombre de sous-tâches
+    """
+    if not signatures:
+        return {'task': description, 'subtasks': 0, 'result_id': None}
+    result = chord(signatures)(merge_results_task.s())
+    return {'task': description, 'subtasks': len(signatures), 'result_id': result.id}
 
 @shared_task
-def update_forex_data_task(pair_symbol=None, interval='1h'):
+def merge_results_task(results):
+    """
+    Callback de chord : fusionne les résultats {symbole: résultat} des sous-tâches
+    
+    Args:
+        results (list): Résultats des sous-tâches
+    
+    Returns:
+        dict: Résultats de toutes les paires
+    """
+    merged = {}
+    for result in results:
+        merged.update(result or {})
+    return merged
+
+@shared_task(rate_limit=f"{ALPHA_VANTAGE_CALLS_PER_MINUTE}/m")
+def update_pair_forex_data_task(pair_symbol, interval='1h'):
+    """
+    Sous-tâche : met à jour une paire
+    
+    Le rate_limit s'applique par worker : un seul worker sur la file
+    ingestion respecte ainsi le quota de l'API, quelle que soit sa concurrence.
+    
+    Returns:
+        dict: Statut de la mise à jour de la paire
+    """
+    success = MarketDataService.update_forex_data(pair_symbol, interval)
+    return {pair_symbol: "Success" if success else "Failed"}
+
+@shared_task
+def update_forex_data_task(pair_symbol=None, interval='1h', fan_out_pairs=True):
     """
     Tâche Celery pour mettre à jour les données forex
     
@@ -11,9 +62,11 @@ def update_forex_data_task(pair_symbol=None, interval='1h'):
         pair_symbol (str, optional): Symbole de la paire à mettre à jour
                                      Si None, met à jour toutes les paires actives
         interval (str): Intervalle de temps
+        fan_out_pairs (bool): Répartir les paires en sous-tâches sur les workers de la file
+                              ingestion (chord), plutôt que dans des threads de cette tâche
     
     Returns:
-        dict: Résultats de la mise à jour
+        dict: Résultats de la mise à jour, ou identifiant du résultat agrégé en cas de répartition
     """
     results = {}
     
@@ -21,11 +74,68 @@ def update_forex_data_task(pair_symbol=None, interval='1h'):
         # Mettre à jour une paire spécifique
         success = MarketDataService.update_forex_data(pair_symbol, interval)
         results[pair_symbol] = "Success" if success else "Failed"
+    elif fan_out_pairs:
+        # Une sous-tâche par paire, dans l'ordre de priorité
+        return fan_out(
+            [update_pair_forex_data_task.s(symbol, interval) for symbol in MarketDataService.get_update_order(interval=interval)],
+            f"update_forex_data:{interval}"
+        )
     else:
-        # Mettre à jour toutes les paires actives
-        pairs = CurrencyPair.objects.filter(is_active=True)
-        for pair in pairs:
-            success = MarketDataService.update_forex_data(pair.symbol, interval)
-            results[pair.symbol] = "Success" if success else "Failed"
+        # Mettre à jour toutes les paires actives en parallèle, dans la limite du quota
+        for symbol, success in MarketDataService.update_all_forex_data(interval=interval).items():
+            results[symbol] = "Success" if success else "Failed"
+    
+    return results
+
+@shared_task
+def archive_price_data_task(pair_symbol=None, horizon_days=MARKET_DATA_ARCHIVE_HORIZON_DAYS):
+    """
+    Tâche Celery pour déplacer les bougies anciennes vers l'archive Parquet
+    
+    Si la table est partitionnée, les lignes archivées ne sont pas supprimées
+    une à une : les partitions des mois entièrement expirés sont retirées
+    (détachées ou supprimées) une fois toutes les paires archivées.
+    
+    Args:
+        pair_symbol (str, optional): Symbole de la paire. Si None, archive toutes les paires.
+        horizon_days (int): Âge minimal des bougies archivées, en jours
+    
+    Returns:
+        dict: Nombre de bougies archivées par paire et timeframe (et partitions retirées)
+    """
+    results = {}
+    partitioned = PartitionManager.is_partitioned(PriceData)
+    
+    pairs = CurrencyPair.objects.all()
+    if pair_symbol:
+        pairs = pairs.filter(symbol=pair_symbol)
+    
+    for pair in pairs:
+        for timeframe in pair.prices.values_list('timeframe', flat=True).distinct().order_by():
+            archived = PriceArchive.compact(pair, timeframe, horizon_days, delete=not partitioned)
+            results[f"{pair.symbol}:{timeframe}"] = sum(archived.values())
+    
+    if partitioned and not pair_symbol:
+        cutoff = timezone.now() - timedelta(days=horizon_days)
+        results['partitions_removed'] = [partition['name'] for partition in PartitionManager.apply_retention(PriceData, cutoff)]
+    
+    return results
+
+@shared_task
+def maintain_partitions_task():
+    """
+    Tâche Celery créant à l'avance les partitions mensuelles des tables partitionnées
+    
+    Returns:
+        dict: Partitions créées par table
+    """
+    results = {}
+    
+    for model in PartitionManager.get_partitioned_models():
+        try:
+            results[model._meta.db_table] = PartitionManager.ensure_partitions(model)
+        except Exception as e:
+            print(f"Erreur lors de la création des partitions de {model._meta.db_table}: {e}")
+            results[model._meta.db_table] = "Failed"
     
-    return results
\ No newline at end of file
+    return results
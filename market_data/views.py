@@ -1,11 +1,15 @@
 from rest_framework import viewsets, filters
 from rest_framework.decorators import action
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Currency, CurrencyPair, PriceData, EconomicIndicator, EconomicData
+from .export import QuerysetExporter
+from .pagination import TimestampCursorPagination
 from .serializers import (CurrencySerializer, CurrencyPairSerializer, 
-                         PriceDataSerializer, EconomicIndicatorSerializer, 
-                         EconomicDataSerializer)
+                         PriceDataSerializer, PriceDataRowSerializer, 
+                         EconomicIndicatorSerializer, EconomicDataSerializer)
+from .fast_serialization import FastJSONRenderer, FastListMixin
 
 class CurrencyViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Currency.objects.all()
@@ -14,26 +18,50 @@ class CurrencyViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ['code', 'name']
 
 class CurrencyPairViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = CurrencyPair.objects.filter(is_active=True)
+    queryset = CurrencyPair.objects.filter(is_active=True).select_related('base_currency', 'quote_currency')
     serializer_class = CurrencyPairSerializer
     filter_backends = [filters.SearchFilter, DjangoFilterBackend]
     search_fields = ['symbol']
     filterset_fields = ['base_currency', 'quote_currency', 'is_active']
 
-class PriceDataViewSet(viewsets.ReadOnlyModelViewSet):
+# Colonnes de l'export des bougies : (nom, chemin ORM, type)
+PRICE_DATA_EXPORT_COLUMNS = [
+    ('pair', 'pair__symbol', 'str'),
+    ('timeframe', 'timeframe', 'str'),
+    ('timestamp', 'timestamp', 'datetime'),
+    ('open', 'open_price', 'float'),
+    ('high', 'high_price', 'float'),
+    ('low', 'low_price', 'float'),
+    ('close', 'close_price', 'float'),
+    ('volume', 'volume', 'float'),
+]
+
+class PriceDataViewSet(FastListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = PriceData.objects.all()
     serializer_class = PriceDataSerializer
+    row_serializer_class = PriceDataRowSerializer
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ['pair']
+    filterset_fields = ['pair', 'timeframe']
+    pagination_class = TimestampCursorPagination
     
     def get_queryset(self):
-        queryset = PriceData.objects.all().order_by('-timestamp')
+        # Une seule requête jointe pour pair.symbol, limitée aux champs sérialisés
+        queryset = PriceData.objects.select_related('pair').only(
+            'id', 'pair__symbol', 'timeframe', 'timestamp',
+            'open_price', 'high_price', 'low_price', 'close_price', 'volume'
+        ).order_by('-timestamp')
         
         # Filtrer par paire de devises
         pair_id = self.request.query_params.get('pair', None)
         if pair_id:
             queryset = queryset.filter(pair_id=pair_id)
         
+        # Filtrer par timeframe
+        timeframe = self.request.query_params.get('timeframe', None)
+        if timeframe:
+            queryset = queryset.filter(timeframe=timeframe)
+        
         # Filtrer par plage de dates
         start_date = self.request.query_params.get('start_date', None)
         if start_date:
@@ -43,9 +71,24 @@ class PriceDataViewSet(viewsets.ReadOnlyModelViewSet):
         if end_date:
             queryset = queryset.filter(timestamp__lte=end_date)
         
-        # Limiter le nombre de résultats pour les performances
-        limit = int(self.request.query_params.get('limit', 1000))
-        return queryset[:limit]
+        # Le nombre de résultats est limité par la pagination (?limit= = taille de page)
+        return queryset
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Export en flux des bougies filtrées, par ordre chronologique
+        
+        ?fmt=csv (défaut), ndjson ou arrow (flux Arrow IPC). Accepte les mêmes
+        filtres que la liste, sans limite de taille.
+        """
+        queryset = self.get_queryset().order_by('pair_id', 'timeframe', 'timestamp')
+        try:
+            return QuerysetExporter.response(
+                queryset, PRICE_DATA_EXPORT_COLUMNS, request.query_params.get('fmt', 'csv'), 'price_data'
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
     
     @action(detail=False, methods=['get'])
     def latest(self, request):
@@ -74,7 +117,7 @@ class EconomicDataViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_fields = ['indicator']
     
     def get_queryset(self):
-        queryset = EconomicData.objects.all().order_by('-timestamp')
+        queryset = EconomicData.objects.select_related('indicator').order_by('-timestamp')
         
         # Filtrer par indicateur
         indicator_id = self.request.query_params.get('indicator', None)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Strategy, Signal, BacktestResult
+from .models import Strategy, Signal, LatestSignal, BacktestResult
 
 @admin.register(Strategy)
 class StrategyAdmin(admin.ModelAdmin):
@@ -16,6 +16,14 @@ class SignalAdmin(admin.ModelAdmin):
     date_hierarchy = 'timestamp'
     readonly_fields = ('created_at',)
 
+@admin.register(LatestSignal)
+class LatestSignalAdmin(admin.ModelAdmin):
+    list_display = ('strategy', 'pair', 'timeframe', 'signal', 'timestamp', 'updated_at')
+    search_fields = ('strategy__name', 'pair__symbol')
+    list_filter = ('strategy', 'pair', 'timeframe')
+    raw_id_fields = ('signal',)
+    readonly_fields = ('updated_at',)
+
 @admin.register(BacktestResult)
 class BacktestResultAdmin(admin.ModelAdmin):
     list_display = ('strategy', 'pair', 'timeframe', 'start_date', 'end_date', 'total_trades', 'win_rate', 'profit_factor', 'created_at')
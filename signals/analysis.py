@@ -2,7 +2,26 @@ import pandas as pd
 from datetime import timedelta
 from django.utils import timezone
 from market_data.models import CurrencyPair, PriceData
+from market_data.aggregation import PriceAggregator
+from market_data.columnar import PriceReader
 from signals.models import Strategy, Signal  # Ajout de cet import
+from .events import signals_created
+from .store import SignalStore
+
+# Paramètres de la stratégie combinée BB-Williams-Stoch
+COMBINED_STRATEGY_PARAMS = {
+    'bb_period': 27,
+    'bb_deviation': 2.7,
+    'bb_shift': 0,
+    'williams_period': 75,
+    'williams_oversold': -80,
+    'williams_overbought': -20,
+    'stoch_k_period': 40,
+    'stoch_d_period': 20,
+    'stoch_slowing': 15,
+    'stoch_oversold': 20,
+    'stoch_overbought': 80,
+}
 
 class TechnicalIndicators:
     """Classe utilitaire pour calculer des indicateurs techniques"""
@@ -116,6 +135,133 @@ class TechnicalIndicators:
             'd': d_slow
         }
         
+class IndicatorCache:
+    """
+    Cache des données de prix et des indicateurs partagé entre les stratégies
+    
+    Une entrée par (paire, timeframe) contient les bougies chargées et les
+    indicateurs déjà calculés, indexés par (nom, paramètres). L'entrée est
+    invalidée dès qu'une nouvelle bougie apparaît en base (ou que la dernière
+    bougie est mise à jour), si bien que chaque indicateur n'est calculé
+    qu'une seule fois par bougie, quel que soit le nombre de stratégies.
+    """
+    
+    # Nombre minimal de bougies chargées par entrée (couvre toutes les stratégies)
+    MIN_BARS = 250
+    
+    _entries = {}
+    
+    @staticmethod
+    def get_last_bar(pair_symbol, timeframe):
+        """Retourne (timestamp, close) de la dernière bougie en base, ou None"""
+        pair = CurrencyPair.objects.filter(symbol=pair_symbol).first()
+        if pair is None:
+            return None
+        
+        return PriceAggregator.get_bar_queryset(pair, timeframe).order_by(
+            '-timestamp'
+        ).values_list('timestamp', 'close_price').first()
+    
+    @classmethod
+    def get_entry(cls, pair_symbol, timeframe='1h', limit=200):
+        """
+        Retourne l'entrée du cache pour une paire, rechargée si nécessaire
+        
+        Args:
+            pair_symbol (str): Symbole de la paire
+            timeframe (str): Timeframe des données
+            limit (int): Nombre minimal de bougies requises
+        
+        Returns:
+            dict: Entrée du cache ('last_bar', 'limit', 'data', 'indicators'), ou None
+        """
+        key = (pair_symbol, timeframe)
+        last_bar = cls.get_last_bar(pair_symbol, timeframe)
+        
+        if last_bar is None:
+            cls._entries.pop(key, None)
+            return None
+        
+        entry = cls._entries.get(key)
+        if entry is None or entry['last_bar'] != last_bar or entry['limit'] < limit:
+            fetch_limit = max(limit, cls.MIN_BARS)
+            data = SignalGenerator.get_price_data(pair_symbol, timeframe=timeframe, limit=fetch_limit)
+            if data is None:
+                cls._entries.pop(key, None)
+                return None
+            
+            entry = {
+                'last_bar': last_bar,
+                'limit': fetch_limit,
+                'data': data,
+                'indicators': {},
+            }
+            cls._entries[key] = entry
+        
+        return entry
+    
+    @classmethod
+    def get_price_data(cls, pair_symbol, timeframe='1h', limit=200):
+        """
+        Équivalent en cache de SignalGenerator.get_price_data
+        
+        Returns:
+            pd.DataFrame: Copie des `limit` dernières bougies (modifiable par l'appelant)
+        """
+        entry = cls.get_entry(pair_symbol, timeframe, limit)
+        if entry is None:
+            return None
+        
+        return entry['data'].iloc[-limit:].copy()
+    
+    @classmethod
+    def get_indicator(cls, pair_symbol, timeframe, name, params, compute, limit=200):
+        """
+        Calcule un indicateur une seule fois par bougie et le sert à toutes les stratégies
+        
+        L'entrée validée par le dernier appel à get_price_data est réutilisée
+        sans nouvelle vérification de la dernière bougie.
+        
+        Args:
+            pair_symbol (str): Symbole de la paire
+            timeframe (str): Timeframe des données
+            name (str): Nom de l'indicateur
+            params (tuple): Paramètres de l'indicateur (font partie de la clé)
+            compute (callable): Fonction appelée avec le DataFrame complet de l'entrée
+            limit (int): Nombre minimal de bougies requises
+        
+        Returns:
+            Résultat de `compute` (Series ou dict de Series alignés sur l'index des prix)
+        """
+        entry = cls._entries.get((pair_symbol, timeframe))
+        if entry is None or entry['limit'] < limit:
+            entry = cls.get_entry(pair_symbol, timeframe, limit)
+        if entry is None:
+            return None
+        
+        indicator_key = (name, params)
+        if indicator_key not in entry['indicators']:
+            entry['indicators'][indicator_key] = compute(entry['data'])
+        
+        return entry['indicators'][indicator_key]
+    
+    @classmethod
+    def invalidate(cls, pair_symbol=None, timeframe=None):
+        """Supprime les entrées d'une paire (tous timeframes par défaut), ou tout le cache"""
+        if pair_symbol is None:
+            cls._entries.clear()
+            return
+        
+        for key in list(cls._entries):
+            if key[0] == pair_symbol and (timeframe is None or key[1] == timeframe):
+                del cls._entries[key]
+    
+    @classmethod
+    def on_price_data_updated(cls, sender, pair_symbol, timeframe, **kwargs):
+        """Récepteur de market_data.events.price_data_updated"""
+        # Les bougies agrégées de la paire changent aussi : invalider tous les timeframes
+        cls.invalidate(pair_symbol)
+    
 class SignalGenerator:
     
     @staticmethod
@@ -139,37 +285,15 @@ class SignalGenerator:
                 print(f"Currency pair {pair_symbol} not found")
                 return None
             
-            # Récupérer les données de prix
-            price_data = PriceData.objects.filter(
-                pair=pair
-            ).order_by('-timestamp')[:limit]
+            # Récupérer les données de prix du timeframe demandé
+            # (natives, ou agrégées à partir de la résolution la plus fine),
+            # lues en colonnes float64 et déjà triées par ordre chronologique
+            data = PriceReader.read_frame(PriceAggregator.get_bar_queryset(pair, timeframe), limit=limit)
             
-            if not price_data:
+            if data.empty:
                 print(f"No price data found for {pair_symbol}")
                 return None
             
-            # Convertir en DataFrame
-            data = pd.DataFrame(list(price_data.values(
-                'timestamp', 'open_price', 'high_price', 'low_price', 'close_price', 'volume'
-            )))
-            
-            # Renommer les colonnes
-            data = data.rename(columns={
-                'open_price': 'open',
-                'high_price': 'high',
-                'low_price': 'low',
-                'close_price': 'close'
-            })
-            
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                data[col] = data[col].astype(float)
-            
-            # Trier par timestamp croissant
-            data = data.sort_values('timestamp')
-            
-            # Définir timestamp comme index
-            data.set_index('timestamp', inplace=True)
-            
             return data
             
         except Exception as e:
@@ -192,13 +316,14 @@ class SignalGenerator:
         """
         try:
             # Récupérer les données de prix
-            df = SignalGenerator.get_price_data(pair_symbol, limit=period * 3)
+            df = IndicatorCache.get_price_data(pair_symbol, '1h', limit=period * 3)
             if df is None or len(df) < period + 5:
                 return None
             
             # Calculer les bandes de Bollinger
-            bb = TechnicalIndicators.calculate_bollinger_bands(
-                df['close'], period, deviation, shift
+            bb = IndicatorCache.get_indicator(
+                pair_symbol, '1h', 'bollinger_bands', (period, deviation, shift),
+                lambda data: TechnicalIndicators.calculate_bollinger_bands(data['close'], period, deviation, shift)
             )
             
             df['middle_band'] = bb['middle_band']
@@ -264,8 +389,8 @@ class SignalGenerator:
                 else:  # SELL
                     confidence = min(0.9, max(0.6, upper_band_distance / 2))
                 
-                # Créer le signal
-                signal = Signal.objects.create(
+                # Créer le signal, sauf s'il existe déjà pour cette bougie
+                signal, created = SignalStore.save(Signal(
                     pair=pair,
                     strategy=strategy,
                     signal_type=signal_type,
@@ -275,9 +400,12 @@ class SignalGenerator:
                     take_profit=take_profit,
                     confidence=confidence,
                     timestamp=timezone.now(),
+                    bar_timestamp=last_row.name.to_pydatetime(),
                     expiration=timezone.now() + timedelta(days=1),
                     notes=f"Signal generated by Bollinger Bands ({period}/{deviation:.1f}) strategy"
-                )
+                ))
+                if created:
+                    signals_created.send(sender=SignalGenerator, signals=[signal])
                 
                 # Ajouter les informations du signal au résultat
                 result.update({
@@ -310,13 +438,14 @@ class SignalGenerator:
         """
         try:
             # Récupérer les données de prix
-            df = SignalGenerator.get_price_data(pair_symbol, limit=period * 3)
+            df = IndicatorCache.get_price_data(pair_symbol, '1h', limit=period * 3)
             if df is None or len(df) < period + 5:
                 return None
             
             # Calculer le Williams %R
-            df['williams_r'] = TechnicalIndicators.calculate_williams_r(
-                df['high'], df['low'], df['close'], period
+            df['williams_r'] = IndicatorCache.get_indicator(
+                pair_symbol, '1h', 'williams_r', (period,),
+                lambda data: TechnicalIndicators.calculate_williams_r(data['high'], data['low'], data['close'], period)
             )
             
             # Générer les signaux
@@ -358,8 +487,9 @@ class SignalGenerator:
                 pair = CurrencyPair.objects.get(symbol=pair_symbol)
                 
                 # Calculer les niveaux de stop loss et take profit basés sur l'ATR
-                atr = TechnicalIndicators.calculate_atr(
-                    df['high'], df['low'], df['close'], period=14
+                atr = IndicatorCache.get_indicator(
+                    pair_symbol, '1h', 'atr', (14,),
+                    lambda data: TechnicalIndicators.calculate_atr(data['high'], data['low'], data['close'], period=14)
                 ).iloc[-1]
                 
                 if signal_type == 'BUY':
@@ -377,8 +507,8 @@ class SignalGenerator:
                     # Plus le Williams %R est haut (au-dessus du niveau de surachat), plus la confiance est élevée
                     confidence = min(0.9, max(0.6, abs((last_row['williams_r'] - overbought) / 20)))
                 
-                # Créer le signal
-                signal = Signal.objects.create(
+                # Créer le signal, sauf s'il existe déjà pour cette bougie
+                signal, created = SignalStore.save(Signal(
                     pair=pair,
                     strategy=strategy,
                     signal_type=signal_type,
@@ -388,9 +518,12 @@ class SignalGenerator:
                     take_profit=take_profit,
                     confidence=confidence,
                     timestamp=timezone.now(),
+                    bar_timestamp=last_row.name.to_pydatetime(),
                     expiration=timezone.now() + timedelta(days=1),
                     notes=f"Signal generated by Williams %R ({period}) strategy with value {last_row['williams_r']:.2f}"
-                )
+                ))
+                if created:
+                    signals_created.send(sender=SignalGenerator, signals=[signal])
                 
                 # Ajouter les informations du signal au résultat
                 result.update({
@@ -426,13 +559,16 @@ class SignalGenerator:
         try:
             # Récupérer les données de prix
             min_periods = max(k_period, d_period) + slowing + 10  # Pour s'assurer d'avoir assez de données
-            df = SignalGenerator.get_price_data(pair_symbol, limit=min_periods * 2)
+            df = IndicatorCache.get_price_data(pair_symbol, '1h', limit=min_periods * 2)
             if df is None or len(df) < min_periods:
                 return None
             
             # Calculer l'oscillateur stochastique
-            stoch = TechnicalIndicators.calculate_stochastic(
-                df['high'], df['low'], df['close'], k_period, d_period, slowing
+            stoch = IndicatorCache.get_indicator(
+                pair_symbol, '1h', 'stochastic', (k_period, d_period, slowing),
+                lambda data: TechnicalIndicators.calculate_stochastic(
+                    data['high'], data['low'], data['close'], k_period, d_period, slowing
+                )
             )
             
             df['k'] = stoch['k']
@@ -483,8 +619,9 @@ class SignalGenerator:
                 pair = CurrencyPair.objects.get(symbol=pair_symbol)
                 
                 # Calculer les niveaux de stop loss et take profit basés sur l'ATR
-                atr = TechnicalIndicators.calculate_atr(
-                    df['high'], df['low'], df['close'], period=14
+                atr = IndicatorCache.get_indicator(
+                    pair_symbol, '1h', 'atr', (14,),
+                    lambda data: TechnicalIndicators.calculate_atr(data['high'], data['low'], data['close'], period=14)
                 ).iloc[-1]
                 
                 if signal_type == 'BUY':
@@ -506,8 +643,8 @@ class SignalGenerator:
                     d_distance = max(0, last_row['d'] - overbought) / (100 - overbought)
                     confidence = min(0.9, max(0.6, (k_distance + d_distance) / 2 + 0.6))
                 
-                # Créer le signal
-                signal = Signal.objects.create(
+                # Créer le signal, sauf s'il existe déjà pour cette bougie
+                signal, created = SignalStore.save(Signal(
                     pair=pair,
                     strategy=strategy,
                     signal_type=signal_type,
@@ -517,9 +654,12 @@ class SignalGenerator:
                     take_profit=take_profit,
                     confidence=confidence,
                     timestamp=timezone.now(),
+                    bar_timestamp=SignalStore.get_signal_bar(df, 1 if signal_type == 'BUY' else -1, lookback=3),
                     expiration=timezone.now() + timedelta(days=1),
                     notes=f"Signal generated by Stochastic Oscillator strategy with %K={last_row['k']:.2f} and %D={last_row['d']:.2f}"
-                )
+                ))
+                if created:
+                    signals_created.send(sender=SignalGenerator, signals=[signal])
                 
                 # Ajouter les informations du signal au résultat
                 result.update({
@@ -560,43 +700,48 @@ class SignalGenerator:
         """
         try:
             # Définir les paramètres des indicateurs selon les spécifications
-            bb_period = 27
-            bb_deviation = 2.7
-            bb_shift = 0
+            bb_period = COMBINED_STRATEGY_PARAMS['bb_period']
+            bb_deviation = COMBINED_STRATEGY_PARAMS['bb_deviation']
+            bb_shift = COMBINED_STRATEGY_PARAMS['bb_shift']
             
-            williams_period = 75
-            williams_oversold = -80
-            williams_overbought = -20
+            williams_period = COMBINED_STRATEGY_PARAMS['williams_period']
+            williams_oversold = COMBINED_STRATEGY_PARAMS['williams_oversold']
+            williams_overbought = COMBINED_STRATEGY_PARAMS['williams_overbought']
             
-            stoch_k_period = 40
-            stoch_d_period = 20
-            stoch_slowing = 15
-            stoch_oversold = 20
-            stoch_overbought = 80
+            stoch_k_period = COMBINED_STRATEGY_PARAMS['stoch_k_period']
+            stoch_d_period = COMBINED_STRATEGY_PARAMS['stoch_d_period']
+            stoch_slowing = COMBINED_STRATEGY_PARAMS['stoch_slowing']
+            stoch_oversold = COMBINED_STRATEGY_PARAMS['stoch_oversold']
+            stoch_overbought = COMBINED_STRATEGY_PARAMS['stoch_overbought']
             
             # Récupérer suffisamment de données historiques pour calculer tous les indicateurs
             min_periods = max(bb_period, williams_period, stoch_k_period + stoch_d_period + stoch_slowing) + 20
-            df = SignalGenerator.get_price_data(pair_symbol, timeframe=timeframe, limit=min_periods)
+            df = IndicatorCache.get_price_data(pair_symbol, timeframe, limit=min_periods)
             
             if df is None or len(df) < min_periods:
                 return None
             
             # Calculer les bandes de Bollinger
-            bb = TechnicalIndicators.calculate_bollinger_bands(
-                df['close'], bb_period, bb_deviation, bb_shift
+            bb = IndicatorCache.get_indicator(
+                pair_symbol, timeframe, 'bollinger_bands', (bb_period, bb_deviation, bb_shift),
+                lambda data: TechnicalIndicators.calculate_bollinger_bands(data['close'], bb_period, bb_deviation, bb_shift)
             )
             df['bb_middle'] = bb['middle_band']
             df['bb_upper'] = bb['upper_band']
             df['bb_lower'] = bb['lower_band']
             
             # Calculer le Williams %R
-            df['williams_r'] = TechnicalIndicators.calculate_williams_r(
-                df['high'], df['low'], df['close'], williams_period
+            df['williams_r'] = IndicatorCache.get_indicator(
+                pair_symbol, timeframe, 'williams_r', (williams_period,),
+                lambda data: TechnicalIndicators.calculate_williams_r(data['high'], data['low'], data['close'], williams_period)
             )
             
             # Calculer le Stochastique
-            stoch = TechnicalIndicators.calculate_stochastic(
-                df['high'], df['low'], df['close'], stoch_k_period, stoch_d_period, stoch_slowing
+            stoch = IndicatorCache.get_indicator(
+                pair_symbol, timeframe, 'stochastic', (stoch_k_period, stoch_d_period, stoch_slowing),
+                lambda data: TechnicalIndicators.calculate_stochastic(
+                    data['high'], data['low'], data['close'], stoch_k_period, stoch_d_period, stoch_slowing
+                )
             )
             df['stoch_k'] = stoch['k']
             df['stoch_d'] = stoch['d']
@@ -673,8 +818,9 @@ class SignalGenerator:
                 pair = CurrencyPair.objects.get(symbol=pair_symbol)
                 
                 # Calculer les niveaux de stop loss et take profit
-                atr = TechnicalIndicators.calculate_atr(
-                    df['high'], df['low'], df['close'], period=14
+                atr = IndicatorCache.get_indicator(
+                    pair_symbol, timeframe, 'atr', (14,),
+                    lambda data: TechnicalIndicators.calculate_atr(data['high'], data['low'], data['close'], period=14)
                 ).iloc[-1]
                 
                 if signal_type == 'BUY':
@@ -713,8 +859,8 @@ class SignalGenerator:
                     # Moyenne pondérée des facteurs
                     confidence = min(0.95, max(0.7, (bb_factor * 0.4 + williams_factor * 0.3 + stoch_factor * 0.3)))
                 
-                # Créer le signal
-                signal = Signal.objects.create(
+                # Créer le signal, sauf s'il existe déjà pour cette bougie
+                signal, created = SignalStore.save(Signal(
                     pair=pair,
                     strategy=strategy,
                     signal_type=signal_type,
@@ -724,9 +870,12 @@ class SignalGenerator:
                     take_profit=take_profit,
                     confidence=confidence,
                     timestamp=timezone.now(),
+                    bar_timestamp=SignalStore.get_signal_bar(df, 1 if signal_type == 'BUY' else -1, lookback=5),
                     expiration=timezone.now() + timedelta(days=1),
                     notes=f"Signal generated by Combined BB-Williams-Stoch Strategy: BB ({last_row['close']:.4f} vs {last_row['bb_lower']:.4f}/{last_row['bb_upper']:.4f}), Williams %R ({last_row['williams_r']:.2f}), Stoch %K/D ({last_row['stoch_k']:.2f}/{last_row['stoch_d']:.2f})"
-                )
+                ))
+                if created:
+                    signals_created.send(sender=SignalGenerator, signals=[signal])
                 
                 # Ajouter les informations du signal au résultat
                 result.update({
@@ -4,3 +4,19 @@ from django.apps import AppConfig
 class SignalsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'signals'
+
+    def ready(self):
+        from market_data.events import price_data_updated
+        from .analysis import IndicatorCache
+        from .board import SignalBoard
+        from .events import signals_created
+        from .triggers import SignalTrigger
+
+        # Invalider le cache des indicateurs dès que de nouvelles bougies arrivent
+        price_data_updated.connect(IndicatorCache.on_price_data_updated, dispatch_uid='signals.indicator_cache')
+
+        # Réévaluer les stratégies des paires qui reçoivent de nouvelles bougies
+        price_data_updated.connect(SignalTrigger.on_price_data_updated, dispatch_uid='signals.trigger')
+
+        # Tenir à jour le tableau des signaux courants
+        signals_created.connect(SignalBoard.on_signals_created, dispatch_uid='signals.signal_board')
@@ -0,0 +1,500 @@
+# signals/backtest.py
+import numpy as np
+import pandas as pd
+from market_data.models import CurrencyPair, PriceData
+from market_data.aggregation import PriceAggregator
+from market_data.archive import PriceArchive
+from market_data.columnar import PriceReader
+from signals.models import Strategy, BacktestResult
+from .analysis import COMBINED_STRATEGY_PARAMS
+from . import kernels
+
+# Motifs de sortie d'une position
+EXIT_END, EXIT_STOP, EXIT_TARGET = 0, 1, 2
+EXIT_REASONS = {EXIT_END: 'end', EXIT_STOP: 'stop_loss', EXIT_TARGET: 'take_profit'}
+
+# Nombre maximal de cellules (entrées × horizon) évaluées à la fois lors de la recherche des sorties
+EXIT_SEARCH_CELLS = 4000000
+
+# Nombre maximal de trades détaillés conservés dans result_data
+MAX_STORED_TRADES = 500
+
+# Plafond du profit factor lorsqu'aucun trade n'est perdant
+PROFIT_FACTOR_CAP = 100.0
+
+def _crosses(k, d):
+    """Croisements de %K au-dessus (haut) et en dessous (bas) de %D"""
+    k_prev, d_prev = kernels.shift(k), kernels.shift(d)
+    with np.errstate(invalid='ignore'):
+        return (k > d) & (k_prev <= d_prev), (k < d) & (k_prev >= d_prev)
+
+def bollinger_bands_signals(high, low, close, period=27, deviation=2.7, shift=0):
+    """
+    Conditions de SignalGenerator.generate_bollinger_bands_signals sur tout l'historique
+    
+    Returns:
+        tuple: (signal 1/-1/0, stop loss, take profit) par bougie
+    """
+    middle, upper, lower = kernels.bollinger_bands(close, period, deviation, shift)
+    with np.errstate(invalid='ignore'):
+        signal = np.where(close >= upper, -1, np.where(close <= lower, 1, 0))
+    stop_loss = np.where(signal > 0, close * 0.985, close * 1.015)
+    return signal, stop_loss, middle
+
+def williams_r_signals(high, low, close, period=75, overbought=-20, oversold=-80):
+    """
+    Conditions de SignalGenerator.generate_williams_r_signals sur tout l'historique
+    
+    Returns:
+        tuple: (signal 1/-1/0, stop loss, take profit) par bougie
+    """
+    williams_r = kernels.williams_r(high, low, close, period)
+    with np.errstate(invalid='ignore'):
+        signal = np.where(williams_r >= overbought, -1, np.where(williams_r <= oversold, 1, 0))
+    atr = kernels.atr(high, low, close)
+    return signal, close - signal * atr * 1.5, close + signal * atr * 2.5
+
+def stochastic_signals(high, low, close, k_period=40, d_period=20, slowing=15, overbought=80, oversold=20):
+    """
+    Conditions de SignalGenerator.generate_stochastic_signals sur tout l'historique
+    
+    Returns:
+        tuple: (signal 1/-1/0, stop loss, take profit) par bougie
+    """
+    k, d = kernels.stochastic(high, low, close, k_period, d_period, slowing)
+    crosses_up, crosses_down = _crosses(k, d)
+    with np.errstate(invalid='ignore'):
+        buy = (k < oversold) & (d < oversold) & crosses_up
+        sell = (k > overbought) & (d > overbought) & crosses_down
+    signal = np.where(sell, -1, np.where(buy, 1, 0))
+    atr = kernels.atr(high, low, close)
+    return signal, close - signal * atr * 2, close + signal * atr * 3
+
+def combined_strategy_signals(high, low, close, bb_period=27, bb_deviation=2.7, bb_shift=0,
+                              williams_period=75, williams_oversold=-80, williams_overbought=-20,
+                              stoch_k_period=40, stoch_d_period=20, stoch_slowing=15,
+                              stoch_oversold=20, stoch_overbought=80):
+    """
+    Conditions de SignalGenerator.generate_combined_strategy_signals sur tout l'historique
+    
+    Returns:
+        tuple: (signal 1/-1/0, stop loss, take profit) par bougie
+    """
+    middle, upper, lower = kernels.bollinger_bands(close, bb_period, bb_deviation, bb_shift)
+    extrema = kernels.rolling_extrema(high, low, [williams_period, stoch_k_period])
+    williams_r = kernels.williams_r(high, low, close, williams_period, extrema)
+    k, d = kernels.stochastic(high, low, close, stoch_k_period, stoch_d_period, stoch_slowing, extrema)
+    crosses_up, crosses_down = _crosses(k, d)
+    
+    with np.errstate(invalid='ignore'):
+        buy = (
+            (low <= lower) &
+            (williams_r < williams_oversold) &
+            crosses_up &
+            (k < stoch_oversold) &
+            (d < stoch_oversold)
+        )
+        sell = (
+            (high >= upper) &
+            (williams_r > williams_overbought) &
+            crosses_down &
+            (k > stoch_overbought) &
+            (d > stoch_overbought)
+        )
+    
+    signal = np.where(sell, -1, np.where(buy, 1, 0))
+    atr = kernels.atr(high, low, close)
+    return signal, close - signal * atr * 2, close + signal * atr * 3
+
+# Stratégies rejouables : fonction de signaux, paramètres par défaut et nom de la Strategy
+BACKTEST_STRATEGIES = {
+    'bollinger_bands': {
+        'function': bollinger_bands_signals,
+        'params': {'period': 27, 'deviation': 2.7, 'shift': 0},
+        'name': "Bollinger Bands ({period}/{deviation:.1f})",
+        'description': "Bollinger Bands strategy with period {period}, deviation {deviation}, and shift {shift}",
+    },
+    'williams_r': {
+        'function': williams_r_signals,
+        'params': {'period': 75, 'overbought': -20, 'oversold': -80},
+        'name': "Williams %R ({period})",
+        'description': "Williams %R strategy with period {period}, overbought level {overbought}, and oversold level {oversold}",
+    },
+    'stochastic': {
+        'function': stochastic_signals,
+        'params': {'k_period': 40, 'd_period': 20, 'slowing': 15, 'overbought': 80, 'oversold': 20},
+        'name': "Stochastic ({k_period}/{d_period}/{slowing})",
+        'description': "Stochastic Oscillator strategy with K period {k_period}, D period {d_period}, and slowing {slowing}",
+    },
+    'combined': {
+        'function': combined_strategy_signals,
+        'params': COMBINED_STRATEGY_PARAMS,
+        'name': "Combined BB-Williams-Stoch Strategy",
+        'description': "Combined strategy using Bollinger Bands, Williams %R, and Stochastic Oscillator",
+    },
+}
+
+def find_exits(high, low, close, entries, direction, stop_loss, take_profit):
+    """
+    Recherche vectorisée de la première bougie touchant le stop loss ou le take profit
+    
+    Pour chaque entrée, les bougies suivantes sont examinées par blocs d'horizon
+    croissant (matrice entrées × horizon) ; seules les entrées non résolues
+    passent au bloc suivant. Si les deux niveaux sont touchés sur la même bougie,
+    le stop loss est retenu (hypothèse prudente).
+    
+    Args:
+        high, low, close (np.ndarray): Prix par bougie
+        entries (np.ndarray): Indices des bougies d'entrée (triés)
+        direction (np.ndarray): 1 pour un achat, -1 pour une vente, par entrée
+        stop_loss, take_profit (np.ndarray): Niveaux par entrée
+    
+    Returns:
+        tuple: (indice de sortie, prix de sortie, motif de sortie) par entrée
+    """
+    n = len(close)
+    exit_index = np.full(len(entries), n - 1, dtype=np.int64)
+    exit_price = np.full(len(entries), close[-1])
+    exit_reason = np.full(len(entries), EXIT_END, dtype=np.int8)
+    
+    pending = np.arange(len(entries))
+    start, horizon = 1, 64
+    
+    while pending.size and start < n:
+        offsets = np.arange(start, min(start + horizon, n))
+        rows = max(1, EXIT_SEARCH_CELLS // len(offsets))
+        unresolved = []
+        
+        for chunk_start in range(0, pending.size, rows):
+            chunk = pending[chunk_start:chunk_start + rows]
+            positions = entries[chunk, np.newaxis] + offsets
+            valid = positions < n
+            positions = np.minimum(positions, n - 1)
+            
+            is_long = direction[chunk, np.newaxis] > 0
+            stop = stop_loss[chunk, np.newaxis]
+            target = take_profit[chunk, np.newaxis]
+            bar_high, bar_low = high[positions], low[positions]
+            
+            hit_stop = valid & np.where(is_long, bar_low <= stop, bar_high >= stop)
+            hit_target = valid & np.where(is_long, bar_high >= target, bar_low <= target)
+            hit = hit_stop | hit_target
+            
+            resolved = hit.any(axis=1)
+            first = hit.argmax(axis=1)
+            
+            done = chunk[resolved]
+            first = first[resolved]
+            stopped = hit_stop[resolved, first]
+            exit_index[done] = positions[resolved, first]
+            exit_price[done] = np.where(stopped, stop_loss[done], take_profit[done])
+            exit_reason[done] = np.where(stopped, EXIT_STOP, EXIT_TARGET)
+            
+            unresolved.append(chunk[~resolved])
+        
+        pending = np.concatenate(unresolved)
+        start += len(offsets)
+        horizon *= 4
+    
+    return exit_index, exit_price, exit_reason
+
+def simulate_trades(high, low, close, signal, stop_loss, take_profit):
+    """
+    Simule les trades d'une stratégie (une seule position ouverte à la fois)
+    
+    L'entrée se fait à la clôture de la bougie du signal, la sortie au niveau de
+    stop loss ou de take profit, ou à la dernière clôture si aucun n'est atteint.
+    
+    Args:
+        high, low, close (np.ndarray): Prix par bougie
+        signal (np.ndarray): 1 (achat), -1 (vente) ou 0 par bougie
+        stop_loss, take_profit (np.ndarray): Niveaux par bougie
+    
+    Returns:
+        dict: Tableaux par trade 'entry_index', 'exit_index', 'direction',
+              'entry_price', 'exit_price', 'exit_reason', 'returns'
+    """
+    with np.errstate(invalid='ignore'):
+        candidates = (signal != 0) & np.isfinite(stop_loss) & np.isfinite(take_profit)
+    candidates[-1] = False
+    entries = np.flatnonzero(candidates)
+    
+    direction = signal[entries].astype(np.float64)
+    exit_index, exit_price, exit_reason = find_exits(
+        high, low, close, entries, direction, stop_loss[entries], take_profit[entries]
+    )
+    
+    # Enchaîner les positions : la suivante ne s'ouvre qu'une fois la précédente fermée
+    taken = []
+    k = 0
+    while k < len(entries):
+        taken.append(k)
+        k = int(np.searchsorted(entries, exit_index[k], side='left'))
+    taken = np.array(taken, dtype=np.int64)
+    
+    entry_index = entries[taken]
+    entry_price = close[entry_index]
+    direction = direction[taken]
+    exit_price = exit_price[taken]
+    
+    return {
+        'entry_index': entry_index,
+        'exit_index': exit_index[taken],
+        'direction': direction,
+        'entry_price': entry_price,
+        'exit_price': exit_price,
+        'exit_reason': exit_reason[taken],
+        'returns': direction * (exit_price - entry_price) / entry_price,
+    }
+
+def compute_metrics(returns, years):
+    """
+    Calcule les statistiques de performance à partir des rendements par trade
+    
+    Args:
+        returns (np.ndarray): Rendement de chaque trade (fraction du prix d'entrée)
+        years (float): Durée de la période testée en années (annualisation)
+    
+    Returns:
+        dict: total_trades, winning_trades, losing_trades, win_rate (%), profit_factor,
+              max_drawdown (%), sharpe_ratio, sortino_ratio, net_return (%)
+    """
+    total = len(returns)
+    wins = returns[returns > 0]
+    losses = returns[returns < 0]
+    
+    gross_profit = wins.sum()
+    gross_loss = -losses.sum()
+    if gross_loss > 0:
+        profit_factor = min(gross_profit / gross_loss, PROFIT_FACTOR_CAP)
+    else:
+        profit_factor = PROFIT_FACTOR_CAP if gross_profit > 0 else 0.0
+    
+    # Courbe de capital composée trade après trade
+    equity = np.cumprod(np.concatenate([[1.0], 1 + returns]))
+    drawdown = 1 - equity / np.maximum.accumulate(equity)
+    
+    sharpe_ratio = sortino_ratio = None
+    if total > 1 and years > 0:
+        scale = np.sqrt(total / years)
+        std = returns.std(ddof=1)
+        downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2))
+        if std > 0:
+            sharpe_ratio = float(returns.mean() / std * scale)
+        if downside > 0:
+            sortino_ratio = float(returns.mean() / downside * scale)
+    
+    return {
+        'total_trades': total,
+        'winning_trades': len(wins),
+        'losing_trades': len(losses),
+        'win_rate': float(len(wins) / total * 100) if total else 0.0,
+        'profit_factor': float(profit_factor),
+        'max_drawdown': float(drawdown.max() * 100),
+        'sharpe_ratio': sharpe_ratio,
+        'sortino_ratio': sortino_ratio,
+        'net_return': float((equity[-1] - 1) * 100),
+    }
+
+class BacktestEngine:
+    """Rejoue les stratégies sur l'historique complet des prix et enregistre les BacktestResult"""
+    
+    @staticmethod
+    def load_history(pair, timeframe='1h', start_date=None, end_date=None):
+        """
+        Charge l'historique d'une paire (archive Parquet comprise) sous forme de tableaux NumPy
+        
+        Args:
+            pair (CurrencyPair): Paire de devises
+            timeframe (str): Timeframe des données
+            start_date (datetime, optional): Début de la période
+            end_date (datetime, optional): Fin de la période
+        
+        Returns:
+            dict: 'timestamp' (pd.DatetimeIndex), 'high', 'low', 'close' (np.ndarray)
+        """
+        queryset = PriceAggregator.get_bar_queryset(pair, timeframe)
+        
+        if queryset.model is PriceData:
+            # Historique complet : archive Parquet puis lignes récentes de la base
+            frame = PriceArchive.load_frame(pair, timeframe, start_date, end_date)
+            if frame.empty:
+                return None
+            return {
+                'timestamp': pd.DatetimeIndex(frame['timestamp']),
+                'high': frame['high'].to_numpy(dtype=np.float64),
+                'low': frame['low'].to_numpy(dtype=np.float64),
+                'close': frame['close'].to_numpy(dtype=np.float64),
+            }
+        
+        if start_date:
+            queryset = queryset.filter(timestamp__gte=start_date)
+        if end_date:
+            queryset = queryset.filter(timestamp__lte=end_date)
+        
+        arrays = PriceReader.read_arrays(queryset, columns=['high', 'low', 'close'])
+        if not len(arrays['timestamp']):
+            return None
+        
+        return {
+            'timestamp': PriceReader.to_index(arrays['timestamp']),
+            'high': arrays['high'],
+            'low': arrays['low'],
+            'close': arrays['close'],
+        }
+    
+    @staticmethod
+    def get_params(strategy, params=None):
+        """Paramètres par défaut de la stratégie, complétés par `params`"""
+        return {**BACKTEST_STRATEGIES[strategy]['params'], **(params or {})}
+    
+    @staticmethod
+    def get_years(data):
+        """Durée de l'historique en années (annualisation des ratios)"""
+        return (data['timestamp'][-1] - data['timestamp'][0]) / pd.Timedelta(days=365.25)
+    
+    @staticmethod
+    def evaluate(data, strategy, params=None):
+        """
+        Backteste une stratégie sur des tableaux de prix déjà chargés (sans accès à la base)
+        
+        Args:
+            data (dict): Historique retourné par load_history
+            strategy (str): Clé de BACKTEST_STRATEGIES
+            params (dict, optional): Paramètres remplaçant ceux par défaut
+        
+        Returns:
+            tuple: (statistiques, trades)
+        """
+        params = BacktestEngine.get_params(strategy, params)
+        signal, stop_loss, take_profit = BACKTEST_STRATEGIES[strategy]['function'](
+            data['high'], data['low'], data['close'], **params
+        )
+        trades = simulate_trades(data['high'], data['low'], data['close'], signal, stop_loss, take_profit)
+        
+        metrics = compute_metrics(trades['returns'], BacktestEngine.get_years(data))
+        return metrics, trades
+    
+    @staticmethod
+    def get_strategy(strategy, params=None):
+        """Récupère ou crée la Strategy portant le même nom que celle du générateur de signaux"""
+        params = BacktestEngine.get_params(strategy, params)
+        definition = BACKTEST_STRATEGIES[strategy]
+        strategy_obj, _ = Strategy.objects.get_or_create(
+            name=definition['name'].format(**params),
+            defaults={'description': definition['description'].format(**params)}
+        )
+        return strategy_obj
+    
+    @staticmethod
+    def format_trades(data, trades, limit=MAX_STORED_TRADES):
+        """Liste JSON des derniers trades pour result_data"""
+        timestamps = data['timestamp']
+        return [
+            {
+                'entry_time': timestamps[entry_index].isoformat(),
+                'exit_time': timestamps[exit_index].isoformat(),
+                'type': 'BUY' if direction > 0 else 'SELL',
+                'entry_price': entry_price,
+                'exit_price': exit_price,
+                'exit_reason': EXIT_REASONS[exit_reason],
+                'return': trade_return,
+            }
+            for entry_index, exit_index, direction, entry_price, exit_price, exit_reason, trade_return in zip(
+                trades['entry_index'][-limit:].tolist(),
+                trades['exit_index'][-limit:].tolist(),
+                trades['direction'][-limit:].tolist(),
+                trades['entry_price'][-limit:].tolist(),
+                trades['exit_price'][-limit:].tolist(),
+                trades['exit_reason'][-limit:].tolist(),
+                trades['returns'][-limit:].tolist(),
+            )
+        ]
+    
+    @staticmethod
+    def save_result(pair, strategy, timeframe, data, params, metrics, trades, extra_data=None):
+        """
+        Enregistre un BacktestResult à partir des statistiques et des trades calculés
+        
+        Args:
+            pair (CurrencyPair): Paire de devises
+            strategy (str): Clé de BACKTEST_STRATEGIES
+            timeframe (str): Intervalle de temps
+            data (dict): Historique retourné par load_history
+            params (dict): Paramètres complets de la stratégie
+            metrics (dict): Statistiques retournées par compute_metrics
+            trades (dict): Trades retournés par simulate_trades
+            extra_data (dict, optional): Données supplémentaires pour result_data
+        
+        Returns:
+            BacktestResult: Résultat enregistré
+        """
+        return BacktestResult.objects.create(
+            strategy=BacktestEngine.get_strategy(strategy, params),
+            pair=pair,
+            timeframe=timeframe,
+            start_date=data['timestamp'][0].to_pydatetime(),
+            end_date=data['timestamp'][-1].to_pydatetime(),
+            total_trades=metrics['total_trades'],
+            winning_trades=metrics['winning_trades'],
+            losing_trades=metrics['losing_trades'],
+            win_rate=metrics['win_rate'],
+            profit_factor=metrics['profit_factor'],
+            max_drawdown=metrics['max_drawdown'],
+            sharpe_ratio=metrics['sharpe_ratio'],
+            sortino_ratio=metrics['sortino_ratio'],
+            result_data={
+                'strategy_key': strategy,
+                'parameters': params,
+                'bars': len(data['close']),
+                'net_return': metrics['net_return'],
+                'trades': BacktestEngine.format_trades(data, trades),
+                **(extra_data or {}),
+            }
+        )
+    
+    @staticmethod
+    def run(pair_symbol, strategy='combined', timeframe='1h', params=None, start_date=None, end_date=None, save=True):
+        """
+        Backteste une stratégie sur l'historique d'une paire et enregistre le résultat
+        
+        Args:
+            pair_symbol (str): Symbole de la paire
+            strategy (str): 'bollinger_bands', 'williams_r', 'stochastic' ou 'combined'
+            timeframe (str): Intervalle de temps
+            params (dict, optional): Paramètres remplaçant ceux par défaut
+            start_date (datetime, optional): Début de la période
+            end_date (datetime, optional): Fin de la période
+            save (bool): Enregistrer un BacktestResult
+        
+        Returns:
+            dict: Statistiques du backtest (et 'backtest_id' si enregistré), ou None
+        """
+        try:
+            pair = CurrencyPair.objects.get(symbol=pair_symbol)
+            data = BacktestEngine.load_history(pair, timeframe, start_date, end_date)
+            if data is None or len(data['close']) < 2:
+                return None
+            
+            params = BacktestEngine.get_params(strategy, params)
+            metrics, trades = BacktestEngine.evaluate(data, strategy, params)
+            
+            result = {
+                'pair': pair_symbol,
+                'strategy': strategy,
+                'timeframe': timeframe,
+                'start_date': data['timestamp'][0].to_pydatetime(),
+                'end_date': data['timestamp'][-1].to_pydatetime(),
+                'bars': len(data['close']),
+                **metrics,
+            }
+            
+            if save:
+                backtest = BacktestEngine.save_result(pair, strategy, timeframe, data, params, metrics, trades)
+                result['backtest_id'] = backtest.id
+            
+            return result
+        
+        except Exception as e:
+            print(f"Error running {strategy} backtest for {pair_symbol}: {str(e)}")
+            return None
@@ -0,0 +1,250 @@
+# signals/batch.py
+import numpy as np
+from datetime import timedelta
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+from market_data.models import CurrencyPair, PriceData, PriceAggregate
+from market_data.aggregation import AGGREGATED_TIMEFRAMES
+from signals.models import Strategy, Signal
+from .analysis import COMBINED_STRATEGY_PARAMS
+from .events import signals_created
+from .kernels import combined_indicators, shift
+from .store import SignalStore
+
+class BatchSignalGenerator:
+    """Évalue la stratégie combinée pour toutes les paires à la fois sur un panel NumPy"""
+    
+    @staticmethod
+    def load_panel(pairs, timeframe='1h', bars=200):
+        """
+        Charge les `bars` dernières bougies de chaque paire en une seule requête
+        
+        Args:
+            pairs (list): Paires de devises (CurrencyPair)
+            timeframe (str): Timeframe des données
+            bars (int): Nombre de bougies par paire
+        
+        Returns:
+            dict: Tableaux 2-D (paires × temps) 'high', 'low', 'close' et 'timestamp', alignés
+                  à droite (la dernière colonne est la dernière bougie), 'counts' par paire
+        """
+        pair_ids = [pair.id for pair in pairs]
+        row_index = {pair_id: i for i, pair_id in enumerate(pair_ids)}
+        
+        def fetch(model, ids):
+            return list(model.objects.filter(
+                pair_id__in=ids, timeframe=timeframe
+            ).annotate(
+                row_number=Window(RowNumber(), partition_by=[F('pair_id')], order_by=F('timestamp').desc())
+            ).filter(row_number__lte=bars).values_list(
+                'pair_id', 'row_number', 'high_price', 'low_price', 'close_price', 'timestamp'
+            ))
+        
+        rows = fetch(PriceData, pair_ids)
+        
+        # Paires sans données natives : utiliser les bougies agrégées
+        if timeframe in AGGREGATED_TIMEFRAMES:
+            missing = set(pair_ids) - {row[0] for row in rows}
+            if missing:
+                rows += fetch(PriceAggregate, list(missing))
+        
+        panel = {
+            'high': np.full((len(pair_ids), bars), np.nan),
+            'low': np.full((len(pair_ids), bars), np.nan),
+            'close': np.full((len(pair_ids), bars), np.nan),
+            'timestamp': np.full((len(pair_ids), bars), None, dtype=object),
+            'counts': np.zeros(len(pair_ids), dtype=np.int64),
+        }
+        
+        if not rows:
+            return panel
+        
+        pair_column, row_numbers, high, low, close, timestamps = zip(*rows)
+        pair_rows = np.array([row_index[pair_id] for pair_id in pair_column])
+        columns = bars - np.array(row_numbers, dtype=np.int64)
+        
+        panel['high'][pair_rows, columns] = np.array(high, dtype=np.float64)
+        panel['low'][pair_rows, columns] = np.array(low, dtype=np.float64)
+        panel['close'][pair_rows, columns] = np.array(close, dtype=np.float64)
+        panel['timestamp'][pair_rows, columns] = timestamps
+        panel['counts'] = np.bincount(pair_rows, minlength=len(pair_ids))
+        
+        return panel
+    
+    @staticmethod
+    def generate_combined_strategy_signals(timeframe='1h', pair_symbols=None):
+        """
+        Version par lot de SignalGenerator.generate_combined_strategy_signals
+        
+        Les indicateurs (Bollinger, Williams %R, Stochastique, ATR) sont calculés
+        pour toutes les paires en une passe sur un panel 2-D, et les signaux
+        générés sont insérés avec un seul bulk_create.
+        
+        Args:
+            timeframe (str): Intervalle de temps
+            pair_symbols (list, optional): Symboles à évaluer. Si None, toutes les paires actives.
+        
+        Returns:
+            dict: Résultat par symbole (même format que la version unitaire, ou None)
+        """
+        params = COMBINED_STRATEGY_PARAMS
+        
+        pairs = CurrencyPair.objects.filter(is_active=True)
+        if pair_symbols is not None:
+            pairs = CurrencyPair.objects.filter(symbol__in=pair_symbols)
+        pairs = list(pairs)
+        
+        if not pairs:
+            return {}
+        
+        min_periods = max(
+            params['bb_period'],
+            params['williams_period'],
+            params['stoch_k_period'] + params['stoch_d_period'] + params['stoch_slowing']
+        ) + 20
+        
+        panel = BatchSignalGenerator.load_panel(pairs, timeframe, min_periods)
+        high, low, close = panel['high'], panel['low'], panel['close']
+        
+        # Bollinger, Williams %R, Stochastique et ATR (14), extrema partagés
+        indicators = combined_indicators(high, low, close, **params)
+        bb_middle, bb_upper, bb_lower = indicators['bb_middle'], indicators['bb_upper'], indicators['bb_lower']
+        williams_r = indicators['williams_r']
+        stoch_k, stoch_d = indicators['stoch_k'], indicators['stoch_d']
+        atr = indicators['atr']
+        
+        # Croisements du Stochastique
+        with np.errstate(invalid='ignore'):
+            k_prev, d_prev = shift(stoch_k), shift(stoch_d)
+            crosses_up = (stoch_k > stoch_d) & (k_prev <= d_prev)
+            crosses_down = (stoch_k < stoch_d) & (k_prev >= d_prev)
+            
+            buy_condition = (
+                (low <= bb_lower) &
+                (williams_r < params['williams_oversold']) &
+                crosses_up &
+                (stoch_k < params['stoch_oversold']) &
+                (stoch_d < params['stoch_oversold'])
+            )
+            sell_condition = (
+                (high >= bb_upper) &
+                (williams_r > params['williams_overbought']) &
+                crosses_down &
+                (stoch_k > params['stoch_overbought']) &
+                (stoch_d > params['stoch_overbought'])
+            )
+        
+        # Signaux récents (5 dernières périodes), l'achat étant prioritaire
+        has_buy = buy_condition[:, -5:].any(axis=1)
+        has_sell = ~has_buy & sell_condition[:, -5:].any(axis=1)
+        
+        # Bougie déclenchante : la plus récente des 5 dernières portant le signal retenu
+        recent = np.where(has_buy[:, None], buy_condition[:, -5:], sell_condition[:, -5:])
+        signal_column = close.shape[1] - 1 - np.argmax(recent[:, ::-1], axis=1)
+        
+        # Dernières valeurs par paire
+        last = {
+            'close': close[:, -1],
+            'bb_upper': bb_upper[:, -1],
+            'bb_middle': bb_middle[:, -1],
+            'bb_lower': bb_lower[:, -1],
+            'williams_r': williams_r[:, -1],
+            'stoch_k': stoch_k[:, -1],
+            'stoch_d': stoch_d[:, -1],
+            'atr': atr[:, -1],
+        }
+        
+        # Stop loss / take profit et confiance, vectorisés
+        direction = np.where(has_buy, 1.0, -1.0)
+        stop_loss = last['close'] - direction * last['atr'] * 2
+        take_profit = last['close'] + direction * last['atr'] * 3
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bb_factor = np.where(
+                has_buy,
+                (last['bb_lower'] - last['close']) / last['atr'],
+                (last['close'] - last['bb_upper']) / last['atr']
+            )
+        williams_factor = np.where(
+            has_buy,
+            (params['williams_oversold'] - last['williams_r']) / 20,
+            (last['williams_r'] - params['williams_overbought']) / 20
+        )
+        stoch_factor = np.where(
+            has_buy,
+            (params['stoch_oversold'] - last['stoch_k']) / 20,
+            (last['stoch_k'] - params['stoch_overbought']) / 20
+        )
+        factors = [np.clip(np.nan_to_num(factor, nan=0.0), 0, 1.0) for factor in (bb_factor, williams_factor, stoch_factor)]
+        confidence = np.clip(factors[0] * 0.4 + factors[1] * 0.3 + factors[2] * 0.3, 0.7, 0.95)
+        
+        strategy = None
+        now = timezone.now()
+        results = {}
+        new_signals = []
+        
+        for i, pair in enumerate(pairs):
+            if panel['counts'][i] < min_periods:
+                results[pair.symbol] = None
+                continue
+            
+            signal_type = 'BUY' if has_buy[i] else 'SELL' if has_sell[i] else None
+            
+            results[pair.symbol] = {
+                'pair': pair.symbol,
+                'timeframe': timeframe,
+                'close_price': float(last['close'][i]),
+                'bb_upper': float(last['bb_upper'][i]),
+                'bb_middle': float(last['bb_middle'][i]),
+                'bb_lower': float(last['bb_lower'][i]),
+                'williams_r': float(last['williams_r'][i]),
+                'stoch_k': float(last['stoch_k'][i]),
+                'stoch_d': float(last['stoch_d'][i]),
+                'signal_type': signal_type if signal_type else 'HOLD',
+                'entry_price': float(last['close'][i]),
+            }
+            
+            if not signal_type:
+                continue
+            
+            if strategy is None:
+                strategy, _ = Strategy.objects.get_or_create(
+                    name="Combined BB-Williams-Stoch Strategy",
+                    defaults={'description': "Combined strategy using Bollinger Bands, Williams %R, and Stochastic Oscillator"}
+                )
+            
+            new_signals.append(Signal(
+                pair=pair,
+                strategy=strategy,
+                signal_type=signal_type,
+                timeframe=timeframe,
+                entry_price=float(last['close'][i]),
+                stop_loss=float(stop_loss[i]),
+                take_profit=float(take_profit[i]),
+                confidence=float(confidence[i]),
+                timestamp=now,
+                bar_timestamp=panel['timestamp'][i, signal_column[i]],
+                expiration=now + timedelta(days=1),
+                notes=(
+                    f"Signal generated by Combined BB-Williams-Stoch Strategy: "
+                    f"BB ({last['close'][i]:.4f} vs {last['bb_lower'][i]:.4f}/{last['bb_upper'][i]:.4f}), "
+                    f"Williams %R ({last['williams_r'][i]:.2f}), "
+                    f"Stoch %K/D ({last['stoch_k'][i]:.2f}/{last['stoch_d'][i]:.2f})"
+                )
+            ))
+        
+        # Les signaux déjà enregistrés pour la même bougie sont ignorés
+        new_signals = SignalStore.save_many(new_signals)
+        if new_signals:
+            signals_created.send(sender=BatchSignalGenerator, signals=new_signals)
+            for signal in new_signals:
+                results[signal.pair.symbol].update({
+                    'signal_id': signal.id,
+                    'stop_loss': float(signal.stop_loss),
+                    'take_profit': float(signal.take_profit),
+                    'confidence': signal.confidence,
+                    'timestamp': signal.timestamp
+                })
+        
+        return results
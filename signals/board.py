@@ -0,0 +1,125 @@
+# signals/board.py
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from .models import Signal, LatestSignal
+
+class SignalBoard:
+    """
+    Tableau des signaux courants : le plus récent par (stratégie, paire, timeframe)
+    
+    La table LatestSignal est tenue à jour à chaque création de signaux ; la
+    lecture du tableau ne dépend donc que du nombre de combinaisons, pas de la
+    longueur de l'historique.
+    """
+    
+    @staticmethod
+    def get_latest(queryset, filtered=False):
+        """
+        Restreint des signaux aux derniers de chaque (stratégie, paire, timeframe)
+        
+        Sans filtre hors clé, le résultat est lu dans LatestSignal. Avec des
+        filtres sur d'autres champs (type, dates), ou si un signal du tableau
+        a été désactivé, c'est le dernier signal correspondant aux filtres qui
+        est renvoyé pour chaque combinaison (DISTINCT ON / ROW_NUMBER sur le
+        queryset filtré).
+        
+        Args:
+            queryset (QuerySet): Signaux actifs, éventuellement filtrés
+            filtered (bool): Le queryset porte des filtres autres que stratégie, paire et timeframe
+        
+        Returns:
+            QuerySet: Signaux triés par paire, stratégie et timeframe
+        """
+        if filtered or LatestSignal.objects.filter(signal__is_active=False).exists():
+            latest_ids = list(SignalBoard.get_latest_ids(queryset))
+        else:
+            latest_ids = LatestSignal.objects.values('signal_id')
+        return queryset.filter(id__in=latest_ids).order_by('pair_id', 'strategy_id', 'timeframe')
+    
+    @staticmethod
+    def record_signals(signals):
+        """
+        Met à jour le tableau avec des signaux nouvellement créés
+        
+        Une ligne n'est remplacée que par un signal au moins aussi récent, ce
+        qui reste correct avec plusieurs workers en parallèle.
+        
+        Args:
+            signals (list): Instances de Signal enregistrées
+        """
+        newest = {}
+        for signal in signals:
+            key = (signal.strategy_id, signal.pair_id, signal.timeframe)
+            if key not in newest or (signal.timestamp, signal.id) > (newest[key].timestamp, newest[key].id):
+                newest[key] = signal
+        
+        for (strategy_id, pair_id, timeframe), signal in newest.items():
+            lookup = {'strategy_id': strategy_id, 'pair_id': pair_id, 'timeframe': timeframe}
+            rows = LatestSignal.objects.filter(**lookup)
+            if rows.filter(timestamp__lte=signal.timestamp).update(signal_id=signal.id, timestamp=signal.timestamp):
+                continue
+            if rows.exists():
+                continue  # Un signal plus récent est déjà affiché
+            try:
+                with transaction.atomic():
+                    LatestSignal.objects.create(**lookup, signal_id=signal.id, timestamp=signal.timestamp)
+            except IntegrityError:
+                # Ligne créée entre-temps par un autre worker
+                rows.filter(timestamp__lte=signal.timestamp).update(signal_id=signal.id, timestamp=signal.timestamp)
+    
+    @staticmethod
+    def get_latest_ids(queryset=None):
+        """
+        Identifiants du dernier signal de chaque combinaison, calculés sur tout l'historique
+        
+        DISTINCT ON sous PostgreSQL, fenêtre ROW_NUMBER() ailleurs.
+        
+        Args:
+            queryset (QuerySet, optional): Signaux considérés (défaut : tous)
+        
+        Returns:
+            QuerySet: Identifiants
+        """
+        if queryset is None:
+            queryset = Signal.objects.all()
+        
+        if connections[queryset.db].features.can_distinct_on_fields:
+            return queryset.order_by('strategy_id', 'pair_id', 'timeframe', '-timestamp', '-id').distinct(
+                'strategy_id', 'pair_id', 'timeframe'
+            ).values_list('id', flat=True)
+        
+        ranked = queryset.order_by().annotate(rank=Window(
+            RowNumber(),
+            partition_by=[F('strategy_id'), F('pair_id'), F('timeframe')],
+            order_by=[F('timestamp').desc(), F('id').desc()]
+        ))
+        return ranked.filter(rank=1).values_list('id', flat=True)
+    
+    @staticmethod
+    def rebuild(signal_model=Signal, board_model=LatestSignal):
+        """
+        Reconstruit le tableau à partir de tout l'historique des signaux
+        
+        Args:
+            signal_model (Model, optional): Modèle des signaux (modèle historique dans une migration)
+            board_model (Model, optional): Modèle du tableau
+        
+        Returns:
+            int: Nombre de combinaisons
+        """
+        latest = signal_model.objects.filter(id__in=list(SignalBoard.get_latest_ids(signal_model.objects.all()))).values_list(
+            'id', 'strategy_id', 'pair_id', 'timeframe', 'timestamp'
+        )
+        with transaction.atomic(using=latest.db):
+            board_model.objects.all().delete()
+            board_model.objects.bulk_create([
+                board_model(signal_id=signal_id, strategy_id=strategy_id, pair_id=pair_id, timeframe=timeframe, timestamp=timestamp)
+                for signal_id, strategy_id, pair_id, timeframe, timestamp in latest
+            ])
+        return board_model.objects.count()
+    
+    @staticmethod
+    def on_signals_created(sender, signals, **kwargs):
+        """Récepteur de signals.events.signals_created"""
+        SignalBoard.record_signals(signals)
@@ -0,0 +1,6 @@
+# signals/events.py
+from django.dispatch import Signal
+
+# Émis après l'enregistrement de nouveaux signaux de trading
+# Arguments : signals (liste d'instances de signals.models.Signal)
+signals_created = Signal()
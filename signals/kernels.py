@@ -0,0 +1,234 @@
+# signals/kernels.py
+"""
+Noyaux NumPy des indicateurs techniques (tableaux float64 bruts)
+
+Chaque noyau travaille sur le dernier axe d'un tableau 1-D (une série) ou
+2-D (une ligne par paire) et renvoie NaN tant que la fenêtre n'est pas
+complète ou qu'elle contient un NaN, comme rolling() de pandas.
+
+- Moyenne et écart-type glissants : sommes cumulées (centrées, par blocs
+  pour borner l'erreur d'arrondi), moyenne et écart-type en une passe.
+- Extrema glissants : algorithme de van Herk / Gil-Werman (maxima cumulés
+  par blocs de la taille de la fenêtre), en O(n) quelle que soit la fenêtre.
+  Un extremum sur p bougies se déduit de celui sur q >= p/2 bougies : le
+  Williams %R et le stochastique partagent les mêmes extrema.
+- True range : np.fmax, sans DataFrame intermédiaire.
+"""
+import numpy as np
+from django.conf import settings
+
+# Colonnes traitées par bloc de sommes cumulées (borne l'erreur d'arrondi et la mémoire temporaire)
+KERNEL_CHUNK_SIZE = getattr(settings, 'SIGNALS_KERNEL_CHUNK_SIZE', 16384)
+
+def _as_panel(values):
+    """Vue 2-D float64 d'une série ou d'un panel"""
+    return np.atleast_2d(np.asarray(values, dtype=np.float64))
+
+def _like(result, values):
+    """Rend au résultat la dimension de l'entrée"""
+    return result[0] if np.ndim(values) == 1 else result
+
+def shift(values, periods=1):
+    """Décale vers la droite (dernier axe) en complétant par des NaN"""
+    panel = _as_panel(values)
+    result = np.full(panel.shape, np.nan)
+    if periods < panel.shape[1]:
+        result[:, periods:] = panel[:, :panel.shape[1] - periods]
+    return _like(result, values)
+
+def rolling_moments(values, window, std=True):
+    """
+    Moyenne et écart-type glissants (ddof=1) en une passe de sommes cumulées
+    
+    Les sommes sont calculées par blocs de KERNEL_CHUNK_SIZE colonnes, sur des
+    valeurs centrées sur la moyenne du bloc : l'erreur d'arrondi reste de
+    l'ordre de celle de pandas, même sur des millions de bougies.
+    
+    Args:
+        values (np.ndarray): Série (1-D) ou panel (2-D)
+        window (int): Taille de la fenêtre
+        std (bool): Calculer aussi l'écart-type
+    
+    Returns:
+        tuple: (moyenne, écart-type ou None)
+    """
+    panel = _as_panel(values)
+    rows, length = panel.shape
+    mean = np.full(panel.shape, np.nan)
+    deviation = np.full(panel.shape, np.nan) if std else None
+    has_missing = bool(np.isnan(panel).any())
+    
+    for start in range(window - 1, length, KERNEL_CHUNK_SIZE):
+        stop = min(start + KERNEL_CHUNK_SIZE, length)
+        block = panel[:, start - window + 1:stop]
+        
+        # Centrer sur la moyenne du bloc (valeurs manquantes comptées pour zéro)
+        if has_missing:
+            missing = np.isnan(block)
+            counts = block.shape[1] - missing.sum(axis=1)
+            reference = np.where(missing, 0.0, block).sum(axis=1) / np.maximum(counts, 1)
+            centered = np.where(missing, 0.0, block - reference[:, np.newaxis])
+        else:
+            reference = block.mean(axis=1)
+            centered = block - reference[:, np.newaxis]
+        
+        sums = np.empty((rows, block.shape[1] + 1))
+        sums[:, 0] = 0.0
+        np.cumsum(centered, axis=1, out=sums[:, 1:])
+        window_sums = sums[:, window:] - sums[:, :-window]
+        
+        output = mean[:, start:stop]
+        np.divide(window_sums, window, out=output)
+        output += reference[:, np.newaxis]
+        
+        if std and window > 1:
+            np.multiply(centered, centered, out=centered)
+            np.cumsum(centered, axis=1, out=sums[:, 1:])
+            variance = sums[:, window:] - sums[:, :-window]
+            variance -= window_sums * window_sums / window
+            variance /= window - 1
+            np.sqrt(np.maximum(variance, 0.0, out=variance), out=deviation[:, start:stop])
+        
+        if has_missing:
+            # Fenêtres contenant une valeur manquante : NaN
+            gaps = np.zeros((rows, block.shape[1] + 1), dtype=np.int64)
+            np.cumsum(missing, axis=1, out=gaps[:, 1:])
+            incomplete = (gaps[:, window:] - gaps[:, :-window]) > 0
+            output[incomplete] = np.nan
+            if std and window > 1:
+                deviation[:, start:stop][incomplete] = np.nan
+    
+    return _like(mean, values), (_like(deviation, values) if std else None)
+
+def rolling_mean(values, window):
+    """Moyenne glissante"""
+    return rolling_moments(values, window, std=False)[0]
+
+def rolling_std(values, window):
+    """Écart-type glissant (ddof=1)"""
+    return rolling_moments(values, window)[1]
+
+def _rolling_extremum(values, window, accumulate, neutral):
+    """Extremum glissant de van Herk / Gil-Werman (accumulate: np.maximum ou np.minimum)"""
+    panel = _as_panel(values)
+    rows, length = panel.shape
+    result = np.full(panel.shape, np.nan)
+    if length < window:
+        return _like(result, values)
+    
+    # Blocs de `window` colonnes (le dernier complété par l'élément neutre)
+    blocks = -(-length // window)
+    padded = np.full((rows, blocks * window), neutral)
+    padded[:, :length] = panel
+    padded = padded.reshape(rows, blocks, window)
+    
+    # Extremum depuis le début du bloc (prefix) et jusqu'à la fin du bloc (suffix)
+    prefix = accumulate.accumulate(padded, axis=2).reshape(rows, blocks * window)
+    suffix = np.empty_like(padded)
+    accumulate.accumulate(padded[:, :, ::-1], axis=2, out=suffix[:, :, ::-1])
+    suffix = suffix.reshape(rows, blocks * window)
+    
+    # La fenêtre [i, i + window - 1] couvre la fin d'un bloc et le début du suivant
+    result[:, window - 1:] = accumulate(suffix[:, :length - window + 1], prefix[:, window - 1:length])
+    return _like(result, values)
+
+def rolling_max(values, window):
+    """Maximum glissant"""
+    return _rolling_extremum(values, window, np.maximum, -np.inf)
+
+def rolling_min(values, window):
+    """Minimum glissant"""
+    return _rolling_extremum(values, window, np.minimum, np.inf)
+
+def rolling_extrema(high, low, periods):
+    """
+    Plus hauts et plus bas glissants pour plusieurs périodes, calculés une seule fois
+    
+    La plus petite période est calculée directement ; une période p se déduit
+    d'une période q calculée si q >= p/2 (deux fenêtres de q bougies décalées
+    de p - q couvrent la fenêtre de p bougies).
+    
+    Args:
+        high (np.ndarray): Plus hauts
+        low (np.ndarray): Plus bas
+        periods (iterable): Périodes demandées
+    
+    Returns:
+        dict: {période: (plus haut, plus bas)}
+    """
+    extrema = {}
+    for period in sorted(set(periods)):
+        base = max((q for q in extrema if 2 * q >= period), default=None)
+        if base is None:
+            extrema[period] = (rolling_max(high, period), rolling_min(low, period))
+            continue
+        highest, lowest = extrema[base]
+        offset = period - base
+        extrema[period] = (
+            np.maximum(highest, shift(highest, offset)) if offset else highest,
+            np.minimum(lowest, shift(lowest, offset)) if offset else lowest,
+        )
+    return extrema
+
+def true_range(high, low, close):
+    """True range (la première bougie vaut high - low)"""
+    previous_close = shift(close)
+    return np.fmax(high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)))
+
+def atr(high, low, close, period=14):
+    """ATR (moyenne simple du true range)"""
+    return rolling_mean(true_range(high, low, close), period)
+
+def bollinger_bands(close, period=27, deviation=2.7, shift_periods=0):
+    """
+    Bandes de Bollinger (moyenne et écart-type en une seule passe)
+    
+    Returns:
+        tuple: (moyenne, bande haute, bande basse)
+    """
+    middle, std = rolling_moments(close, period)
+    if shift_periods:
+        middle = shift(middle, shift_periods)
+    return middle, middle + std * deviation, middle - std * deviation
+
+def williams_r(high, low, close, period=75, extrema=None):
+    """Williams %R (extrema éventuellement partagés, voir rolling_extrema)"""
+    highest_high, lowest_low = (extrema or rolling_extrema(high, low, [period]))[period]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return -100 * (highest_high - close) / (highest_high - lowest_low)
+
+def stochastic(high, low, close, k_period=40, d_period=20, slowing=15, extrema=None):
+    """
+    Oscillateur stochastique (extrema éventuellement partagés)
+    
+    Returns:
+        tuple: (%K ralenti, %D)
+    """
+    highest_high, lowest_low = (extrema or rolling_extrema(high, low, [k_period]))[k_period]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k_fast = 100 * (close - lowest_low) / (highest_high - lowest_low)
+    k_slow = rolling_mean(k_fast, slowing)
+    return k_slow, rolling_mean(k_slow, d_period)
+
+def combined_indicators(high, low, close, bb_period=27, bb_deviation=2.7, bb_shift=0,
+                        williams_period=75, stoch_k_period=40, stoch_d_period=20, stoch_slowing=15, atr_period=14, **kwargs):
+    """
+    Tous les indicateurs de la stratégie combinée, extrema calculés une seule fois
+    
+    Les paramètres sont ceux de COMBINED_STRATEGY_PARAMS (les seuils sont ignorés).
+    
+    Returns:
+        dict: bb_middle, bb_upper, bb_lower, williams_r, stoch_k, stoch_d, atr
+    """
+    extrema = rolling_extrema(high, low, [williams_period, stoch_k_period])
+    bb_middle, bb_upper, bb_lower = bollinger_bands(close, bb_period, bb_deviation, bb_shift)
+    stoch_k, stoch_d = stochastic(high, low, close, stoch_k_period, stoch_d_period, stoch_slowing, extrema)
+    return {
+        'bb_middle': bb_middle,
+        'bb_upper': bb_upper,
+        'bb_lower': bb_lower,
+        'williams_r': williams_r(high, low, close, williams_period, extrema),
+        'stoch_k': stoch_k,
+        'stoch_d': stoch_d,
+        'atr': atr(high, low, close, atr_period),
+    }
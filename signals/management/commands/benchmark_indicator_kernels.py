@@ -0,0 +1,126 @@
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand
+from signals import kernels
+from signals.analysis import COMBINED_STRATEGY_PARAMS
+
+class Command(BaseCommand):
+    help = 'Compare the NumPy indicator kernels with the pandas TechnicalIndicators implementations on synthetic bars'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=str, default='1000,100000,10000000', help='Comma-separated bar counts (default: 1000,100000,10000000)')
+        parser.add_argument('--repeat', type=int, default=3, help='Timed runs per measurement; the best is kept (default: 3)')
+    
+    def handle(self, *args, **options):
+        params = COMBINED_STRATEGY_PARAMS
+        
+        for size in [int(size) for size in options['sizes'].split(',')]:
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{size} bars'))
+            high, low, close = self.create_bars(size)
+            series = pd.Series(high), pd.Series(low), pd.Series(close)
+            
+            cases = [
+                ('Bollinger bands',
+                 lambda: self.pandas_bollinger_bands(series[2], params['bb_period'], params['bb_deviation'], params['bb_shift']),
+                 lambda: kernels.bollinger_bands(close, params['bb_period'], params['bb_deviation'], params['bb_shift'])),
+                ('Williams %R',
+                 lambda: [self.pandas_williams_r(*series, params['williams_period'])],
+                 lambda: [kernels.williams_r(high, low, close, params['williams_period'])]),
+                ('Stochastic',
+                 lambda: self.pandas_stochastic(*series, params['stoch_k_period'], params['stoch_d_period'], params['stoch_slowing']),
+                 lambda: kernels.stochastic(high, low, close, params['stoch_k_period'], params['stoch_d_period'], params['stoch_slowing'])),
+                ('ATR',
+                 lambda: [self.pandas_atr(*series)],
+                 lambda: [kernels.atr(high, low, close)]),
+                ('Combined strategy',
+                 lambda: self.pandas_combined(series, params),
+                 lambda: list(kernels.combined_indicators(high, low, close, **params).values())),
+            ]
+            
+            for label, legacy, kernel in cases:
+                # Les deux implémentations doivent donner les mêmes valeurs (aux arrondis près)
+                difference = self.compare(legacy(), kernel())
+                if difference is None:
+                    self.stdout.write(self.style.ERROR(f'  {label}: kernel output differs from pandas'))
+                    return
+                
+                self.stdout.write(f'  {label} (max difference {difference:.1e})')
+                pandas_result = self.measure('pandas', size, options['repeat'], legacy)
+                kernel_result = self.measure('kernels', size, options['repeat'], kernel)
+                self.stdout.write(self.style.SUCCESS(
+                    f'    Kernels: {pandas_result[0] / kernel_result[0]:.1f}x faster, '
+                    f'{pandas_result[1] / kernel_result[1]:.1f}x less peak memory'
+                ))
+    
+    def create_bars(self, size):
+        rng = np.random.default_rng(0)
+        close = 1.1 + np.cumsum(rng.normal(0, 0.001, size))
+        high = close + rng.random(size) * 0.002
+        low = close - rng.random(size) * 0.002
+        return high, low, close
+    
+    def compare(self, expected, actual):
+        """Écart maximal entre les deux implémentations, ou None si elles diffèrent"""
+        difference = 0.0
+        for expected_values, actual_values in zip(expected, actual):
+            expected_values = np.asarray(expected_values, dtype=np.float64)
+            # L'écart-type en ligne de pandas dérive sur des millions de bougies (~1e-6 en relatif)
+            if not np.allclose(expected_values, actual_values, rtol=1e-5, atol=1e-9, equal_nan=True):
+                return None
+            both = ~np.isnan(expected_values) & ~np.isnan(actual_values)
+            if both.any():
+                difference = max(difference, np.abs(expected_values[both] - actual_values[both]).max())
+        return difference
+    
+    def measure(self, label, rows, repeat, function):
+        elapsed = min(self.time_call(function) for _ in range(repeat))
+        
+        tracemalloc.start()
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        
+        self.stdout.write(f'    {label:<10} {elapsed * 1000:>10.2f} ms {rows / elapsed:>14,.0f} bars/s {peak / 1e6:>9.2f} MB peak allocated')
+        return elapsed, peak
+    
+    def time_call(self, function):
+        started = time.perf_counter()
+        function()
+        return time.perf_counter() - started
+    
+    # Implémentations pandas de TechnicalIndicators (référence)
+    
+    def pandas_bollinger_bands(self, prices, period, deviation, shift):
+        middle_band = prices.rolling(window=period).mean()
+        if shift:
+            middle_band = middle_band.shift(shift)
+        std = prices.rolling(window=period).std()
+        return [middle_band, middle_band + std * deviation, middle_band - std * deviation]
+    
+    def pandas_williams_r(self, high, low, close, period):
+        highest_high = high.rolling(window=period).max()
+        lowest_low = low.rolling(window=period).min()
+        return -100 * (highest_high - close) / (highest_high - lowest_low)
+    
+    def pandas_stochastic(self, high, low, close, k_period, d_period, slowing):
+        lowest_low = low.rolling(window=k_period).min()
+        highest_high = high.rolling(window=k_period).max()
+        k_fast = 100 * (close - lowest_low) / (highest_high - lowest_low)
+        k_slow = k_fast.rolling(window=slowing).mean()
+        return [k_slow, k_slow.rolling(window=d_period).mean()]
+    
+    def pandas_atr(self, high, low, close, period=14):
+        previous_close = close.shift(1)
+        tr = pd.DataFrame({'tr1': high - low, 'tr2': (high - previous_close).abs(), 'tr3': (low - previous_close).abs()}).max(axis=1)
+        return tr.rolling(window=period).mean()
+    
+    def pandas_combined(self, series, params):
+        high, low, close = series
+        return (
+            self.pandas_bollinger_bands(close, params['bb_period'], params['bb_deviation'], params['bb_shift']) +
+            [self.pandas_williams_r(high, low, close, params['williams_period'])] +
+            self.pandas_stochastic(high, low, close, params['stoch_k_period'], params['stoch_d_period'], params['stoch_slowing']) +
+            [self.pandas_atr(high, low, close)]
+        )
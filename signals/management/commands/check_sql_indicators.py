@@ -0,0 +1,91 @@
+import time
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from market_data.aggregation import PriceAggregator
+from market_data.columnar import PriceReader, EPOCH_VENDORS
+from market_data.models import CurrencyPair
+from signals.analysis import TechnicalIndicators, COMBINED_STRATEGY_PARAMS
+from signals.sql_indicators import SQLIndicatorEngine, INDICATOR_COLUMNS
+
+class Command(BaseCommand):
+    help = 'Compare the SQL window-function indicators with the pandas TechnicalIndicators on the same bars'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--pair', type=str, help='Pair symbol (default: every active pair)')
+        parser.add_argument('--timeframe', type=str, default='1h', help='Timeframe (default: 1h)')
+        parser.add_argument('--last', type=int, default=100, help='Most recent bars compared (default: 100)')
+        parser.add_argument('--history', type=int, default=1000, help='Bars read for the pandas reference (default: 1000)')
+    
+    def handle(self, *args, **options):
+        pairs = CurrencyPair.objects.filter(is_active=True)
+        if options['pair']:
+            pairs = CurrencyPair.objects.filter(symbol=options['pair'])
+            if not pairs.exists():
+                raise CommandError(f"Unknown pair {options['pair']}")
+        
+        failures = 0
+        for pair in pairs:
+            failures += not self.check_pair(pair, options['timeframe'], options['last'], max(options['history'], options['last']))
+        
+        if failures:
+            raise CommandError(f'{failures} pair(s) differ between SQL and pandas')
+    
+    def check_pair(self, pair, timeframe, last, history):
+        params = COMBINED_STRATEGY_PARAMS
+        queryset = PriceAggregator.get_bar_queryset(pair, timeframe)
+        vendor = connections[queryset.db].vendor
+        if vendor not in EPOCH_VENDORS:
+            raise CommandError(f'SQL indicators are not available on {vendor}')
+        
+        started = time.perf_counter()
+        actual = SQLIndicatorEngine.compute(pair, timeframe, last, params)
+        sql_elapsed = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        data = PriceReader.read_frame(queryset, limit=history)
+        expected = self.compute_pandas(data, params).iloc[-last:]
+        pandas_elapsed = time.perf_counter() - started
+        
+        self.stdout.write(self.style.MIGRATE_HEADING(f'{pair.symbol} {timeframe}'))
+        if len(data) == 0:
+            self.stdout.write('  No bars')
+            return True
+        
+        if not actual.index.equals(expected.index):
+            self.stdout.write(self.style.ERROR(f'  Bars differ: {len(actual)} from SQL, {len(expected)} from pandas'))
+            return False
+        
+        matched = True
+        for column in INDICATOR_COLUMNS:
+            sql_values = actual[column].to_numpy()
+            pandas_values = expected[column].to_numpy()
+            same = np.allclose(sql_values, pandas_values, rtol=1e-9, atol=1e-9, equal_nan=True)
+            both = ~np.isnan(sql_values) & ~np.isnan(pandas_values)
+            difference = np.abs(sql_values[both] - pandas_values[both]).max() if both.any() else 0.0
+            style = self.style.SUCCESS if same else self.style.ERROR
+            self.stdout.write(style(f'  {column:<12} {"ok" if same else "DIFFERS":<8} max difference {difference:.3e}'))
+            matched = matched and same
+        
+        self.stdout.write(
+            f'  SQL: {len(actual)} rows transferred in {sql_elapsed * 1000:.2f} ms; '
+            f'pandas: {len(data)} rows transferred and computed in {pandas_elapsed * 1000:.2f} ms'
+        )
+        return matched
+    
+    def compute_pandas(self, data, params):
+        """Indicateurs de référence, comme dans ChartDataService.compute_indicators"""
+        bb = TechnicalIndicators.calculate_bollinger_bands(data['close'], params['bb_period'], params['bb_deviation'], params['bb_shift'])
+        stoch = TechnicalIndicators.calculate_stochastic(
+            data['high'], data['low'], data['close'],
+            params['stoch_k_period'], params['stoch_d_period'], params['stoch_slowing']
+        )
+        return pd.DataFrame({
+            'bb_middle': bb['middle_band'],
+            'bb_upper': bb['upper_band'],
+            'bb_lower': bb['lower_band'],
+            'williams_r': TechnicalIndicators.calculate_williams_r(data['high'], data['low'], data['close'], params['williams_period']),
+            'stoch_k': stoch['k'],
+            'stoch_d': stoch['d'],
+        })
@@ -0,0 +1,32 @@
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from signals.board import SignalBoard
+from signals.store import SignalStore
+
+class Command(BaseCommand):
+    help = 'Attach existing signals to their bar and delete duplicates (one signal per pair/strategy/timeframe/bar/direction)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Count duplicates without deleting them')
+    
+    def handle(self, *args, **options):
+        counts = SignalStore.deduplicate(dry_run=options['dry_run'])
+        
+        if options['dry_run']:
+            self.stdout.write(
+                f"{counts['signals']} signals examined: {counts['deleted']} duplicates would be deleted, "
+                f"{counts['realigned']} signals would be attached to their bar"
+            )
+            return
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"{counts['signals']} signals examined: {counts['deleted']} duplicates deleted, "
+            f"{counts['realigned']} signals attached to their bar"
+        ))
+        
+        if counts['deleted']:
+            # Le tableau des signaux courants et les compteurs référencent les doublons supprimés
+            SignalBoard.rebuild()
+            if apps.is_installed('dashboard'):
+                call_command('rebuild_statistics', stdout=self.stdout)
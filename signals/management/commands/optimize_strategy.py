@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand, CommandError
+from signals.backtest import BACKTEST_STRATEGIES
+from signals.optimizer import StrategyOptimizer, OBJECTIVES
+
+class Command(BaseCommand):
+    help = 'Search the best strategy parameters over the stored price history (grid or random search)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('pair', help='Currency pair symbol')
+        parser.add_argument('--strategy', default='combined', choices=list(BACKTEST_STRATEGIES),
+                            help='Strategy to optimize (default: combined)')
+        parser.add_argument('--timeframe', default='1h', help='Timeframe of the price data (default: 1h)')
+        parser.add_argument('--method', default='random', choices=['grid', 'random'], help='Search method (default: random)')
+        parser.add_argument('--iterations', type=int, default=1000, help='Number of random combinations (default: 1000)')
+        parser.add_argument('--objective', default='sharpe_ratio', choices=OBJECTIVES, help='Metric to maximize (default: sharpe_ratio)')
+        parser.add_argument('--top', type=int, default=10, help='Number of best results to keep (default: 10)')
+        parser.add_argument('--min-trades', type=int, default=10, help='Minimum number of trades for a result to count (default: 10)')
+        parser.add_argument('--workers', type=int, help='Number of worker processes (default: all cores)')
+        parser.add_argument('--seed', type=int, help='Random search seed')
+        parser.add_argument('--param', action='append', default=[], metavar='NAME=V1,V2,...',
+                            help='Candidate values for a parameter, overriding the default search space')
+        parser.add_argument('--dry-run', action='store_true', help='Do not save the best result')
+    
+    def handle(self, *args, **options):
+        space = {}
+        for item in options['param']:
+            name, _, values = item.partition('=')
+            if not values:
+                raise CommandError(f'Invalid --param {item!r}, expected NAME=V1,V2,...')
+            space[name] = [float(value) if '.' in value else int(value) for value in values.split(',')]
+        
+        result = StrategyOptimizer.optimize(
+            options['pair'],
+            strategy=options['strategy'],
+            timeframe=options['timeframe'],
+            method=options['method'],
+            iterations=options['iterations'],
+            top_n=options['top'],
+            objective=options['objective'],
+            min_trades=options['min_trades'],
+            space=space,
+            seed=options['seed'],
+            max_workers=options['workers'],
+            save=not options['dry_run']
+        )
+        
+        if result is None:
+            raise CommandError(f"Optimization failed for {options['pair']}")
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['evaluated']} combinations evaluated in {result['elapsed']:.1f}s"
+        ))
+        
+        for rank, item in enumerate(result['top'], start=1):
+            metrics = item['metrics']
+            self.stdout.write(
+                f"{rank:>3}. {options['objective']}={metrics[options['objective']]:.3f} "
+                f"trades={metrics['total_trades']} win={metrics['win_rate']:.1f}% "
+                f"pf={metrics['profit_factor']:.2f} dd={metrics['max_drawdown']:.1f}% {item['parameters']}"
+            )
+        
+        if 'backtest_id' in result:
+            self.stdout.write(self.style.SUCCESS(f"Best result saved as BacktestResult #{result['backtest_id']}"))
@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from signals.board import SignalBoard
+
+class Command(BaseCommand):
+    help = 'Rebuild the latest-signal board from the full signal history'
+    
+    def handle(self, *args, **options):
+        count = SignalBoard.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Signal board rebuilt ({count} strategy/pair/timeframe combinations)'))
@@ -0,0 +1,52 @@
+from datetime import datetime, timezone
+from django.core.management.base import BaseCommand
+from market_data.models import CurrencyPair
+from signals.backtest import BacktestEngine, BACKTEST_STRATEGIES
+
+class Command(BaseCommand):
+    help = 'Backtest trading strategies over the stored price history and save BacktestResult rows'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--pair', help='Currency pair symbol (default: all active pairs)')
+        parser.add_argument('--strategy', default='all', choices=['all'] + list(BACKTEST_STRATEGIES),
+                            help='Strategy to backtest (default: all)')
+        parser.add_argument('--timeframe', default='1h', help='Timeframe of the price data (default: 1h)')
+        parser.add_argument('--start', help='Start date (YYYY-MM-DD)')
+        parser.add_argument('--end', help='End date (YYYY-MM-DD)')
+        parser.add_argument('--dry-run', action='store_true', help='Do not save the results')
+    
+    def handle(self, *args, **options):
+        if options['pair']:
+            symbols = [options['pair']]
+        else:
+            symbols = list(CurrencyPair.objects.filter(is_active=True).values_list('symbol', flat=True))
+        
+        strategies = list(BACKTEST_STRATEGIES) if options['strategy'] == 'all' else [options['strategy']]
+        start_date = self.parse_date(options['start'])
+        end_date = self.parse_date(options['end'])
+        
+        for symbol in symbols:
+            for strategy in strategies:
+                started = datetime.now()
+                result = BacktestEngine.run(
+                    symbol, strategy, options['timeframe'],
+                    start_date=start_date, end_date=end_date, save=not options['dry_run']
+                )
+                elapsed = (datetime.now() - started).total_seconds()
+                
+                if result is None:
+                    self.stdout.write(self.style.WARNING(f'{symbol} {strategy}: no data'))
+                    continue
+                
+                self.stdout.write(self.style.SUCCESS(
+                    f"{symbol} {strategy}: {result['bars']} bars, {result['total_trades']} trades, "
+                    f"win rate {result['win_rate']:.1f}%, profit factor {result['profit_factor']:.2f}, "
+                    f"max drawdown {result['max_drawdown']:.1f}%, net return {result['net_return']:.1f}% "
+                    f"({elapsed:.2f}s)"
+                ))
+    
+    @staticmethod
+    def parse_date(value):
+        if not value:
+            return None
+        return datetime.strptime(value, '%Y-%m-%d').replace(tzinfo=timezone.utc)
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.8 on 2026-10-18 10:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market_data', '0002_price_timeframe_and_aggregates'),
+        ('signals', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndicatorState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timeframe', models.CharField(choices=[('1m', '1 Minute'), ('5m', '5 Minutes'), ('15m', '15 Minutes'), ('30m', '30 Minutes'), ('1h', '1 Hour'), ('4h', '4 Hours'), ('1d', '1 Day'), ('1w', '1 Week')], max_length=5)),
+                ('indicator', models.CharField(help_text='Indicator name and parameters, e.g. bollinger_bands:27:2.7:0', max_length=100)),
+                ('last_timestamp', models.DateTimeField()),
+                ('state', models.JSONField(help_text='State after the last processed bar')),
+                ('checkpoint', models.JSONField(help_text='State before the last processed bar')),
+                ('values', models.JSONField(help_text='Indicator values for the last processed bar')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('pair', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='indicator_states', to='market_data.currencypair')),
+            ],
+            options={
+                'unique_together': {('pair', 'timeframe', 'indicator')},
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.8 on 2026-10-18 10:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market_data', '0003_currency_pair_fetch_priority'),
+        ('signals', '0002_indicator_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LatestSignal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timeframe', models.CharField(choices=[('1m', '1 Minute'), ('5m', '5 Minutes'), ('15m', '15 Minutes'), ('30m', '30 Minutes'), ('1h', '1 Hour'), ('4h', '4 Hours'), ('1d', '1 Day'), ('1w', '1 Week')], max_length=5)),
+                ('timestamp', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('pair', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='market_data.currencypair')),
+                ('signal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='signals.signal')),
+                ('strategy', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='signals.strategy')),
+            ],
+            options={
+                'unique_together': {('strategy', 'pair', 'timeframe')},
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.8 on 2026-10-18 14:05
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_bar_timestamp(apps, schema_editor):
+    # Les signaux existants ne connaissent que leur date d'émission ;
+    # la commande dedupe_signals les rattache ensuite à leur bougie
+    Signal = apps.get_model('signals', 'Signal')
+    Signal.objects.update(bar_timestamp=F('timestamp'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0003_latest_signal'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='signal',
+            name='bar_timestamp',
+            field=models.DateTimeField(help_text='Start of the bar that triggered the signal', null=True),
+        ),
+        migrations.RunPython(backfill_bar_timestamp, migrations.RunPython.noop),
+    ]
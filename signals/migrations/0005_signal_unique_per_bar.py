@@ -0,0 +1,22 @@
+# Generated by Django 5.1.8 on 2026-10-18 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0004_signal_bar_timestamp'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='signal',
+            name='bar_timestamp',
+            field=models.DateTimeField(help_text='Start of the bar that triggered the signal'),
+        ),
+        migrations.AddConstraint(
+            model_name='signal',
+            constraint=models.UniqueConstraint(fields=('pair', 'strategy', 'timeframe', 'bar_timestamp', 'signal_type'), name='unique_signal_per_bar'),
+        ),
+    ]
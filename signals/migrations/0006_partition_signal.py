@@ -0,0 +1,24 @@
+# Generated by Django 5.1.8 on 2026-10-18 18:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+from market_data.partitions import partition_table
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0005_signal_unique_per_bar'),
+    ]
+
+    operations = [
+        # Une clé étrangère ne peut pas viser une table partitionnée par sa seule colonne id
+        migrations.AlterField(
+            model_name='latestsignal',
+            name='signal',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='signals.signal'),
+        ),
+        # PostgreSQL uniquement ; bar_timestamp plutôt que timestamp, car la clé de
+        # partitionnement doit faire partie de la contrainte unique_signal_per_bar
+        migrations.RunPython(*partition_table('signals_signal', 'bar_timestamp')),
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations
+from signals.board import SignalBoard
+
+
+def populate_latest_signal(apps, schema_editor):
+    # Tableau créé vide par 0003 : le remplir à partir de l'historique des signaux
+    SignalBoard.rebuild(apps.get_model('signals', 'Signal'), apps.get_model('signals', 'LatestSignal'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signals', '0006_partition_signal'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_latest_signal, migrations.RunPython.noop),
+    ]
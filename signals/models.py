@@ -14,7 +14,12 @@ class Strategy(models.Model):
         return self.name
 
 class Signal(models.Model):
-    """Modèle pour les signaux de trading générés"""
+    """
+    Modèle pour les signaux de trading générés
+    
+    Sous PostgreSQL, la table est partitionnée par mois sur bar_timestamp :
+    la clé de partitionnement doit figurer dans unique_signal_per_bar.
+    """
     SIGNAL_TYPES = [
         ('BUY', 'Buy'),
         ('SELL', 'Sell'),
@@ -41,6 +46,7 @@ class Signal(models.Model):
     take_profit = models.DecimalField(max_digits=18, decimal_places=8, null=True, blank=True)
     confidence = models.FloatField(help_text="Confidence level from 0 to 1")
     timestamp = models.DateTimeField()
+    bar_timestamp = models.DateTimeField(help_text="Start of the bar that triggered the signal")
     expiration = models.DateTimeField(null=True, blank=True)
     notes = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
@@ -53,10 +59,33 @@ class Signal(models.Model):
             models.Index(fields=['signal_type']),
             models.Index(fields=['timestamp']),
         ]
+        constraints = [
+            # Un seul signal par bougie et par direction (voir signals.store)
+            models.UniqueConstraint(
+                fields=['pair', 'strategy', 'timeframe', 'bar_timestamp', 'signal_type'],
+                name='unique_signal_per_bar'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.pair.symbol} - {self.signal_type} - {self.timestamp}"
 
+class LatestSignal(models.Model):
+    """Dernier signal de chaque (stratégie, paire, timeframe), tenu à jour à chaque création"""
+    strategy = models.ForeignKey(Strategy, on_delete=models.CASCADE, related_name='+')
+    pair = models.ForeignKey(CurrencyPair, on_delete=models.CASCADE, related_name='+')
+    timeframe = models.CharField(max_length=5, choices=Signal.TIMEFRAMES)
+    # Pas de clé étrangère en base : la table des signaux est partitionnée sous PostgreSQL
+    signal = models.ForeignKey(Signal, on_delete=models.CASCADE, related_name='+', db_constraint=False)
+    timestamp = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ('strategy', 'pair', 'timeframe')
+    
+    def __str__(self):
+        return f"{self.strategy.name} - {self.pair.symbol} - {self.timeframe}"
+
 class BacktestResult(models.Model):
     """Modèle pour stocker les résultats des backtests de stratégies"""
     strategy = models.ForeignKey(Strategy, on_delete=models.CASCADE, related_name='backtests')
@@ -76,4 +105,21 @@ class BacktestResult(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
-        return f"{self.strategy.name} - {self.pair.symbol} - {self.start_date.date()} to {self.end_date.date()}"
\ No newline at end of file
+        return f"{self.strategy.name} - {self.pair.symbol} - {self.start_date.date()} to {self.end_date.date()}"
+
+class IndicatorState(models.Model):
+    """Modèle pour persister l'état des indicateurs incrémentaux entre deux exécutions"""
+    pair = models.ForeignKey(CurrencyPair, on_delete=models.CASCADE, related_name='indicator_states')
+    timeframe = models.CharField(max_length=5, choices=Signal.TIMEFRAMES)
+    indicator = models.CharField(max_length=100, help_text="Indicator name and parameters, e.g. bollinger_bands:27:2.7:0")
+    last_timestamp = models.DateTimeField()
+    state = models.JSONField(help_text="State after the last processed bar")
+    checkpoint = models.JSONField(help_text="State before the last processed bar")
+    values = models.JSONField(help_text="Indicator values for the last processed bar")
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ('pair', 'timeframe', 'indicator')
+    
+    def __str__(self):
+        return f"{self.indicator} - {self.pair.symbol} - {self.timeframe} - {self.last_timestamp}"
@@ -0,0 +1,284 @@
+# signals/optimizer.py
+import itertools
+import multiprocessing
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from django.conf import settings
+from market_data.models import CurrencyPair
+from .backtest import BacktestEngine, BACKTEST_STRATEGIES, simulate_trades, compute_metrics
+
+# Nombre de processus de calcul (par défaut : tous les cœurs)
+OPTIMIZER_MAX_WORKERS = getattr(settings, 'OPTIMIZER_MAX_WORKERS', None)
+
+# Espaces de recherche : valeurs candidates de chaque paramètre optimisable
+PARAMETER_SPACES = {
+    'bollinger_bands': {
+        'period': list(range(10, 61, 1)),
+        'deviation': [float(round(x, 1)) for x in np.arange(1.5, 3.6, 0.1)],
+    },
+    'williams_r': {
+        'period': list(range(10, 151, 5)),
+        'overbought': [-30, -25, -20, -15, -10],
+        'oversold': [-90, -85, -80, -75, -70],
+    },
+    'stochastic': {
+        'k_period': list(range(5, 81, 5)),
+        'd_period': list(range(3, 31, 1)),
+        'slowing': list(range(1, 21, 1)),
+        'overbought': [70, 75, 80, 85],
+        'oversold': [15, 20, 25, 30],
+    },
+    'combined': {
+        'bb_period': list(range(15, 41, 2)),
+        'bb_deviation': [float(round(x, 1)) for x in np.arange(1.8, 3.1, 0.1)],
+        'williams_period': list(range(20, 121, 5)),
+        'stoch_k_period': list(range(10, 61, 5)),
+        'stoch_d_period': list(range(5, 31, 5)),
+        'stoch_slowing': list(range(3, 19, 3)),
+    },
+}
+
+# Critères d'optimisation disponibles (toujours maximisés)
+OBJECTIVES = ['sharpe_ratio', 'sortino_ratio', 'profit_factor', 'net_return', 'win_rate']
+
+# Données partagées du processus de calcul courant (initialisées par _init_worker)
+_worker = {}
+
+def grid_parameters(space):
+    """
+    Génère toutes les combinaisons d'un espace de recherche
+    
+    Args:
+        space (dict): Valeurs candidates par paramètre
+    
+    Returns:
+        list: Dictionnaires de paramètres
+    """
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+def random_parameters(space, iterations, seed=None):
+    """
+    Tire des combinaisons distinctes au hasard dans un espace de recherche
+    
+    Args:
+        space (dict): Valeurs candidates par paramètre
+        iterations (int): Nombre de combinaisons souhaitées
+        seed (int, optional): Graine du générateur aléatoire
+    
+    Returns:
+        list: Dictionnaires de paramètres (au plus la taille de l'espace)
+    """
+    rng = np.random.default_rng(seed)
+    names = list(space)
+    size = int(np.prod([len(space[name]) for name in names]))
+    iterations = min(iterations, size)
+    
+    seen = set()
+    combinations = []
+    while len(combinations) < iterations:
+        indices = tuple(int(rng.integers(len(space[name]))) for name in names)
+        if indices in seen:
+            continue
+        seen.add(indices)
+        combinations.append({name: space[name][i] for name, i in zip(names, indices)})
+    return combinations
+
+def _init_worker(shm_name, shape, strategy, years, min_trades):
+    """Rattache le processus de calcul au bloc de mémoire partagée contenant les prix"""
+    block = shared_memory.SharedMemory(name=shm_name)
+    _worker.update({
+        'block': block,  # Conserver une référence tant que le processus vit
+        'prices': np.ndarray(shape, dtype=np.float64, buffer=block.buf),
+        'strategy': strategy,
+        'years': years,
+        'min_trades': min_trades,
+    })
+
+def _evaluate(params):
+    """
+    Backteste une combinaison de paramètres sur les prix partagés
+    
+    Returns:
+        tuple: (paramètres, statistiques)
+    """
+    high, low, close = _worker['prices']
+    definition = BACKTEST_STRATEGIES[_worker['strategy']]
+    signal, stop_loss, take_profit = definition['function'](
+        high, low, close, **{**definition['params'], **params}
+    )
+    trades = simulate_trades(high, low, close, signal, stop_loss, take_profit)
+    return params, compute_metrics(trades['returns'], _worker['years'])
+
+def _score(metrics, objective, min_trades):
+    """Valeur à maximiser ; -inf si le résultat n'est pas exploitable"""
+    value = metrics[objective]
+    if value is None or metrics['total_trades'] < min_trades:
+        return float('-inf')
+    return value
+
+class StrategyOptimizer:
+    """Recherche des meilleurs paramètres de stratégie par backtests en parallèle"""
+    
+    @staticmethod
+    def get_combinations(strategy, method='random', iterations=1000, space=None, seed=None):
+        """
+        Construit la liste des combinaisons de paramètres à évaluer
+        
+        Args:
+            strategy (str): Clé de BACKTEST_STRATEGIES
+            method (str): 'grid' (toutes les combinaisons) ou 'random'
+            iterations (int): Nombre de combinaisons pour la recherche aléatoire
+            space (dict, optional): Valeurs candidates remplaçant celles de PARAMETER_SPACES
+            seed (int, optional): Graine de la recherche aléatoire
+        
+        Returns:
+            list: Dictionnaires de paramètres
+        """
+        space = {**PARAMETER_SPACES[strategy], **(space or {})}
+        if method == 'grid':
+            return grid_parameters(space)
+        return random_parameters(space, iterations, seed)
+    
+    @staticmethod
+    def evaluate_all(data, strategy, combinations, min_trades=10, max_workers=OPTIMIZER_MAX_WORKERS):
+        """
+        Évalue toutes les combinaisons sur un pool de processus
+        
+        Les prix sont copiés une seule fois dans un bloc de mémoire partagée que
+        chaque processus lit directement ; seuls les paramètres et les
+        statistiques transitent entre processus. Dans un processus démon (worker
+        Celery prefork), qui ne peut pas créer de sous-processus, l'évaluation se
+        fait séquentiellement.
+        
+        Args:
+            data (dict): Historique retourné par BacktestEngine.load_history
+            strategy (str): Clé de BACKTEST_STRATEGIES
+            combinations (list): Dictionnaires de paramètres
+            min_trades (int): Nombre minimal de trades pour qu'un résultat soit retenu
+            max_workers (int, optional): Nombre de processus
+        
+        Returns:
+            list: Couples (paramètres, statistiques) dans l'ordre des combinaisons
+        """
+        prices = np.stack([data['high'], data['low'], data['close']])
+        years = BacktestEngine.get_years(data)
+        max_workers = max_workers or os.cpu_count() or 1
+        
+        block = shared_memory.SharedMemory(create=True, size=prices.nbytes)
+        try:
+            np.ndarray(prices.shape, dtype=np.float64, buffer=block.buf)[:] = prices
+            initargs = (block.name, prices.shape, strategy, years, min_trades)
+            
+            parallel = (
+                max_workers > 1
+                and len(combinations) > 1
+                and not multiprocessing.current_process().daemon
+                and 'fork' in multiprocessing.get_all_start_methods()
+            )
+            
+            if not parallel:
+                _init_worker(*initargs)
+                try:
+                    return [_evaluate(params) for params in combinations]
+                finally:
+                    _worker.pop('prices', None)
+                    _worker.pop('block').close()
+            
+            chunksize = max(1, len(combinations) // (max_workers * 8))
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context('fork'),
+                initializer=_init_worker,
+                initargs=initargs
+            ) as executor:
+                return list(executor.map(_evaluate, combinations, chunksize=chunksize))
+        finally:
+            block.close()
+            block.unlink()
+    
+    @staticmethod
+    def optimize(pair_symbol, strategy='combined', timeframe='1h', method='random', iterations=1000,
+                 top_n=10, objective='sharpe_ratio', min_trades=10, space=None, seed=None,
+                 start_date=None, end_date=None, max_workers=OPTIMIZER_MAX_WORKERS, save=True):
+        """
+        Optimise les paramètres d'une stratégie sur l'historique d'une paire
+        
+        Le meilleur jeu de paramètres est enregistré comme BacktestResult ; les
+        top_n meilleurs résultats sont conservés dans result_data['optimization'].
+        
+        Args:
+            pair_symbol (str): Symbole de la paire
+            strategy (str): Clé de BACKTEST_STRATEGIES
+            timeframe (str): Intervalle de temps
+            method (str): 'grid' ou 'random'
+            iterations (int): Nombre de combinaisons pour la recherche aléatoire
+            top_n (int): Nombre de meilleurs résultats conservés
+            objective (str): Statistique à maximiser (voir OBJECTIVES)
+            min_trades (int): Nombre minimal de trades pour qu'un résultat soit retenu
+            space (dict, optional): Valeurs candidates remplaçant celles de PARAMETER_SPACES
+            seed (int, optional): Graine de la recherche aléatoire
+            start_date (datetime, optional): Début de la période
+            end_date (datetime, optional): Fin de la période
+            max_workers (int, optional): Nombre de processus
+            save (bool): Enregistrer le BacktestResult
+        
+        Returns:
+            dict: Meilleurs résultats et durée de l'optimisation, ou None
+        """
+        try:
+            pair = CurrencyPair.objects.get(symbol=pair_symbol)
+            data = BacktestEngine.load_history(pair, timeframe, start_date, end_date)
+            if data is None or len(data['close']) < 2:
+                return None
+            
+            started = time.monotonic()
+            combinations = StrategyOptimizer.get_combinations(strategy, method, iterations, space, seed)
+            evaluated = StrategyOptimizer.evaluate_all(data, strategy, combinations, min_trades, max_workers)
+            elapsed = time.monotonic() - started
+            
+            ranked = sorted(
+                (item for item in evaluated if _score(item[1], objective, min_trades) > float('-inf')),
+                key=lambda item: _score(item[1], objective, min_trades),
+                reverse=True
+            )
+            top = [
+                {'parameters': BacktestEngine.get_params(strategy, params), 'metrics': metrics}
+                for params, metrics in ranked[:top_n]
+            ]
+            
+            result = {
+                'pair': pair_symbol,
+                'strategy': strategy,
+                'timeframe': timeframe,
+                'method': method,
+                'objective': objective,
+                'evaluated': len(combinations),
+                'elapsed': elapsed,
+                'top': top,
+            }
+            
+            if save and top:
+                best_params = top[0]['parameters']
+                metrics, trades = BacktestEngine.evaluate(data, strategy, best_params)
+                backtest = BacktestEngine.save_result(
+                    pair, strategy, timeframe, data, best_params, metrics, trades,
+                    extra_data={'optimization': {
+                        'method': method,
+                        'objective': objective,
+                        'min_trades': min_trades,
+                        'evaluated': len(combinations),
+                        'elapsed': elapsed,
+                        'top': top,
+                    }}
+                )
+                result['backtest_id'] = backtest.id
+            
+            return result
+        
+        except Exception as e:
+            print(f"Error optimizing {strategy} for {pair_symbol}: {str(e)}")
+            return None
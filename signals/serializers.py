@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from market_data.fast_serialization import RowSerializer
 from .models import Strategy, Signal, BacktestResult
 
 class StrategySerializer(serializers.ModelSerializer):
@@ -14,9 +15,31 @@ class SignalSerializer(serializers.ModelSerializer):
         model = Signal
         fields = ['id', 'pair', 'pair_symbol', 'strategy', 'strategy_name', 
                   'signal_type', 'timeframe', 'entry_price', 'stop_loss', 
-                  'take_profit', 'confidence', 'timestamp', 'expiration', 
+                  'take_profit', 'confidence', 'timestamp', 'bar_timestamp', 'expiration', 
                   'notes', 'is_active', 'created_at']
 
+class SignalRowSerializer(RowSerializer):
+    """Équivalent rapide de SignalSerializer pour les listes"""
+    columns = [
+        ('id', 'id', None),
+        ('pair', 'pair_id', None),
+        ('pair_symbol', 'pair__symbol', None),
+        ('strategy', 'strategy_id', None),
+        ('strategy_name', 'strategy__name', None),
+        ('signal_type', 'signal_type', None),
+        ('timeframe', 'timeframe', None),
+        ('entry_price', 'entry_price', 'decimal'),
+        ('stop_loss', 'stop_loss', 'decimal'),
+        ('take_profit', 'take_profit', 'decimal'),
+        ('confidence', 'confidence', None),
+        ('timestamp', 'timestamp', 'datetime'),
+        ('bar_timestamp', 'bar_timestamp', 'datetime'),
+        ('expiration', 'expiration', 'datetime'),
+        ('notes', 'notes', None),
+        ('is_active', 'is_active', None),
+        ('created_at', 'created_at', 'datetime'),
+    ]
+
 class BacktestResultSerializer(serializers.ModelSerializer):
     strategy_name = serializers.ReadOnlyField(source='strategy.name')
     pair_symbol = serializers.ReadOnlyField(source='pair.symbol')
@@ -0,0 +1,159 @@
+# signals/sql_indicators.py
+"""
+Calcul des indicateurs par fonctions de fenêtre SQL
+
+Les bandes de Bollinger (leur bande moyenne est la SMA), le Williams %R et
+le stochastique sont calculés par la base (AVG / STDDEV_SAMP / MAX / MIN
+OVER ROWS BETWEEN) sur les bougies d'une paire ; seules les K dernières
+lignes sont renvoyées. Une fenêtre incomplète donne NULL, comme les NaN de
+pandas. Les résultats sont identiques à ceux de TechnicalIndicators (voir
+la commande check_sql_indicators).
+
+Moteur optionnel (SIGNALS_SQL_INDICATORS), disponible sous PostgreSQL et
+SQLite (écart-type calculé à partir des sommes, faute de STDDEV_SAMP).
+"""
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import connections
+from market_data.aggregation import PriceAggregator
+from market_data.columnar import PriceReader, PRICE_COLUMNS, EPOCH_VENDORS
+from .analysis import COMBINED_STRATEGY_PARAMS
+
+# Calculer les indicateurs des graphiques dans la base plutôt qu'en pandas
+SIGNALS_SQL_INDICATORS = getattr(settings, 'SIGNALS_SQL_INDICATORS', False)
+
+INDICATOR_COLUMNS = ['bb_middle', 'bb_upper', 'bb_lower', 'williams_r', 'stoch_k', 'stoch_d']
+
+class SQLIndicatorEngine:
+    """Indicateurs de la stratégie combinée calculés par la base"""
+    
+    @staticmethod
+    def is_available(using='default'):
+        """Moteur activé et base compatible"""
+        return SIGNALS_SQL_INDICATORS and connections[using].vendor in EPOCH_VENDORS
+    
+    @staticmethod
+    def get_lookback(params=COMBINED_STRATEGY_PARAMS):
+        """Nombre de bougies nécessaires avant la première valeur complète de chaque indicateur"""
+        return max(
+            params['bb_period'] + params['bb_shift'],
+            params['williams_period'],
+            params['stoch_k_period'] + params['stoch_slowing'] + params['stoch_d_period'] - 2,
+        )
+    
+    @staticmethod
+    def build_sql(bars_sql, vendor, last, params=COMBINED_STRATEGY_PARAMS):
+        """
+        Requête des indicateurs à partir de la requête des bougies (colonnes _epoch et _<prix>)
+        
+        Args:
+            bars_sql (str): Requête des bougies, de la plus récente à la plus ancienne
+            vendor (str): Base de données ('postgresql' ou 'sqlite')
+            last (int): Nombre de lignes renvoyées
+            params (dict): Paramètres de la stratégie combinée
+        
+        Returns:
+            str: Requête SQL (mêmes paramètres que bars_sql)
+        """
+        bb_period = int(params['bb_period'])
+        bb_shift = int(params['bb_shift'])
+        deviation = float(params['bb_deviation'])
+        williams_period = int(params['williams_period'])
+        k_period = int(params['stoch_k_period'])
+        d_period = int(params['stoch_d_period'])
+        slowing = int(params['stoch_slowing'])
+        
+        def frame(period, order='epoch'):
+            return f'ORDER BY {order} ROWS BETWEEN {period - 1} PRECEDING AND CURRENT ROW'
+        
+        if vendor == 'postgresql':
+            bb_std = 'STDDEV_SAMP("_close") OVER bb'
+        else:
+            # Pas de STDDEV_SAMP fenêtré : écart-type à partir des sommes glissantes
+            bb_std = (
+                'SQRT(MAX((SUM("_close" * "_close") OVER bb'
+                ' - SUM("_close") OVER bb * SUM("_close") OVER bb / COUNT("_close") OVER bb)'
+                ' / (COUNT("_close") OVER bb - 1), 0))'
+            )
+        
+        return f"""
+            WITH bars AS ({bars_sql}),
+            windows AS (
+                SELECT "_epoch" AS epoch, "_open" AS open_price, "_high" AS high_price, "_low" AS low_price,
+                       "_close" AS close_price, "_volume" AS volume,
+                       COUNT("_close") OVER bb AS bb_count,
+                       AVG("_close") OVER bb AS bb_mean,
+                       {bb_std} AS bb_std,
+                       COUNT("_close") OVER wr AS wr_count,
+                       MAX("_high") OVER wr AS wr_high,
+                       MIN("_low") OVER wr AS wr_low,
+                       COUNT("_close") OVER sk AS sk_count,
+                       MAX("_high") OVER sk AS sk_high,
+                       MIN("_low") OVER sk AS sk_low
+                FROM bars
+                WINDOW bb AS ({frame(bb_period, '"_epoch"')}),
+                       wr AS ({frame(williams_period, '"_epoch"')}),
+                       sk AS ({frame(k_period, '"_epoch"')})
+            ),
+            fast AS (
+                SELECT windows.*,
+                       CASE WHEN bb_count = {bb_period} THEN bb_mean END AS sma,
+                       CASE WHEN bb_count = {bb_period} THEN bb_std END AS std,
+                       CASE WHEN wr_count = {williams_period}
+                            THEN -100 * (wr_high - close_price) / NULLIF(wr_high - wr_low, 0) END AS williams_r,
+                       CASE WHEN sk_count = {k_period}
+                            THEN 100 * (close_price - sk_low) / NULLIF(sk_high - sk_low, 0) END AS k_fast
+                FROM windows
+            ),
+            slow AS (
+                SELECT fast.*,
+                       LAG(sma, {bb_shift}) OVER (ORDER BY epoch) AS bb_middle,
+                       CASE WHEN COUNT(k_fast) OVER ks = {slowing} THEN AVG(k_fast) OVER ks END AS stoch_k
+                FROM fast
+                WINDOW ks AS ({frame(slowing)})
+            ),
+            oscillators AS (
+                SELECT slow.*,
+                       CASE WHEN COUNT(stoch_k) OVER ds = {d_period} THEN AVG(stoch_k) OVER ds END AS stoch_d
+                FROM slow
+                WINDOW ds AS ({frame(d_period)})
+            )
+            SELECT epoch, open_price, high_price, low_price, close_price, volume,
+                   bb_middle, bb_middle + std * {deviation!r} AS bb_upper, bb_middle - std * {deviation!r} AS bb_lower,
+                   williams_r, stoch_k, stoch_d
+            FROM oscillators
+            ORDER BY epoch DESC
+            LIMIT {int(last)}
+        """
+    
+    @staticmethod
+    def compute(pair, timeframe, last, params=COMBINED_STRATEGY_PARAMS):
+        """
+        Dernières bougies d'une paire et leurs indicateurs, calculés par la base
+        
+        Args:
+            pair (CurrencyPair): Paire de devises
+            timeframe (str): Timeframe des données (natives ou agrégées)
+            last (int): Nombre de bougies renvoyées
+            params (dict): Paramètres de la stratégie combinée
+        
+        Returns:
+            pd.DataFrame: Colonnes open, high, low, close, volume et indicateurs, indexé par horodatage (UTC)
+        """
+        queryset = PriceAggregator.get_bar_queryset(pair, timeframe)
+        bars_sql, bars_params, _ = PriceReader.get_query(
+            queryset, PRICE_COLUMNS, limit=last + SQLIndicatorEngine.get_lookback(params)
+        )
+        connection = connections[queryset.db]
+        sql = SQLIndicatorEngine.build_sql(bars_sql, connection.vendor, last, params)
+        
+        with connection.cursor() as cursor:
+            cursor.execute(sql, bars_params)
+            rows = cursor.fetchall()
+        rows.reverse()
+        
+        columns = PRICE_COLUMNS + INDICATOR_COLUMNS
+        values = np.array([row[1:] for row in rows], dtype=np.float64).reshape(len(rows), len(columns))
+        index = PriceReader.to_index(np.array([row[0] for row in rows], dtype=np.int64))
+        return pd.DataFrame(values, index=index, columns=columns)
@@ -0,0 +1,158 @@
+# signals/store.py
+"""
+Enregistrement idempotent des signaux
+
+Un signal est identifié par (paire, stratégie, timeframe, bougie, direction).
+Réévaluer une stratégie sur la même bougie ne crée donc pas de nouvelle
+ligne : le premier signal émis est conservé tel quel (son prix d'entrée ne
+dérive pas d'une exécution à l'autre), et seuls les signaux réellement
+nouveaux sont transmis aux consommateurs de signals_created.
+"""
+from bisect import bisect_right
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from market_data.aggregation import PriceAggregator
+from market_data.models import CurrencyPair
+from .models import Signal
+
+# Champs formant l'identité d'un signal (contrainte unique_signal_per_bar)
+SIGNAL_IDENTITY_FIELDS = ('pair_id', 'strategy_id', 'timeframe', 'bar_timestamp', 'signal_type')
+
+class SignalStore:
+    """Création des signaux sans doublon"""
+    
+    @staticmethod
+    def get_identity(signal):
+        return tuple(getattr(signal, field) for field in SIGNAL_IDENTITY_FIELDS)
+    
+    @staticmethod
+    def get_signal_bar(df, value, lookback=1):
+        """
+        Bougie ayant déclenché un signal : la plus récente des `lookback` dernières portant `value`
+        
+        Args:
+            df (pd.DataFrame): Données indexées par horodatage, avec une colonne 'signal'
+            value (int): 1 (achat) ou -1 (vente)
+            lookback (int): Nombre de bougies examinées par la stratégie
+        
+        Returns:
+            datetime: Début de la bougie
+        """
+        recent = df['signal'].iloc[-lookback:]
+        return recent.index[recent == value][-1].to_pydatetime()
+    
+    @staticmethod
+    def save(signal):
+        """
+        Enregistre un signal, sauf s'il existe déjà pour la même bougie
+        
+        Args:
+            signal (Signal): Signal non enregistré, bar_timestamp renseigné
+        
+        Returns:
+            tuple: (signal enregistré, True s'il vient d'être créé)
+        """
+        lookup = dict(zip(SIGNAL_IDENTITY_FIELDS, SignalStore.get_identity(signal)))
+        existing = Signal.objects.filter(**lookup).first()
+        if existing is not None:
+            return existing, False
+        
+        try:
+            with transaction.atomic():
+                signal.save(force_insert=True)
+            return signal, True
+        except IntegrityError:
+            # Créé entre-temps par une évaluation concurrente
+            return Signal.objects.get(**lookup), False
+    
+    @staticmethod
+    def save_many(signals):
+        """
+        Enregistre un lot de signaux en une requête, en ignorant ceux qui existent déjà
+        
+        Args:
+            signals (list): Signaux non enregistrés, bar_timestamp renseigné
+        
+        Returns:
+            list: Signaux effectivement créés
+        """
+        if not signals:
+            return []
+        
+        condition = Q()
+        for signal in signals:
+            condition |= Q(**dict(zip(SIGNAL_IDENTITY_FIELDS, SignalStore.get_identity(signal))))
+        existing = set(Signal.objects.filter(condition).values_list(*SIGNAL_IDENTITY_FIELDS))
+        
+        new_signals = []
+        for signal in signals:
+            identity = SignalStore.get_identity(signal)
+            if identity not in existing:
+                existing.add(identity)
+                new_signals.append(signal)
+        
+        if not new_signals:
+            return []
+        
+        try:
+            with transaction.atomic():
+                Signal.objects.bulk_create(new_signals)
+            return new_signals
+        except IntegrityError:
+            # Conflit avec une évaluation concurrente : repli ligne par ligne
+            return [signal for signal in new_signals if SignalStore.save(signal)[1]]
+    
+    @staticmethod
+    def deduplicate(dry_run=False):
+        """
+        Rattache les signaux existants à leur bougie et supprime les doublons
+        
+        Les signaux antérieurs à bar_timestamp portent leur date d'émission :
+        chacun est rattaché à la dernière bougie connue à cette date. Dans
+        chaque identité, le premier signal émis est conservé.
+        
+        Args:
+            dry_run (bool): Compter sans rien modifier
+        
+        Returns:
+            dict: Nombre de signaux examinés, supprimés et rattachés à une autre bougie
+        """
+        counts = {'signals': 0, 'deleted': 0, 'realigned': 0}
+        
+        combinations = Signal.objects.values_list('pair_id', 'timeframe').distinct().order_by()
+        for pair_id, timeframe in combinations:
+            pair = CurrencyPair.objects.get(pk=pair_id)
+            bars = list(PriceAggregator.get_bar_queryset(pair, timeframe).order_by('timestamp').values_list('timestamp', flat=True))
+            
+            kept = {}
+            duplicates = []
+            realigned = []
+            signals = Signal.objects.filter(pair_id=pair_id, timeframe=timeframe).order_by('timestamp', 'id').values_list(
+                'id', 'strategy_id', 'signal_type', 'bar_timestamp'
+            )
+            for signal_id, strategy_id, signal_type, bar_timestamp in signals:
+                counts['signals'] += 1
+                position = bisect_right(bars, bar_timestamp)
+                bar = bars[position - 1] if position else bar_timestamp
+                
+                identity = (strategy_id, signal_type, bar)
+                if identity in kept:
+                    duplicates.append(signal_id)
+                    continue
+                kept[identity] = signal_id
+                if bar != bar_timestamp:
+                    realigned.append((signal_id, bar))
+            
+            counts['deleted'] += len(duplicates)
+            counts['realigned'] += len(realigned)
+            if dry_run:
+                continue
+            
+            # Supprimer d'abord : une bougie cible peut être portée par un doublon
+            with transaction.atomic():
+                for start in range(0, len(duplicates), 1000):
+                    Signal.objects.filter(id__in=duplicates[start:start + 1000]).delete()
+                for signal_id, bar in realigned:
+                    Signal.objects.filter(id=signal_id).update(bar_timestamp=bar)
+        
+        return counts
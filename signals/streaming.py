@@ -0,0 +1,458 @@
+# signals/streaming.py
+"""
+Indicateurs techniques incrémentaux (O(1) par bougie)
+
+Chaque indicateur conserve un état minimal (sommes glissantes, files
+monotones, moyenne exponentielle récursive) mis à jour à chaque nouvelle
+bougie. Les algorithmes reproduisent ceux de pandas (sommation de Kahan
+pour rolling().mean(), méthode de Welford pour rolling().std(), ewm avec
+adjust=False) : alimentés avec le même historique, ils donnent exactement
+les mêmes dernières valeurs que TechnicalIndicators.
+"""
+import math
+from collections import deque
+from django.db import transaction
+from market_data.models import CurrencyPair
+from market_data.aggregation import PriceAggregator
+from .models import IndicatorState
+
+NAN = float('nan')
+
+def _encode(value):
+    """Rend une valeur sérialisable en JSON (NaN -> None, infinis -> chaîne)"""
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        if math.isinf(value):
+            return 'inf' if value > 0 else '-inf'
+    return value
+
+def _decode(value):
+    if value is None:
+        return NAN
+    if value in ('inf', '-inf'):
+        return float(value)
+    return value
+
+def _divide(numerator, denominator):
+    """Division avec la sémantique de NumPy (pas d'exception sur zéro)"""
+    if denominator == 0:
+        if numerator == 0 or math.isnan(numerator):
+            return NAN
+        return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+    return numerator / denominator
+
+class StreamingState:
+    """Sérialisation générique de l'état d'un indicateur incrémental"""
+    
+    def to_state(self):
+        state = {}
+        for name, value in vars(self).items():
+            if isinstance(value, StreamingState):
+                state[name] = {'__indicator__': value.to_state()}
+            elif isinstance(value, deque):
+                state[name] = {'__deque__': [_encode(item) for item in value], 'maxlen': value.maxlen}
+            else:
+                state[name] = _encode(value)
+        return state
+    
+    @classmethod
+    def from_state(cls, state, **children):
+        obj = cls.__new__(cls)
+        for name, value in state.items():
+            if isinstance(value, dict) and '__indicator__' in value:
+                setattr(obj, name, children[name].from_state(value['__indicator__']))
+            elif isinstance(value, dict) and '__deque__' in value:
+                items = [tuple(item) if isinstance(item, list) else _decode(item) for item in value['__deque__']]
+                setattr(obj, name, deque(items, maxlen=value['maxlen']))
+            else:
+                setattr(obj, name, _decode(value))
+        return obj
+
+class RollingMean(StreamingState):
+    """Équivalent incrémental de Series.rolling(window).mean()"""
+    
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.nobs = 0
+        self.sum_x = 0.0
+        self.neg_ct = 0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+        self.num_consecutive_same_value = 0
+        self.prev_value = None
+    
+    def update(self, value):
+        if self.prev_value is None:
+            self.prev_value = value
+        
+        # Retirer la valeur qui sort de la fenêtre
+        if len(self.values) == self.window:
+            old = self.values[0]
+            if old == old:
+                self.nobs -= 1
+                y = -old - self.compensation_remove
+                t = self.sum_x + y
+                self.compensation_remove = t - self.sum_x - y
+                self.sum_x = t
+                if math.copysign(1.0, old) < 0:
+                    self.neg_ct -= 1
+        
+        # Ajouter la nouvelle valeur (sommation de Kahan)
+        self.values.append(value)
+        if value == value:
+            self.nobs += 1
+            y = value - self.compensation_add
+            t = self.sum_x + y
+            self.compensation_add = t - self.sum_x - y
+            self.sum_x = t
+            if math.copysign(1.0, value) < 0:
+                self.neg_ct += 1
+            if value == self.prev_value:
+                self.num_consecutive_same_value += 1
+            else:
+                self.num_consecutive_same_value = 1
+            self.prev_value = value
+        
+        return self.value()
+    
+    def value(self):
+        if self.nobs < self.window or self.nobs == 0:
+            return NAN
+        
+        result = self.sum_x / self.nobs
+        if self.num_consecutive_same_value >= self.nobs:
+            result = self.prev_value
+        elif self.neg_ct == 0 and result < 0:
+            result = 0.0
+        elif self.neg_ct == self.nobs and result > 0:
+            result = 0.0
+        return result
+
+class RollingStd(StreamingState):
+    """Équivalent incrémental de Series.rolling(window).std() (ddof=1)"""
+    
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.nobs = 0.0
+        self.mean_x = 0.0
+        self.ssqdm_x = 0.0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+        self.num_consecutive_same_value = 0
+        self.prev_value = None
+    
+    def update(self, value):
+        if self.prev_value is None:
+            self.prev_value = value
+        
+        # Retirer la valeur qui sort de la fenêtre (Welford + Kahan)
+        if len(self.values) == self.window:
+            old = self.values[0]
+            if old == old:
+                self.nobs -= 1
+                if self.nobs:
+                    prev_mean = self.mean_x - self.compensation_remove
+                    y = old - self.compensation_remove
+                    t = y - self.mean_x
+                    self.compensation_remove = t + self.mean_x - y
+                    self.mean_x = self.mean_x - t / self.nobs
+                    self.ssqdm_x = self.ssqdm_x - (old - prev_mean) * (old - self.mean_x)
+                else:
+                    self.mean_x = 0.0
+                    self.ssqdm_x = 0.0
+        
+        # Ajouter la nouvelle valeur
+        self.values.append(value)
+        if value == value:
+            self.nobs += 1
+            if value == self.prev_value:
+                self.num_consecutive_same_value += 1
+            else:
+                self.num_consecutive_same_value = 1
+            self.prev_value = value
+            
+            prev_mean = self.mean_x - self.compensation_add
+            y = value - self.compensation_add
+            t = y - self.mean_x
+            self.compensation_add = t + self.mean_x - y
+            if self.nobs:
+                self.mean_x = self.mean_x + t / self.nobs
+            else:
+                self.mean_x = 0.0
+            self.ssqdm_x = self.ssqdm_x + (value - prev_mean) * (value - self.mean_x)
+        
+        return self.value()
+    
+    def value(self):
+        if self.nobs < self.window or self.nobs <= 1:
+            return NAN
+        
+        if self.num_consecutive_same_value >= self.nobs:
+            return 0.0
+        
+        variance = self.ssqdm_x / (self.nobs - 1.0)
+        return math.sqrt(variance) if variance > 0 else 0.0
+
+class RollingExtremum(StreamingState):
+    """Équivalent incrémental de rolling(window).max() / .min() (file monotone)"""
+    
+    def __init__(self, window, is_max=True):
+        self.window = window
+        self.is_max = is_max
+        self.position = 0
+        self.nobs = 0
+        self.values = deque(maxlen=window)
+        self.candidates = deque()  # (position, valeur), valeurs monotones
+    
+    def update(self, value):
+        # Sortie de la valeur la plus ancienne de la fenêtre
+        if len(self.values) == self.window and self.values[0] == self.values[0]:
+            self.nobs -= 1
+        self.values.append(value)
+        
+        if value == value:
+            self.nobs += 1
+            while self.candidates and (
+                value >= self.candidates[-1][1] if self.is_max else value <= self.candidates[-1][1]
+            ):
+                self.candidates.pop()
+            self.candidates.append((self.position, value))
+        
+        while self.candidates and self.candidates[0][0] <= self.position - self.window:
+            self.candidates.popleft()
+        
+        self.position += 1
+        return self.value()
+    
+    def value(self):
+        if self.nobs < self.window or not self.candidates:
+            return NAN
+        return self.candidates[0][1]
+
+class ExponentialMean(StreamingState):
+    """Équivalent incrémental de Series.ewm(span, adjust=False).mean()"""
+    
+    def __init__(self, span):
+        com = (span - 1) / 2.0
+        self.alpha = 1.0 / (1.0 + com)
+        self.weighted = None
+    
+    def update(self, value):
+        if self.weighted is None or self.weighted != self.weighted:
+            self.weighted = value
+        elif value == value:
+            old_wt = 1.0 - self.alpha
+            if self.weighted != value:
+                self.weighted = old_wt * self.weighted + self.alpha * value
+                self.weighted /= (old_wt + self.alpha)
+        return self.weighted
+
+class StreamingSMA(StreamingState):
+    """Moyenne mobile simple incrémentale"""
+    
+    def __init__(self, period=20):
+        self.mean = RollingMean(period)
+    
+    def update(self, high, low, close):
+        return {'sma': self.mean.update(close)}
+    
+    @classmethod
+    def from_state(cls, state):
+        return super().from_state(state, mean=RollingMean)
+
+class StreamingEMA(StreamingState):
+    """Moyenne mobile exponentielle incrémentale"""
+    
+    def __init__(self, period=20):
+        self.ema = ExponentialMean(period)
+    
+    def update(self, high, low, close):
+        return {'ema': self.ema.update(close)}
+    
+    @classmethod
+    def from_state(cls, state):
+        return super().from_state(state, ema=ExponentialMean)
+
+class StreamingBollingerBands(StreamingState):
+    """Bandes de Bollinger incrémentales"""
+    
+    def __init__(self, period=27, deviation=2.7, shift=0):
+        self.deviation = deviation
+        self.mean = RollingMean(period)
+        self.std = RollingStd(period)
+        # Moyennes des `shift` dernières bougies pour le décalage de la bande médiane
+        self.means = deque(maxlen=shift + 1)
+    
+    def update(self, high, low, close):
+        self.means.append(self.mean.update(close))
+        std = self.std.update(close)
+        middle_band = self.means[0] if len(self.means) == self.means.maxlen else NAN
+        return {
+            'middle_band': middle_band,
+            'upper_band': middle_band + (std * self.deviation),
+            'lower_band': middle_band - (std * self.deviation),
+        }
+    
+    @classmethod
+    def from_state(cls, state):
+        return super().from_state(state, mean=RollingMean, std=RollingStd)
+
+class StreamingWilliamsR(StreamingState):
+    """Williams %R incrémental"""
+    
+    def __init__(self, period=75):
+        self.highest_high = RollingExtremum(period, is_max=True)
+        self.lowest_low = RollingExtremum(period, is_max=False)
+    
+    def update(self, high, low, close):
+        highest_high = self.highest_high.update(high)
+        lowest_low = self.lowest_low.update(low)
+        return {'williams_r': _divide(-100 * (highest_high - close), highest_high - lowest_low)}
+    
+    @classmethod
+    def from_state(cls, state):
+        return super().from_state(state, highest_high=RollingExtremum, lowest_low=RollingExtremum)
+
+class StreamingStochastic(StreamingState):
+    """Oscillateur stochastique incrémental (%K ralenti et %D)"""
+    
+    def __init__(self, k_period=40, d_period=20, slowing=15):
+        self.highest_high = RollingExtremum(k_period, is_max=True)
+        self.lowest_low = RollingExtremum(k_period, is_max=False)
+        self.k_slow = RollingMean(slowing)
+        self.d_slow = RollingMean(d_period)
+    
+    def update(self, high, low, close):
+        lowest_low = self.lowest_low.update(low)
+        highest_high = self.highest_high.update(high)
+        k_fast = _divide(100 * (close - lowest_low), highest_high - lowest_low)
+        k = self.k_slow.update(k_fast)
+        return {'k': k, 'd': self.d_slow.update(k)}
+    
+    @classmethod
+    def from_state(cls, state):
+        return super().from_state(
+            state, highest_high=RollingExtremum, lowest_low=RollingExtremum,
+            k_slow=RollingMean, d_slow=RollingMean
+        )
+
+class StreamingATR(StreamingState):
+    """ATR (Average True Range) incrémental"""
+    
+    def __init__(self, period=14):
+        self.previous_close = NAN
+        self.mean = RollingMean(period)
+    
+    def update(self, high, low, close):
+        ranges = [high - low, abs(high - self.previous_close), abs(low - self.previous_close)]
+        ranges = [value for value in ranges if value == value]
+        self.previous_close = close
+        return {'atr': self.mean.update(max(ranges) if ranges else NAN)}
+    
+    @classmethod
+    def from_state(cls, state):
+        return super().from_state(state, mean=RollingMean)
+
+class StreamingIndicatorEngine:
+    """Met à jour les indicateurs incrémentaux et persiste leur état entre deux tâches"""
+    
+    INDICATORS = {
+        'sma': StreamingSMA,
+        'ema': StreamingEMA,
+        'atr': StreamingATR,
+        'bollinger_bands': StreamingBollingerBands,
+        'williams_r': StreamingWilliamsR,
+        'stochastic': StreamingStochastic,
+    }
+    
+    # Indicateurs des stratégies, mis à jour par update_streaming_indicators_task
+    DEFAULT_INDICATORS = [
+        ('bollinger_bands', (27, 2.7, 0)),
+        ('williams_r', (75,)),
+        ('stochastic', (40, 20, 15)),
+        ('atr', (14,)),
+    ]
+    
+    # Nombre de bougies utilisées pour amorcer un indicateur sans état
+    SEED_BARS = 1000
+    
+    @staticmethod
+    def get_key(name, params):
+        """Clé de stockage d'un indicateur, ex. 'bollinger_bands:27:2.7:0'"""
+        return ':'.join([name] + [str(value) for value in params])
+    
+    @staticmethod
+    def feed(indicator, rows):
+        """Alimente un indicateur avec des lignes (timestamp, high, low, close)"""
+        values = None
+        for _, high, low, close in rows:
+            values = indicator.update(float(high), float(low), float(close))
+        return values
+    
+    @staticmethod
+    def update(pair_symbol, name, params=(), timeframe='1h', seed_bars=SEED_BARS):
+        """
+        Met à jour un indicateur avec les bougies arrivées depuis la dernière exécution
+        
+        La dernière bougie traitée est toujours rejouée à partir de l'état
+        précédent (checkpoint), pour intégrer les mises à jour d'une bougie
+        encore en formation.
+        
+        Args:
+            pair_symbol (str): Symbole de la paire
+            name (str): Nom de l'indicateur (clé de INDICATORS)
+            params (tuple): Paramètres positionnels de l'indicateur
+            timeframe (str): Timeframe des données
+            seed_bars (int): Historique utilisé pour l'amorçage
+        
+        Returns:
+            dict: Dernières valeurs de l'indicateur, ou None si aucune donnée
+        """
+        try:
+            indicator_class = StreamingIndicatorEngine.INDICATORS[name]
+            pair = CurrencyPair.objects.get(symbol=pair_symbol)
+            key = StreamingIndicatorEngine.get_key(name, params)
+            bars = PriceAggregator.get_bar_queryset(pair, timeframe)
+            fields = ('timestamp', 'high_price', 'low_price', 'close_price')
+            
+            with transaction.atomic():
+                state = IndicatorState.objects.select_for_update().filter(
+                    pair=pair, timeframe=timeframe, indicator=key
+                ).first()
+                
+                if state is None:
+                    # Amorçage à partir de l'historique
+                    rows = list(bars.order_by('-timestamp').values_list(*fields)[:seed_bars])[::-1]
+                    if not rows:
+                        return None
+                    
+                    indicator = indicator_class(*params)
+                    StreamingIndicatorEngine.feed(indicator, rows[:-1])
+                    state = IndicatorState(pair=pair, timeframe=timeframe, indicator=key)
+                else:
+                    rows = list(bars.filter(
+                        timestamp__gte=state.last_timestamp
+                    ).order_by('timestamp').values_list(*fields))
+                    if not rows:
+                        return state.values
+                    
+                    # Repartir de l'état précédant la dernière bougie traitée
+                    indicator = indicator_class.from_state(state.checkpoint)
+                    StreamingIndicatorEngine.feed(indicator, rows[:-1])
+                
+                state.checkpoint = indicator.to_state()
+                values = StreamingIndicatorEngine.feed(indicator, rows[-1:])
+                
+                state.state = indicator.to_state()
+                state.last_timestamp = rows[-1][0]
+                state.values = {field: _encode(value) for field, value in values.items()}
+                state.save()
+            
+            return state.values
+        
+        except Exception as e:
+            print(f"Error updating streaming indicator {name} for {pair_symbol}: {str(e)}")
+            return None
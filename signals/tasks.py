@@ -1,7 +1,45 @@
 # signals/tasks.py
 from celery import shared_task
+from django.apps import apps
+from django.conf import settings
+from django.utils import timezone
 from market_data.models import CurrencyPair
+from market_data.partitions import PartitionManager, month_start, add_months
+from market_data.tasks import fan_out
 from .analysis import SignalGenerator  # Assurez-vous que ce fichier existe
+from .streaming import StreamingIndicatorEngine
+from .batch import BatchSignalGenerator
+from .triggers import SignalTrigger, STRATEGY_GENERATORS
+from .backtest import BacktestEngine
+from .optimizer import StrategyOptimizer
+from .models import Signal
+from .board import SignalBoard
+
+# Nombre de mois de signaux conservés quand la table est partitionnée (None : tout conserver)
+SIGNALS_RETENTION_MONTHS = getattr(settings, 'SIGNALS_RETENTION_MONTHS', None)
+
+def fan_out_strategy(strategy, timeframe='1h'):
+    """Répartit l'évaluation d'une stratégie sur toutes les paires actives (une sous-tâche par paire)"""
+    symbols = CurrencyPair.objects.filter(is_active=True).order_by('symbol').values_list('symbol', flat=True)
+    return fan_out(
+        [generate_pair_signals_task.s(strategy, symbol, timeframe) for symbol in symbols],
+        f"generate_signals:{strategy}:{timeframe}"
+    )
+
+@shared_task
+def generate_pair_signals_task(strategy, pair_symbol, timeframe='1h'):
+    """
+    Sous-tâche : évalue une stratégie pour une paire
+    
+    Args:
+        strategy (str): 'bollinger_bands', 'williams_r', 'stochastic' ou 'combined'
+        pair_symbol (str): Symbole de la paire
+        timeframe (str): Intervalle de temps (ignoré par les stratégies simples, en 1h)
+    
+    Returns:
+        dict: Résultat de la paire
+    """
+    return {pair_symbol: STRATEGY_GENERATORS[strategy](pair_symbol, timeframe)}
 
 @shared_task
 def generate_bollinger_bands_signals_task(pair_symbol=None):
@@ -9,10 +47,10 @@ def generate_bollinger_bands_signals_task(pair_symbol=None):
     Tâche Celery pour générer des signaux basés sur les bandes de Bollinger
     
     Args:
-        pair_symbol (str, optional): Symbole de la paire. Si None, génère des signaux pour toutes les paires actives.
+        pair_symbol (str, optional): Symbole de la paire. Si None, répartit toutes les paires actives en sous-tâches.
     
     Returns:
-        dict: Résultats de la génération de signaux
+        dict: Résultats de la génération de signaux, ou identifiant du résultat agrégé en cas de répartition
     """
     results = {}
     
@@ -21,11 +59,8 @@ def generate_bollinger_bands_signals_task(pair_symbol=None):
         result = SignalGenerator.generate_bollinger_bands_signals(pair_symbol)
         results[pair_symbol] = result
     else:
-        # Générer des signaux pour toutes les paires actives
-        pairs = CurrencyPair.objects.filter(is_active=True)
-        for pair in pairs:
-            result = SignalGenerator.generate_bollinger_bands_signals(pair.symbol)
-            results[pair.symbol] = result
+        # Une sous-tâche par paire active, résultats agrégés par le callback du chord
+        return fan_out_strategy('bollinger_bands')
     
     return results
 
@@ -35,10 +70,10 @@ def generate_williams_r_signals_task(pair_symbol=None):
     Tâche Celery pour générer des signaux basés sur Williams %R
     
     Args:
-        pair_symbol (str, optional): Symbole de la paire. Si None, génère des signaux pour toutes les paires actives.
+        pair_symbol (str, optional): Symbole de la paire. Si None, répartit toutes les paires actives en sous-tâches.
     
     Returns:
-        dict: Résultats de la génération de signaux
+        dict: Résultats de la génération de signaux, ou identifiant du résultat agrégé en cas de répartition
     """
     results = {}
     
@@ -47,11 +82,8 @@ def generate_williams_r_signals_task(pair_symbol=None):
         result = SignalGenerator.generate_williams_r_signals(pair_symbol)
         results[pair_symbol] = result
     else:
-        # Générer des signaux pour toutes les paires actives
-        pairs = CurrencyPair.objects.filter(is_active=True)
-        for pair in pairs:
-            result = SignalGenerator.generate_williams_r_signals(pair.symbol)
-            results[pair.symbol] = result
+        # Une sous-tâche par paire active, résultats agrégés par le callback du chord
+        return fan_out_strategy('williams_r')
     
     return results
 
@@ -61,10 +93,10 @@ def generate_stochastic_signals_task(pair_symbol=None):
     Tâche Celery pour générer des signaux basés sur l'oscillateur stochastique
     
     Args:
-        pair_symbol (str, optional): Symbole de la paire. Si None, génère des signaux pour toutes les paires actives.
+        pair_symbol (str, optional): Symbole de la paire. Si None, répartit toutes les paires actives en sous-tâches.
     
     Returns:
-        dict: Résultats de la génération de signaux
+        dict: Résultats de la génération de signaux, ou identifiant du résultat agrégé en cas de répartition
     """
     results = {}
     
@@ -73,25 +105,24 @@ def generate_stochastic_signals_task(pair_symbol=None):
         result = SignalGenerator.generate_stochastic_signals(pair_symbol)
         results[pair_symbol] = result
     else:
-        # Générer des signaux pour toutes les paires actives
-        pairs = CurrencyPair.objects.filter(is_active=True)
-        for pair in pairs:
-            result = SignalGenerator.generate_stochastic_signals(pair.symbol)
-            results[pair.symbol] = result
+        # Une sous-tâche par paire active, résultats agrégés par le callback du chord
+        return fan_out_strategy('stochastic')
     
     return results
 
 @shared_task
-def generate_combined_strategy_signals_task(pair_symbol=None, timeframe='1h'):
+def generate_combined_strategy_signals_task(pair_symbol=None, timeframe='1h', batch=True):
     """
     Tâche Celery pour générer des signaux basés sur la stratégie combinée
     
     Args:
         pair_symbol (str, optional): Symbole de la paire. Si None, génère des signaux pour toutes les paires actives.
         timeframe (str): Intervalle de temps ('1m', '5m', '15m', '30m', '1h', '4h', '1d', '1w', '1mo')
+        batch (bool): Évaluer toutes les paires actives en un seul lot vectorisé ; sinon,
+                      répartir les paires en sous-tâches
     
     Returns:
-        dict: Résultats de la génération de signaux
+        dict: Résultats de la génération de signaux, ou identifiant du résultat agrégé en cas de répartition
     """
     results = {}
     
@@ -99,11 +130,138 @@ def generate_combined_strategy_signals_task(pair_symbol=None, timeframe='1h'):
         # Générer des signaux pour une paire spécifique
         result = SignalGenerator.generate_combined_strategy_signals(pair_symbol, timeframe)
         results[pair_symbol] = result
+    elif batch:
+        # Une requête et un calcul vectorisé pour toutes les paires actives
+        results = BatchSignalGenerator.generate_combined_strategy_signals(timeframe)
+    else:
+        # Une sous-tâche par paire active, résultats agrégés par le callback du chord
+        return fan_out_strategy('combined', timeframe)
+    
+    return results
+
+@shared_task
+def generate_signals_on_new_bars_task(pair_symbol, timeframe):
+    """
+    Tâche Celery planifiée par l'arrivée de nouvelles bougies (voir signals.triggers)
+    
+    Args:
+        pair_symbol (str): Symbole de la paire
+        timeframe (str): Timeframe des nouvelles bougies
+    
+    Returns:
+        dict: Résultat de chaque stratégie réévaluée
+    """
+    return SignalTrigger.run(pair_symbol, timeframe)
+
+@shared_task
+def update_streaming_indicators_task(pair_symbol=None, timeframe='1h'):
+    """
+    Tâche Celery pour mettre à jour les indicateurs incrémentaux
+    
+    Seules les bougies arrivées depuis la dernière exécution sont traitées ;
+    l'état de chaque indicateur est persisté dans IndicatorState.
+    
+    Args:
+        pair_symbol (str, optional): Symbole de la paire. Si None, met à jour toutes les paires actives.
+        timeframe (str): Intervalle de temps
+    
+    Returns:
+        dict: Dernières valeurs des indicateurs par paire
+    """
+    results = {}
+    
+    if pair_symbol:
+        symbols = [pair_symbol]
     else:
-        # Générer des signaux pour toutes les paires actives
-        pairs = CurrencyPair.objects.filter(is_active=True)
-        for pair in pairs:
-            result = SignalGenerator.generate_combined_strategy_signals(pair.symbol, timeframe)
-            results[pair.symbol] = result
+        symbols = CurrencyPair.objects.filter(is_active=True).values_list('symbol', flat=True)
+    
+    for symbol in symbols:
+        results[symbol] = {
+            StreamingIndicatorEngine.get_key(name, params): StreamingIndicatorEngine.update(
+                symbol, name, params, timeframe
+            )
+            for name, params in StreamingIndicatorEngine.DEFAULT_INDICATORS
+        }
+    
+    return results
+
+@shared_task
+def run_backtest_task(pair_symbol=None, strategy='combined', timeframe='1h'):
+    """
+    Tâche Celery pour backtester une stratégie sur l'historique complet
+    
+    Args:
+        pair_symbol (str, optional): Symbole de la paire. Si None, backteste toutes les paires actives.
+        strategy (str): 'bollinger_bands', 'williams_r', 'stochastic' ou 'combined'
+        timeframe (str): Intervalle de temps
+    
+    Returns:
+        dict: Statistiques du backtest par paire
+    """
+    results = {}
+    
+    if pair_symbol:
+        symbols = [pair_symbol]
+    else:
+        symbols = CurrencyPair.objects.filter(is_active=True).values_list('symbol', flat=True)
+    
+    for symbol in symbols:
+        result = BacktestEngine.run(symbol, strategy, timeframe)
+        if result:
+            result['start_date'] = result['start_date'].isoformat()
+            result['end_date'] = result['end_date'].isoformat()
+        results[symbol] = result
+    
+    return results
+
+@shared_task
+def optimize_strategy_task(pair_symbol, strategy='combined', timeframe='1h', method='random',
+                           iterations=1000, top_n=10, objective='sharpe_ratio'):
+    """
+    Tâche Celery pour optimiser les paramètres d'une stratégie
+    
+    Dans un worker prefork (processus démon), les combinaisons sont évaluées
+    séquentiellement ; un worker lancé avec --pool=solo ou --pool=threads
+    utilise tous les cœurs.
+    
+    Args:
+        pair_symbol (str): Symbole de la paire
+        strategy (str): 'bollinger_bands', 'williams_r', 'stochastic' ou 'combined'
+        timeframe (str): Intervalle de temps
+        method (str): 'grid' ou 'random'
+        iterations (int): Nombre de combinaisons pour la recherche aléatoire
+        top_n (int): Nombre de meilleurs résultats conservés
+        objective (str): Statistique à maximiser
+    
+    Returns:
+        dict: Meilleurs résultats de l'optimisation
+    """
+    return StrategyOptimizer.optimize(
+        pair_symbol, strategy, timeframe, method=method, iterations=iterations,
+        top_n=top_n, objective=objective
+    )
+
+@shared_task
+def apply_signal_retention_task(months=SIGNALS_RETENTION_MONTHS):
+    """
+    Tâche Celery retirant les partitions mensuelles de signaux plus anciennes que la rétention
+    
+    Args:
+        months (int, optional): Nombre de mois conservés en plus du mois courant (None : tout conserver)
+    
+    Returns:
+        dict: Partitions retirées
+    """
+    if months is None:
+        return {'partitions_removed': []}
+    
+    cutoff = add_months(month_start(timezone.now()), -int(months))
+    removed = PartitionManager.apply_retention(Signal, cutoff)
+    if removed:
+        # Le tableau des signaux courants et les compteurs du tableau de bord comptent encore les signaux retirés
+        SignalBoard.rebuild()
+        if apps.is_installed('dashboard'):
+            from dashboard.statistics import StatisticsService
+            StatisticsService.rebuild()
     
-    return results
\ No newline at end of file
+    return {'partitions_removed': [partition['name'] for partition in removed]}
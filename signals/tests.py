@@ -1,3 +1,342 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, tag
+from django.utils import timezone
+from market_data.aggregation import PriceAggregator
+from market_data.columnar import PriceReader
+from market_data.models import Currency, CurrencyPair, PriceData
+from signals.analysis import TechnicalIndicators, COMBINED_STRATEGY_PARAMS
+from signals import backtest, kernels
+from signals.backtest import BACKTEST_STRATEGIES, EXIT_END, EXIT_STOP, EXIT_TARGET, simulate_trades
+from signals.board import SignalBoard
+from signals.models import Strategy, Signal, LatestSignal
+from signals.sql_indicators import SQLIndicatorEngine, INDICATOR_COLUMNS
+from signals.streaming import StreamingBollingerBands, StreamingWilliamsR, StreamingStochastic, StreamingATR
 
-# Create your tests here.
+def create_bars(count, seed=0):
+    """Prix synthétiques (marche aléatoire) : open, high, low, close"""
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.001, count))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) + rng.random(count) * 0.002
+    low = np.minimum(open_, close) - rng.random(count) * 0.002
+    return open_, high, low, close
+
+def seed_bars(pair, count, seed=0, start=None):
+    """Bougies horaires synthétiques enregistrées pour une paire"""
+    rng = np.random.default_rng(seed)
+    start = start or timezone.now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=count)
+    open_, high, low, close = create_bars(count, seed)
+    PriceData.objects.bulk_create([
+        PriceData(
+            pair=pair, timeframe='1h', timestamp=start + timedelta(hours=index),
+            open_price=round(open_[index], 8), high_price=round(high[index], 8),
+            low_price=round(low[index], 8), close_price=round(close[index], 8), volume=round(rng.random() * 100, 2),
+        )
+        for index in range(count)
+    ])
+
+def naive_trades(high, low, close, signal, stop_loss, take_profit):
+    """Simulation bougie par bougie de référence pour simulate_trades (une position à la fois)"""
+    trades = []
+    index, n = 0, len(close)
+    while index < n - 1:
+        if signal[index] == 0 or not (np.isfinite(stop_loss[index]) and np.isfinite(take_profit[index])):
+            index += 1
+            continue
+        
+        direction, stop, target = signal[index], stop_loss[index], take_profit[index]
+        exit_index, exit_price, exit_reason = n - 1, close[-1], EXIT_END
+        for bar in range(index + 1, n):
+            if direction > 0:
+                stopped, reached = low[bar] <= stop, high[bar] >= target
+            else:
+                stopped, reached = high[bar] >= stop, low[bar] <= target
+            # Stop loss et take profit sur la même bougie : le stop loss l'emporte
+            if stopped or reached:
+                exit_index, exit_price, exit_reason = bar, stop if stopped else target, EXIT_STOP if stopped else EXIT_TARGET
+                break
+        
+        trades.append((index, exit_index, float(direction), float(close[index]), float(exit_price), exit_reason))
+        # La position suivante peut s'ouvrir sur la bougie de sortie
+        index = exit_index
+    return trades
+
+def pandas_indicators(data, params):
+    """Indicateurs de référence (TechnicalIndicators), comme la commande check_sql_indicators"""
+    bb = TechnicalIndicators.calculate_bollinger_bands(data['close'], params['bb_period'], params['bb_deviation'], params['bb_shift'])
+    stoch = TechnicalIndicators.calculate_stochastic(
+        data['high'], data['low'], data['close'],
+        params['stoch_k_period'], params['stoch_d_period'], params['stoch_slowing']
+    )
+    return pd.DataFrame({
+        'bb_middle': bb['middle_band'],
+        'bb_upper': bb['upper_band'],
+        'bb_lower': bb['lower_band'],
+        'williams_r': TechnicalIndicators.calculate_williams_r(data['high'], data['low'], data['close'], params['williams_period']),
+        'stoch_k': stoch['k'],
+        'stoch_d': stoch['d'],
+    })
+
+class SQLIndicatorEngineTests(TestCase):
+    """Indicateurs calculés par la base comparés à TechnicalIndicators (tolérances de check_sql_indicators)"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        base = Currency.objects.create(code='EUR', name='Euro')
+        quote = Currency.objects.create(code='USD', name='US Dollar')
+        cls.pair = CurrencyPair.objects.create(base_currency=base, quote_currency=quote, symbol='EURUSD')
+        seed_bars(cls.pair, 400)
+    
+    def assertMatchesPandas(self, pair, last, params=COMBINED_STRATEGY_PARAMS):
+        actual = SQLIndicatorEngine.compute(pair, '1h', last, params)
+        data = PriceReader.read_frame(PriceAggregator.get_bar_queryset(pair, '1h'), limit=1000)
+        expected = pandas_indicators(data, params).iloc[-last:]
+        
+        self.assertTrue(actual.index.equals(expected.index))
+        for column in INDICATOR_COLUMNS:
+            with self.subTest(column=column):
+                np.testing.assert_allclose(actual[column].to_numpy(), expected[column].to_numpy(), rtol=1e-9, atol=1e-9, equal_nan=True)
+        return actual
+    
+    def test_matches_technical_indicators(self):
+        actual = self.assertMatchesPandas(self.pair, 100)
+        self.assertFalse(actual[INDICATOR_COLUMNS].isna().any().any())
+    
+    def test_incomplete_windows_are_nan(self):
+        """Une fenêtre incomplète donne NULL en SQL, NaN en pandas"""
+        actual = self.assertMatchesPandas(self.pair, 400)
+        params = COMBINED_STRATEGY_PARAMS
+        # Nombre de valeurs manquantes en tête de série, par indicateur
+        leading = {
+            'bb_middle': params['bb_period'] - 1,
+            'williams_r': params['williams_period'] - 1,
+            'stoch_k': params['stoch_k_period'] + params['stoch_slowing'] - 2,
+            'stoch_d': params['stoch_k_period'] + params['stoch_slowing'] + params['stoch_d_period'] - 3,
+        }
+        for column, count in leading.items():
+            with self.subTest(column=column):
+                self.assertTrue(actual[column].iloc[:count].isna().all())
+                self.assertFalse(actual[column].iloc[count:].isna().any())
+    
+    def test_bb_shift(self):
+        params = {**COMBINED_STRATEGY_PARAMS, 'bb_shift': 3}
+        actual = self.assertMatchesPandas(self.pair, 400, params)
+        self.assertTrue(actual['bb_middle'].iloc[:params['bb_period'] + 2].isna().all())
+        self.assertFalse(np.isnan(actual['bb_middle'].iloc[params['bb_period'] + 2]))
+
+class SignalBoardTests(TestCase):
+    """Tableau des signaux courants (/api/signals/latest/)"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        base = Currency.objects.create(code='EUR', name='Euro')
+        quote = Currency.objects.create(code='USD', name='US Dollar')
+        cls.pair = CurrencyPair.objects.create(base_currency=base, quote_currency=quote, symbol='EURUSD')
+        cls.strategy = Strategy.objects.create(name='Bollinger Bands', description='')
+        cls.user = get_user_model().objects.create_user(username='trader', email='trader@example.com', password='secret')
+        start = timezone.now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=10)
+        # Achat puis vente en 1h, un achat en 4h
+        cls.signals = [
+            Signal.objects.create(
+                pair=cls.pair, strategy=cls.strategy, signal_type=signal_type, timeframe=timeframe,
+                entry_price=1.1, confidence=0.7, timestamp=start + timedelta(hours=hours), bar_timestamp=start + timedelta(hours=hours),
+            )
+            for signal_type, timeframe, hours in (('BUY', '1h', 1), ('SELL', '1h', 2), ('BUY', '4h', 3))
+        ]
+        SignalBoard.rebuild()
+    
+    def get_latest(self, **params):
+        self.client.force_login(self.user)
+        response = self.client.get('/api/signals/latest/', params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(row['id'] for row in response.json())
+    
+    def test_rebuild(self):
+        buy_1h, sell_1h, buy_4h = self.signals
+        self.assertEqual(sorted(LatestSignal.objects.values_list('signal_id', flat=True)), [sell_1h.id, buy_4h.id])
+    
+    def test_latest_per_combination(self):
+        _, sell_1h, buy_4h = self.signals
+        self.assertEqual(self.get_latest(), [sell_1h.id, buy_4h.id])
+        self.assertEqual(self.get_latest(timeframe='1h'), [sell_1h.id])
+    
+    def test_filters_keep_newest_matching_signal(self):
+        """Un filtre hors clé renvoie le dernier signal correspondant de chaque combinaison"""
+        buy_1h, sell_1h, buy_4h = self.signals
+        self.assertEqual(self.get_latest(signal_type='BUY'), [buy_1h.id, buy_4h.id])
+        self.assertEqual(self.get_latest(end_date=buy_1h.timestamp.isoformat()), [buy_1h.id])
+    
+    def test_inactive_signal_falls_back_to_previous(self):
+        buy_1h, sell_1h, buy_4h = self.signals
+        Signal.objects.filter(id=sell_1h.id).update(is_active=False)
+        self.assertEqual(self.get_latest(), [buy_1h.id, buy_4h.id])
+
+class KernelParityTests(SimpleTestCase):
+    """Noyaux NumPy comparés aux formules pandas (rolling) qu'ils remplacent"""
+    
+    def setUp(self):
+        _, self.high, self.low, self.close = create_bars(3000)
+        # Valeurs manquantes isolées et en bloc
+        self.gappy = self.close.copy()
+        self.gappy[[100, 1500, 1501, 1502]] = np.nan
+    
+    def assertSameSeries(self, actual, expected, exact=False):
+        expected = np.asarray(expected, dtype=np.float64)
+        np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+        if exact:
+            np.testing.assert_array_equal(actual, expected)
+        else:
+            # Écart absolu : l'écart-type de quelques bougies voisines est proche de zéro
+            np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9, equal_nan=True)
+    
+    def test_rolling_mean_and_std(self):
+        for values in (self.close, self.gappy):
+            for window in (1, 2, 14, 27):
+                with self.subTest(window=window, gaps=values is self.gappy):
+                    rolling = pd.Series(values).rolling(window)
+                    self.assertSameSeries(kernels.rolling_mean(values, window), rolling.mean())
+                    if window > 1:
+                        self.assertSameSeries(kernels.rolling_std(values, window), rolling.std())
+    
+    def test_rolling_moments_across_chunks(self):
+        """Fenêtres à cheval sur deux blocs de sommes cumulées"""
+        with patch.object(kernels, 'KERNEL_CHUNK_SIZE', 128):
+            mean, std = kernels.rolling_moments(self.gappy, 27)
+        rolling = pd.Series(self.gappy).rolling(27)
+        self.assertSameSeries(mean, rolling.mean())
+        self.assertSameSeries(std, rolling.std())
+    
+    def test_rolling_max_and_min(self):
+        for values in (self.high, self.gappy):
+            for window in (1, 3, 40, 75, 2999, 3000, 3001):
+                with self.subTest(window=window, gaps=values is self.gappy):
+                    rolling = pd.Series(values).rolling(window)
+                    self.assertSameSeries(kernels.rolling_max(values, window), rolling.max(), exact=True)
+                    self.assertSameSeries(kernels.rolling_min(values, window), rolling.min(), exact=True)
+    
+    def test_rolling_extrema_derived_period(self):
+        """Les extrema sur 75 bougies se déduisent de ceux sur 40 bougies"""
+        extrema = kernels.rolling_extrema(self.high, self.low, [75, 40])
+        for period in (40, 75):
+            with self.subTest(period=period):
+                highest, lowest = extrema[period]
+                self.assertSameSeries(highest, pd.Series(self.high).rolling(period).max(), exact=True)
+                self.assertSameSeries(lowest, pd.Series(self.low).rolling(period).min(), exact=True)
+    
+    def test_panel_rows_match_series(self):
+        panel = np.vstack([self.close, self.gappy])
+        mean, std = kernels.rolling_moments(panel, 27)
+        highest = kernels.rolling_max(panel, 40)
+        for row, values in enumerate((self.close, self.gappy)):
+            with self.subTest(row=row):
+                self.assertSameSeries(mean[row], kernels.rolling_mean(values, 27), exact=True)
+                self.assertSameSeries(std[row], kernels.rolling_std(values, 27), exact=True)
+                self.assertSameSeries(highest[row], kernels.rolling_max(values, 40), exact=True)
+    
+    def test_atr(self):
+        high, low, close = pd.Series(self.high), pd.Series(self.low), pd.Series(self.close)
+        previous_close = close.shift(1)
+        tr = pd.DataFrame({'tr1': high - low, 'tr2': (high - previous_close).abs(), 'tr3': (low - previous_close).abs()}).max(axis=1)
+        
+        # Pas de clôture précédente : la première bougie vaut high - low
+        true_range = kernels.true_range(self.high, self.low, self.close)
+        self.assertEqual(true_range[0], self.high[0] - self.low[0])
+        self.assertSameSeries(true_range, tr, exact=True)
+        self.assertEqual(kernels.atr(self.high, self.low, self.close, 1)[0], self.high[0] - self.low[0])
+        self.assertSameSeries(kernels.atr(self.high, self.low, self.close, 14), tr.rolling(14).mean())
+    
+    @tag('benchmark')
+    def test_benchmark_command(self):
+        """Parité et mesures de benchmark_indicator_kernels (manage.py test --tag benchmark)"""
+        output = StringIO()
+        call_command('benchmark_indicator_kernels', sizes='1000', repeat=1, stdout=output)
+        self.assertNotIn('differs', output.getvalue())
+        self.assertEqual(output.getvalue().count('faster'), 5)
+
+class StreamingParityTests(SimpleTestCase):
+    """
+    Indicateurs incrémentaux comparés à TechnicalIndicators
+    
+    Les deux implémentations suivent les mêmes algorithmes (sommation de
+    Kahan, méthode de Welford) : les valeurs doivent être identiques au bit
+    près, y compris sur 20 000 bougies.
+    """
+    
+    def test_matches_technical_indicators(self):
+        _, high, low, close = create_bars(20000)
+        series = pd.Series(high), pd.Series(low), pd.Series(close)
+        cases = [
+            (StreamingBollingerBands(27, 2.7, 3), TechnicalIndicators.calculate_bollinger_bands(series[2], 27, 2.7, 3)),
+            (StreamingWilliamsR(75), {'williams_r': TechnicalIndicators.calculate_williams_r(*series, 75)}),
+            (StreamingStochastic(40, 20, 15), TechnicalIndicators.calculate_stochastic(*series, 40, 20, 15)),
+            (StreamingATR(14), {'atr': TechnicalIndicators.calculate_atr(*series, 14)}),
+        ]
+        for indicator, expected in cases:
+            rows = [indicator.update(high[index], low[index], close[index]) for index in range(len(close))]
+            for field, values in expected.items():
+                with self.subTest(indicator=type(indicator).__name__, field=field):
+                    np.testing.assert_array_equal(np.array([row[field] for row in rows]), values.to_numpy())
+
+class BacktestSimulationTests(SimpleTestCase):
+    """simulate_trades (recherche vectorisée des sorties) comparé à une simulation bougie par bougie"""
+    
+    def assertSameTrades(self, high, low, close, signal, stop_loss, take_profit):
+        trades = simulate_trades(high, low, close, signal, stop_loss, take_profit)
+        expected = naive_trades(high, low, close, signal, stop_loss, take_profit)
+        actual = list(zip(
+            trades['entry_index'].tolist(), trades['exit_index'].tolist(), trades['direction'].tolist(),
+            trades['entry_price'].tolist(), trades['exit_price'].tolist(), trades['exit_reason'].tolist(),
+        ))
+        self.assertEqual(actual, expected)
+        
+        direction, entry_price, exit_price = (np.array([trade[i] for trade in expected], dtype=np.float64) for i in (2, 3, 4))
+        np.testing.assert_array_equal(trades['returns'], direction * (exit_price - entry_price) / entry_price)
+        return trades
+    
+    def test_strategies_on_random_walk(self):
+        for seed in (0, 1):
+            _, high, low, close = create_bars(20000, seed)
+            for strategy, definition in BACKTEST_STRATEGIES.items():
+                with self.subTest(seed=seed, strategy=strategy):
+                    signal, stop_loss, take_profit = definition['function'](high, low, close, **definition['params'])
+                    trades = self.assertSameTrades(high, low, close, signal, stop_loss, take_profit)
+                    self.assertGreater(len(trades['entry_index']), 0)
+    
+    def test_small_exit_search_blocks(self):
+        """Entrées réparties sur plusieurs blocs de la matrice entrées × horizon"""
+        _, high, low, close = create_bars(5000)
+        definition = BACKTEST_STRATEGIES['williams_r']
+        signal, stop_loss, take_profit = definition['function'](high, low, close, **definition['params'])
+        with patch.object(backtest, 'EXIT_SEARCH_CELLS', 100):
+            self.assertSameTrades(high, low, close, signal, stop_loss, take_profit)
+    
+    def test_stop_loss_and_take_profit_on_same_bar(self):
+        high = np.array([1.0, 1.2, 1.0, 1.0])
+        low = np.array([1.0, 0.8, 1.0, 1.0])
+        close = np.array([1.0, 1.0, 1.0, 1.0])
+        for direction in (1, -1):
+            with self.subTest(direction=direction):
+                signal = np.array([direction, 0, 0, 0])
+                stop_loss = np.full(4, 1.0 - direction * 0.1)
+                take_profit = np.full(4, 1.0 + direction * 0.1)
+                trades = self.assertSameTrades(high, low, close, signal, stop_loss, take_profit)
+                self.assertEqual(trades['exit_reason'].tolist(), [EXIT_STOP])
+                self.assertEqual(trades['exit_index'].tolist(), [1])
+                self.assertAlmostEqual(trades['returns'][0], -0.1)
+    
+    def test_trade_open_at_end_of_data(self):
+        high = np.array([1.0, 1.01, 1.02, 1.03])
+        low = np.array([1.0, 0.99, 1.0, 1.01])
+        close = np.array([1.0, 1.0, 1.01, 1.02])
+        signal = np.array([1, 0, 1, 0])
+        trades = self.assertSameTrades(high, low, close, signal, np.full(4, 0.9), np.full(4, 1.1))
+        # L'achat de la bougie 2 est ignoré : la position ouverte en 0 court jusqu'à la fin
+        self.assertEqual(trades['entry_index'].tolist(), [0])
+        self.assertEqual(trades['exit_reason'].tolist(), [EXIT_END])
+        self.assertEqual(trades['exit_price'].tolist(), [1.02])
@@ -0,0 +1,117 @@
+# signals/triggers.py
+"""
+Génération des signaux déclenchée par l'arrivée de nouvelles bougies
+
+À chaque price_data_updated portant de nouvelles bougies, les stratégies
+associées au timeframe sont réévaluées pour la paire concernée uniquement,
+par une tâche Celery différée de SIGNAL_TRIGGER_DEBOUNCE secondes. Les
+événements reçus pendant ce délai sont regroupés en une seule évaluation.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from .analysis import SignalGenerator
+
+# Stratégies réévaluées à l'arrivée de nouvelles bougies, par timeframe
+SIGNAL_TRIGGER_STRATEGIES = getattr(settings, 'SIGNAL_TRIGGER_STRATEGIES', {
+    '1h': ['combined'],
+    '4h': ['combined'],
+    '1d': ['combined'],
+})
+
+# Délai de regroupement des événements d'une même paire (secondes)
+SIGNAL_TRIGGER_DEBOUNCE = getattr(settings, 'SIGNAL_TRIGGER_DEBOUNCE', 5)
+
+# Durée de vie du verrou d'une évaluation en attente, au cas où la tâche serait perdue (secondes)
+SIGNAL_TRIGGER_LOCK_TIMEOUT = getattr(settings, 'SIGNAL_TRIGGER_LOCK_TIMEOUT', 300)
+
+# Générateurs par stratégie ; seule la stratégie combinée accepte un timeframe
+STRATEGY_GENERATORS = {
+    'combined': SignalGenerator.generate_combined_strategy_signals,
+    'bollinger_bands': lambda pair_symbol, timeframe: SignalGenerator.generate_bollinger_bands_signals(pair_symbol),
+    'williams_r': lambda pair_symbol, timeframe: SignalGenerator.generate_williams_r_signals(pair_symbol),
+    'stochastic': lambda pair_symbol, timeframe: SignalGenerator.generate_stochastic_signals(pair_symbol),
+}
+
+class SignalTrigger:
+    """Planification et exécution des évaluations déclenchées par les nouvelles bougies"""
+    
+    @staticmethod
+    def get_strategies(timeframe):
+        """
+        Stratégies à réévaluer pour un timeframe
+        
+        Les stratégies simples (Bollinger, Williams %R, stochastique) ne
+        travaillent qu'en 1h et sont ignorées pour les autres timeframes.
+        """
+        return [
+            strategy for strategy in SIGNAL_TRIGGER_STRATEGIES.get(timeframe, [])
+            if strategy in STRATEGY_GENERATORS and (strategy == 'combined' or timeframe == '1h')
+        ]
+    
+    @staticmethod
+    def get_lock_key(pair_symbol, timeframe):
+        return f"signals:trigger:{pair_symbol}:{timeframe}"
+    
+    @staticmethod
+    def schedule(pair_symbol, timeframe):
+        """
+        Planifie l'évaluation d'une paire, sauf si une évaluation est déjà en attente
+        
+        Args:
+            pair_symbol (str): Symbole de la paire
+            timeframe (str): Timeframe des nouvelles bougies
+        
+        Returns:
+            bool: True si une tâche a été planifiée
+        """
+        from .tasks import generate_signals_on_new_bars_task
+        
+        key = SignalTrigger.get_lock_key(pair_symbol, timeframe)
+        try:
+            if not cache.add(key, True, SIGNAL_TRIGGER_DEBOUNCE + SIGNAL_TRIGGER_LOCK_TIMEOUT):
+                return False  # Regroupé avec l'évaluation en attente
+        except Exception as e:
+            print(f"Signal trigger lock unavailable for {pair_symbol} {timeframe}: {str(e)}")
+        
+        try:
+            generate_signals_on_new_bars_task.apply_async(
+                args=(pair_symbol, timeframe), countdown=SIGNAL_TRIGGER_DEBOUNCE
+            )
+            return True
+        except Exception as e:
+            print(f"Could not schedule signal generation for {pair_symbol} {timeframe}: {str(e)}")
+            SignalTrigger.release(pair_symbol, timeframe)
+            return False
+    
+    @staticmethod
+    def release(pair_symbol, timeframe):
+        try:
+            cache.delete(SignalTrigger.get_lock_key(pair_symbol, timeframe))
+        except Exception as e:
+            print(f"Could not release signal trigger lock for {pair_symbol} {timeframe}: {str(e)}")
+    
+    @staticmethod
+    def run(pair_symbol, timeframe):
+        """
+        Réévalue les stratégies d'une paire pour un timeframe
+        
+        Le verrou est libéré avant l'évaluation : des bougies arrivant pendant
+        celle-ci planifient une nouvelle évaluation au lieu d'être perdues.
+        
+        Returns:
+            dict: Résultat de chaque stratégie
+        """
+        SignalTrigger.release(pair_symbol, timeframe)
+        return {
+            strategy: STRATEGY_GENERATORS[strategy](pair_symbol, timeframe)
+            for strategy in SignalTrigger.get_strategies(timeframe)
+        }
+    
+    @staticmethod
+    def on_price_data_updated(sender, pair_symbol, timeframe, inserted=0, **kwargs):
+        """Récepteur de market_data.events.price_data_updated"""
+        if not inserted or not SignalTrigger.get_strategies(timeframe):
+            return
+        # Ne planifier qu'une fois les bougies visibles par les workers
+        transaction.on_commit(lambda: SignalTrigger.schedule(pair_symbol, timeframe))
@@ -1,9 +1,14 @@
 from rest_framework import viewsets, filters, permissions
 from rest_framework.decorators import action
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from market_data.export import QuerysetExporter
+from market_data.fast_serialization import FastJSONRenderer, FastListMixin
+from market_data.pagination import TimestampCursorPagination
 from .models import Strategy, Signal, BacktestResult
-from .serializers import StrategySerializer, SignalSerializer, BacktestResultSerializer
+from .board import SignalBoard
+from .serializers import StrategySerializer, SignalSerializer, SignalRowSerializer, BacktestResultSerializer
 
 class StrategyViewSet(viewsets.ModelViewSet):
     queryset = Strategy.objects.filter(is_active=True)
@@ -18,14 +23,39 @@ class StrategyViewSet(viewsets.ModelViewSet):
             permission_classes = [permissions.IsAdminUser]
         return [permission() for permission in permission_classes]
 
-class SignalViewSet(viewsets.ReadOnlyModelViewSet):
+# Colonnes de l'export des signaux : (nom, chemin ORM, type)
+SIGNAL_EXPORT_COLUMNS = [
+    ('id', 'id', 'int'),
+    ('pair', 'pair__symbol', 'str'),
+    ('strategy', 'strategy__name', 'str'),
+    ('signal_type', 'signal_type', 'str'),
+    ('timeframe', 'timeframe', 'str'),
+    ('timestamp', 'timestamp', 'datetime'),
+    ('bar_timestamp', 'bar_timestamp', 'datetime'),
+    ('entry_price', 'entry_price', 'float'),
+    ('stop_loss', 'stop_loss', 'float'),
+    ('take_profit', 'take_profit', 'float'),
+    ('confidence', 'confidence', 'float'),
+    ('expiration', 'expiration', 'datetime'),
+]
+
+class SignalCursorPagination(TimestampCursorPagination):
+    page_size = 50
+
+class SignalViewSet(FastListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Signal.objects.filter(is_active=True).order_by('-timestamp')
     serializer_class = SignalSerializer
+    row_serializer_class = SignalRowSerializer
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['pair', 'strategy', 'signal_type', 'timeframe']
+    pagination_class = SignalCursorPagination
     
     def get_queryset(self):
-        queryset = Signal.objects.filter(is_active=True).order_by('-timestamp')
+        # Une seule requête jointe pour pair.symbol et strategy.name
+        queryset = Signal.objects.filter(is_active=True).select_related('pair', 'strategy').defer(
+            'pair__base_currency', 'pair__quote_currency', 'strategy__description'
+        ).order_by('-timestamp')
         
         # Filtres additionnels
         pair_id = self.request.query_params.get('pair', None)
@@ -49,36 +79,47 @@ class SignalViewSet(viewsets.ReadOnlyModelViewSet):
         if end_date:
             queryset = queryset.filter(timestamp__lte=end_date)
         
-        # Limite du nombre de résultats
-        limit = int(self.request.query_params.get('limit', 50))
-        return queryset[:limit]
+        # Le nombre de résultats est limité par la pagination (?limit= = taille de page)
+        return queryset
     
     @action(detail=False, methods=['get'])
-    def latest(self, request):
-        # Récupère les derniers signaux pour chaque stratégie et paire
-        pair_id = request.query_params.get('pair', None)
-        timeframe = request.query_params.get('timeframe', None)
+    def export(self, request):
+        """
+        Export en flux des signaux filtrés, par ordre chronologique
         
-        queryset = self.get_queryset()
+        ?fmt=csv (défaut), ndjson ou arrow (flux Arrow IPC).
+        """
+        queryset = self.get_queryset().order_by('timestamp', 'id')
+        try:
+            return QuerysetExporter.response(
+                queryset, SIGNAL_EXPORT_COLUMNS, request.query_params.get('fmt', 'csv'), 'signals'
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+    
+    @action(detail=False, methods=['get'])
+    def latest(self, request):
+        """
+        Tableau des signaux courants : dernier signal actif par (stratégie, paire, timeframe)
         
-        if pair_id:
-            queryset = queryset.filter(pair_id=pair_id)
+        Accepte les filtres de la liste (pair, strategy, signal_type, timeframe,
+        dates). Filtré seulement par paire, stratégie ou timeframe, le tableau
+        est lu dans LatestSignal sans parcourir l'historique ; avec signal_type
+        ou des dates, c'est le dernier signal correspondant de chaque
+        combinaison qui est renvoyé.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
         
+        timeframe = request.query_params.get('timeframe', None)
         if timeframe:
             queryset = queryset.filter(timeframe=timeframe)
         
-        # Groupe par stratégie et récupère le dernier signal pour chaque
-        latest_signals = {}
-        for signal in queryset:
-            key = f"{signal.strategy_id}_{signal.pair_id}"
-            if key not in latest_signals or signal.timestamp > latest_signals[key].timestamp:
-                latest_signals[key] = signal
-        
-        serializer = self.get_serializer(list(latest_signals.values()), many=True)
-        return Response(serializer.data)
+        filtered = any(request.query_params.get(name) for name in ('signal_type', 'start_date', 'end_date'))
+        rows = SignalRowSerializer.get_rows(SignalBoard.get_latest(queryset, filtered=filtered))
+        return Response(SignalRowSerializer.to_representation(rows))
 
 class BacktestResultViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = BacktestResult.objects.all().order_by('-created_at')
+    queryset = BacktestResult.objects.select_related('pair', 'strategy').order_by('-created_at')
     serializer_class = BacktestResultSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['strategy', 'pair', 'timeframe']
\ No newline at end of file
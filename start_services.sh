@@ -25,14 +25,20 @@ python manage.py migrate
 echo "Initialisation des données de démo..."
 python manage.py init_demo_data
 
-# Démarrer Celery worker (en arrière-plan)
-echo "Démarrage du worker Celery..."
-celery -A trading_signals_platform worker --loglevel=info --detach
+# Démarrer les workers Celery (en arrière-plan), un par file (voir CELERY_TASK_ROUTES)
+echo "Démarrage des workers Celery..."
+mkdir -p var/run var/log
+celery -A trading_signals_platform worker -Q ingestion --concurrency=4 -n ingestion@%h --loglevel=info --detach \
+    --pidfile=var/run/celery-%n.pid --logfile=var/log/celery-%n.log
+celery -A trading_signals_platform worker -Q analysis -n analysis@%h --loglevel=info --detach \
+    --pidfile=var/run/celery-%n.pid --logfile=var/log/celery-%n.log
+celery -A trading_signals_platform worker -Q celery --concurrency=2 -n default@%h --loglevel=info --detach \
+    --pidfile=var/run/celery-%n.pid --logfile=var/log/celery-%n.log
 
 # Démarrer Celery beat (en arrière-plan)
 echo "Démarrage du scheduler Celery beat..."
 celery -A trading_signals_platform beat --loglevel=info --detach
 
-# Démarrer le serveur Django
+# Démarrer le serveur Django (ASGI, nécessaire au flux temps réel /api/events/)
 echo "Démarrage du serveur Django..."
-python manage.py runserver 0.0.0.0:8000
\ No newline at end of file
+uvicorn trading_signals_platform.asgi:application --host 0.0.0.0 --port 8000
\ No newline at end of file
@@ -166,15 +166,72 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 
+# Files dédiées : ingestion (limitée par le quota Alpha Vantage) et analyse (calcul).
+# Lancer un worker par file (start_services.sh les démarre), ex. :
+#   celery -A trading_signals_platform worker -Q ingestion --concurrency=4
+#   celery -A trading_signals_platform worker -Q analysis --concurrency=<nombre de cœurs>
+#   celery -A trading_signals_platform worker -Q celery --concurrency=2
+CELERY_TASK_ROUTES = {
+    'market_data.tasks.merge_results_task': {'queue': 'celery'},
+    'market_data.tasks.*': {'queue': 'ingestion'},
+    'signals.tasks.*': {'queue': 'analysis'},
+}
+
+# Un message à la fois par processus : les sous-tâches se répartissent sur tous les workers
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
 CELERY_BEAT_SCHEDULE = {}
 
 CELERY_BEAT_SCHEDULE.update({
     # vos tâches planifiées
 })
 
+# Cache partagé (séries des graphiques du tableau de bord)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': env('CACHE_URL', default='redis://localhost:6379/1'),
+        'KEY_PREFIX': 'trading_signals',
+    }
+}
+
+# Diffusion temps réel vers le tableau de bord ('redis' entre processus, 'local' en développement)
+DASHBOARD_PUSH_BROKER = env('DASHBOARD_PUSH_BROKER', default='redis')
+DASHBOARD_PUSH_REDIS_URL = env('DASHBOARD_PUSH_REDIS_URL', default=CELERY_BROKER_URL)
+
+# Génération des signaux à l'arrivée de nouvelles bougies : délai de regroupement (secondes)
+SIGNAL_TRIGGER_DEBOUNCE = env.int('SIGNAL_TRIGGER_DEBOUNCE', default=5)
+
+# Indicateurs des graphiques calculés par fonctions de fenêtre SQL plutôt qu'en pandas
+SIGNALS_SQL_INDICATORS = env.bool('SIGNALS_SQL_INDICATORS', default=False)
+
 # Clé API Alpha Vantage
 ALPHA_VANTAGE_API_KEY = env('ALPHA_VANTAGE_API_KEY', default='073XRZ4KX6ENI78E')
 
+# Point d'entrée, quota (appels/minute) et requêtes simultanées de l'API Alpha Vantage
+ALPHA_VANTAGE_BASE_URL = env('ALPHA_VANTAGE_BASE_URL', default='https://www.alphavantage.co/query')
+ALPHA_VANTAGE_CALLS_PER_MINUTE = env.int('ALPHA_VANTAGE_CALLS_PER_MINUTE', default=5)
+ALPHA_VANTAGE_TIMEOUT = env.int('ALPHA_VANTAGE_TIMEOUT', default=30)
+ALPHA_VANTAGE_MAX_WORKERS = env.int('ALPHA_VANTAGE_MAX_WORKERS', default=4)
+
+# Simulateur local de l'API (run_market_simulator) : nombre de bougies d'une réponse 'full'
+MARKET_DATA_SIMULATOR_FULL_BARS = env.int('MARKET_DATA_SIMULATOR_FULL_BARS', default=5000)
+
+# Cache disque des réponses Alpha Vantage ('off', 'on' ou 'replay' pour rejouer sans appeler l'API)
+MARKET_DATA_CACHE_DIR = env('MARKET_DATA_CACHE_DIR', default=os.path.join(BASE_DIR, 'var', 'market_data_cache'))
+MARKET_DATA_CACHE_MODE = env('MARKET_DATA_CACHE_MODE', default='on')
+
+# Archive Parquet des bougies plus anciennes que l'horizon (en jours)
+MARKET_DATA_ARCHIVE_DIR = env('MARKET_DATA_ARCHIVE_DIR', default=os.path.join(BASE_DIR, 'var', 'price_archive'))
+MARKET_DATA_ARCHIVE_HORIZON_DAYS = env.int('MARKET_DATA_ARCHIVE_HORIZON_DAYS', default=365)
+
+# Partitions mensuelles (PostgreSQL) : mois créés à l'avance et sort des partitions expirées ('detach' ou 'drop')
+MARKET_DATA_PARTITION_MONTHS_AHEAD = env.int('MARKET_DATA_PARTITION_MONTHS_AHEAD', default=3)
+MARKET_DATA_PARTITION_RETENTION_ACTION = env('MARKET_DATA_PARTITION_RETENTION_ACTION', default='detach')
+
+# Rétention des signaux en mois, par partitions entières (vide : tout conserver)
+SIGNALS_RETENTION_MONTHS = env.int('SIGNALS_RETENTION_MONTHS', default=None)
+
 # Logging configuration
 LOGGING = {
     'version': 1,
@@ -227,20 +284,23 @@ LOGGING = {
 from celery.schedules import crontab
 
 CELERY_BEAT_SCHEDULE.update({
-    'generate-combined-strategy-1h': {
-        'task': 'signals.tasks.generate_combined_strategy_signals_task',
-        'schedule': crontab(minute='*/15'),  # Toutes les 15 minutes
-        'args': (None, '1h'),  # Tous les pairs, timeframe 1h
+    # Les signaux sont générés à l'arrivée des bougies (signals.triggers), plus par minuterie
+    'update-forex-data-1h': {
+        'task': 'market_data.tasks.update_forex_data_task',
+        'schedule': crontab(minute='1'),  # Toutes les heures à XX:01, après la clôture de la bougie
+        'args': (None, '1h'),  # Toutes les paires ; les timeframes 4h et 1d sont agrégés depuis le 1h
+    },
+    'archive-price-data': {
+        'task': 'market_data.tasks.archive_price_data_task',
+        'schedule': crontab(minute='30', hour='2'),  # Tous les jours à 02:30
     },
-    'generate-combined-strategy-4h': {
-        'task': 'signals.tasks.generate_combined_strategy_signals_task',
-        'schedule': crontab(minute='5', hour='*/4'),  # Toutes les 4 heures à XX:05
-        'args': (None, '4h'),  # Tous les pairs, timeframe 4h
+    'maintain-partitions': {
+        'task': 'market_data.tasks.maintain_partitions_task',
+        'schedule': crontab(minute='15', hour='2'),  # Tous les jours à 02:15
     },
-    'generate-combined-strategy-1d': {
-        'task': 'signals.tasks.generate_combined_strategy_signals_task',
-        'schedule': crontab(minute='15', hour='0'),  # Tous les jours à 00:15
-        'args': (None, '1d'),  # Tous les pairs, timeframe 1d
+    'apply-signal-retention': {
+        'task': 'signals.tasks.apply_signal_retention_task',
+        'schedule': crontab(minute='45', hour='2'),  # Tous les jours à 02:45
     },
 })
 